@@ -3,7 +3,16 @@ from libcpp.set    cimport set
 from libcpp.string cimport string
 from libcpp.vector cimport vector
 
-cdef extern from "precice/precice.hpp" namespace "precice":
+ctypedef const double const_double
+ctypedef const int const_int
+
+cdef extern from "precice/precice.hpp" namespace "precice" nogil:
+    cdef cppclass span[T]:
+        span()
+        span(T* data, size_t size)
+        T* data()
+        size_t size()
+
     cdef cppclass Participant:
         # construction and configuration
 
@@ -45,23 +54,23 @@ cdef extern from "precice/precice.hpp" namespace "precice":
 
         int getMeshVertexSize (const string& meshName) except +
 
-        void setMeshVertices (const string& meshName, vector[double] positions, vector[int]& ids) except +
+        void setMeshVertices (const string& meshName, span[const_double] positions, span[int] ids) except +
 
         void setMeshEdge (const string& meshName, int firstVertexID, int secondVertexID) except +
 
-        void setMeshEdges (const string& meshName, vector[int] vertices) except +
+        void setMeshEdges (const string& meshName, span[const_int] vertices) except +
 
         void setMeshTriangle (const string& meshName, int firstVertexID, int secondVertexID, int thirdVertexID) except +
 
-        void setMeshTriangles (const string& meshName, vector[int] vertices) except +
+        void setMeshTriangles (const string& meshName, span[const_int] vertices) except +
 
         void setMeshQuad (const string& meshName, int firstVertexID, int secondVertexID, int thirdVertexID, int fourthVertexID) except +
 
-        void setMeshQuads (const string& meshName, vector[int] vertices) except +
+        void setMeshQuads (const string& meshName, span[const_int] vertices) except +
 
         void setMeshTetrahedron (const string& meshName, int firstVertexID, int secondVertexID, int thirdVertexID, int fourthVertexID) except +
 
-        void setMeshTetrahedra (const string& meshName, vector[int] vertices) except +
+        void setMeshTetrahedra (const string& meshName, span[const_int] vertices) except +
 
         # remeshing
 
@@ -69,27 +78,27 @@ cdef extern from "precice/precice.hpp" namespace "precice":
 
         # data access
 
-        void writeData (const string& meshName, const string& dataName, vector[int] vertices, vector[double] values) except +
+        void writeData (const string& meshName, const string& dataName, span[const_int] vertices, span[const_double] values) except +
 
-        void readData (const string& meshName, const string& dataName, vector[int] vertices, const double relativeReadTime, vector[double]& values) except +
+        void readData (const string& meshName, const string& dataName, span[const_int] vertices, const double relativeReadTime, span[double] values) except +
 
         # Just-in-time mapping
 
-        void writeAndMapData (const string& meshName, const string& dataName, vector[double] coordinates, vector[double] values) except +
+        void writeAndMapData (const string& meshName, const string& dataName, span[const_double] coordinates, span[const_double] values) except +
 
-        void mapAndReadData  (const string& meshName, const string& dataName, vector[double] coordinates, double relativeReadTime, vector[double]& values) except +
+        void mapAndReadData  (const string& meshName, const string& dataName, span[const_double] coordinates, double relativeReadTime, span[double] values) except +
 
         # direct access
 
         void setMeshAccessRegion (const string& meshName, vector[double] boundingBox) except +
 
-        void getMeshVertexIDsAndCoordinates (const string& meshName, vector[int]& ids, vector[double]& coordinates) except +
+        void getMeshVertexIDsAndCoordinates (const string& meshName, span[int] ids, span[double] coordinates) except +
 
         # Gradient related API
 
         bool requiresGradientDataFor(const string& meshName, const string& dataName) except +
 
-        void writeGradientData(const string& meshName, const string& dataName, vector[int] vertices, vector[double] gradientValues) except +
+        void writeGradientData(const string& meshName, const string& dataName, span[const_int] vertices, span[const_double] gradientValues) except +
 
         # Experimental profiling API
 
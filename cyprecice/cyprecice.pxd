@@ -6,9 +6,242 @@ The python module precice offers python language bindings to the C++ coupling li
 cimport numpy as np
 cimport cython
 cimport Participant as CppParticipant
+from libcpp.string cimport string
+from libcpp.vector cimport vector
 
 from cpython.version cimport PY_MAJOR_VERSION  # important for determining python version in order to properly normalize string input. See http://docs.cython.org/en/latest/src/tutorial/strings.html#general-notes-about-c-strings and https://github.com/precice/precice/issues/68 .
 
+# C function-pointer table of a participant, see ParticipantCApi
+cdef extern from *:
+    """
+    namespace pyprecice {
+    struct ParticipantHandle {
+      precice::Participant *participant;
+      Py_ssize_t *window;
+    };
+
+    struct ParticipantCApiTable {
+      int version;
+      void *participant;
+      int (*initialize)(void *participant);
+      int (*advance)(void *participant, double computedTimeStepSize);
+      int (*finalize)(void *participant);
+      int (*is_coupling_ongoing)(void *participant);
+      int (*is_time_window_complete)(void *participant);
+      int (*requires_writing_checkpoint)(void *participant);
+      int (*requires_reading_checkpoint)(void *participant);
+      double (*get_max_time_step_size)(void *participant);
+      int (*write_data)(void *participant, const char *meshName, const char *dataName, const int *ids, Py_ssize_t size, const double *values, Py_ssize_t valuesSize);
+      int (*read_data)(void *participant, const char *meshName, const char *dataName, const int *ids, Py_ssize_t size, double relativeReadTime, double *values, Py_ssize_t valuesSize);
+      int (*write_and_map_data)(void *participant, const char *meshName, const char *dataName, const double *coordinates, Py_ssize_t coordinatesSize, const double *values, Py_ssize_t valuesSize);
+      int (*map_and_read_data)(void *participant, const char *meshName, const char *dataName, const double *coordinates, Py_ssize_t coordinatesSize, double relativeReadTime, double *values, Py_ssize_t valuesSize);
+      const char *(*last_error)();
+    };
+    } // namespace pyprecice
+    """
+    ctypedef struct ParticipantHandle "pyprecice::ParticipantHandle":
+        CppParticipant.Participant* participant
+        Py_ssize_t* window
+
+    ctypedef struct ParticipantCApiTable "pyprecice::ParticipantCApiTable":
+        int version
+        void* participant
+        int (*initialize)(void* participant) noexcept nogil
+        int (*advance)(void* participant, double computed_time_step_size) noexcept nogil
+        int (*finalize)(void* participant) noexcept nogil
+        int (*is_coupling_ongoing)(void* participant) noexcept nogil
+        int (*is_time_window_complete)(void* participant) noexcept nogil
+        int (*requires_writing_checkpoint)(void* participant) noexcept nogil
+        int (*requires_reading_checkpoint)(void* participant) noexcept nogil
+        double (*get_max_time_step_size)(void* participant) noexcept nogil
+        int (*write_data)(void* participant, const char* mesh_name, const char* data_name, const int* ids, Py_ssize_t size, const double* values, Py_ssize_t values_size) noexcept nogil
+        int (*read_data)(void* participant, const char* mesh_name, const char* data_name, const int* ids, Py_ssize_t size, double relative_read_time, double* values, Py_ssize_t values_size) noexcept nogil
+        int (*write_and_map_data)(void* participant, const char* mesh_name, const char* data_name, const double* coordinates, Py_ssize_t coordinates_size, const double* values, Py_ssize_t values_size) noexcept nogil
+        int (*map_and_read_data)(void* participant, const char* mesh_name, const char* data_name, const double* coordinates, Py_ssize_t coordinates_size, double relative_read_time, double* values, Py_ssize_t values_size) noexcept nogil
+        const char* (*last_error)() noexcept nogil
+
+@cython.embedsignature(True)
+cdef class TraceRecorder:
+    cdef readonly object directory
+    cdef object _lock
+    cdef object _events # events.jsonl
+    cdef object _arrays # arrays.bin
+    cdef Py_ssize_t _offset # size of arrays.bin
+
+    cdef list _append(self, array)
+    cdef record(self, dict event, dict arrays=*)
+
+@cython.embedsignature(True)
+cdef class ReplayParticipant:
+    cdef readonly object directory
+    cdef object _arrays # arrays.bin, memory-mapped
+    cdef list _steps # reads by (call, mesh name, data name) per time step
+    cdef list _states # coupling state per time step
+    cdef dict _vertices # vertex IDs per set_mesh_vertices() call by mesh name
+    cdef dict _vertex_sizes # number of vertices served by set_mesh_vertices() by mesh name
+    cdef dict _direct_vertices # vertex IDs and coordinates per get_mesh_vertex_ids_and_coordinates() call by mesh name
+    cdef dict _dimensions # by mesh name and by (mesh name, data name)
+    cdef Py_ssize_t _step
+    cdef dict _reads # number of reads served in the current time step by (call, mesh name, data name)
+
+    cdef _array(self, list reference)
+    cdef _next_step(self)
+    cdef _next_read(self, call, mesh_name, data_name)
+    cdef _next_vertices(self, mesh_name)
+    cdef tuple _replay_step(self, plan, bint advance, double max_time_step_size)
+    cdef _read_plan(self, plan)
+
 @cython.embedsignature(True)
 cdef class Participant:
     cdef CppParticipant.Participant *thisptr # hold a C++ instance being wrapped
+    cdef object _lock # serializes access to thisptr, which is not thread-safe
+    cdef object _executor # worker thread for the asynchronous steering methods, created on demand
+    cdef object _executor_lock # guards _executor
+    cdef Py_ssize_t _window # incremented whenever read data may change, invalidates cached reads of Data handles
+    cdef dict _profiling_names # encoded event names by event name, such that names are encoded once
+    cdef dict _counters # counters by method name, None if counting is disabled
+    cdef object _counter_report # (file name, communicator) of the report written by finalize(), see enable_counters()
+    cdef object _communicator # communicator given to the constructor
+    cdef object _solver_name
+    cdef list _timeline # (name, start, duration, time in preCICE) of every call, None if disabled
+    cdef int _process_index
+    cdef vector[double] _buffer # double precision copy of single precision values, guarded by _lock
+    cdef dict _vertex_indices # (window, VertexIndex) by mesh name, see get_mesh_vertex_index()
+    cdef TraceRecorder _recorder # None if not recording, see enable_recording()
+
+    cdef _steering_executor(self)
+    cdef bytes _profiling_name(self, event_name)
+    cdef _count(self, name, double start, double precice_time, Py_ssize_t nbytes, double end=*)
+    cdef tuple _step(self, plan, bint advance, double computed_timestep_length, double max_time_step_size)
+    cdef dict _coupling_state(self)
+    cdef _record_plan_reads(self, plan, double relative_read_time)
+    cdef _mark_time_window(self, double time)
+    cdef _set_mesh_elements(self, mesh_name, vertices, int element_type, int vertices_per_element, chunk_size, function_name)
+    cdef _write_data(self, const string& mesh_name, const string& data_name, int data_dimensions, vertex_ids, values)
+    cdef _read_data(self, const string& mesh_name, const string& data_name, int data_dimensions, vertex_ids, double relative_read_time, out)
+    cdef _read_data_at_times(self, const string& mesh_name, const string& data_name, int data_dimensions, vertex_ids, relative_read_times, out)
+    cdef _write_gradient_data(self, const string& mesh_name, const string& data_name, int mesh_dimensions, int data_dimensions, vertex_ids, gradients, axis_order)
+
+@cython.embedsignature(True)
+cdef class ProfilingSection:
+    cdef readonly object participant
+    cdef Participant _participant # None if participant is a ReplayParticipant
+    cdef readonly object name
+    cdef string cpp_name
+
+@cython.embedsignature(True)
+cdef class Mesh:
+    cdef readonly object participant
+    cdef Participant _participant # None if participant is a ReplayParticipant
+    cdef readonly object name
+    cdef readonly int dimensions
+    cdef string cpp_name
+
+@cython.embedsignature(True)
+cdef class Data:
+    cdef readonly Mesh mesh
+    cdef readonly object name
+    cdef readonly int dimensions
+    cdef readonly bint requires_gradient
+    cdef string cpp_name
+    cdef dict _cache # values read in the current time window, None if caching is disabled
+    cdef Py_ssize_t _cache_window
+
+@cython.embedsignature(True)
+cdef class Checkpoint:
+    cdef readonly object participant
+    cdef readonly bint skip_unchanged
+    cdef readonly Py_ssize_t bytes_copied
+    cdef list _arrays
+    cdef list _buffers
+    cdef bint _saved
+
+    cdef Py_ssize_t _copy(self, list sources, list destinations, bint force) except -1
+
+@cython.embedsignature(True)
+cdef class ExchangePlan:
+    cdef readonly object participant
+    cdef Participant _participant # None if participant is a ReplayParticipant
+    cdef list _arrays # keeps the vertex IDs and buffers referenced by the spans below alive
+    cdef list _reads # (mesh name, data name, dimensions, vertex IDs, out) per read, for recording and replay
+    cdef vector[string] _read_mesh_names
+    cdef vector[string] _read_data_names
+    cdef vector[CppParticipant.span[CppParticipant.const_int]] _read_ids
+    cdef vector[CppParticipant.span[double]] _read_values
+    cdef vector[string] _write_mesh_names
+    cdef vector[string] _write_data_names
+    cdef vector[CppParticipant.span[CppParticipant.const_int]] _write_ids
+    cdef vector[CppParticipant.span[CppParticipant.const_double]] _write_values
+
+@cython.embedsignature(True)
+cdef class UncheckedParticipant:
+    cdef readonly Participant participant
+
+    cpdef set_mesh_vertices (self, string mesh_name, const double[::1] positions, int[::1] ids)
+    cpdef write_data (self, string mesh_name, string data_name, const int[::1] vertex_ids, const double[::1] values)
+    cpdef read_data (self, string mesh_name, string data_name, const int[::1] vertex_ids, double relative_read_time, double[::1] values)
+    cpdef write_and_map_data (self, string mesh_name, string data_name, const double[::1] coordinates, const double[::1] values)
+    cpdef map_and_read_data (self, string mesh_name, string data_name, const double[::1] coordinates, double relative_read_time, double[::1] values)
+    cpdef write_gradient_data (self, string mesh_name, string data_name, const int[::1] vertex_ids, const double[::1] gradients)
+
+@cython.embedsignature(True)
+cdef class VertexSet:
+    cdef readonly Participant participant
+    cdef readonly object mesh_name
+    cdef readonly object vertex_ids
+    cdef readonly object indices
+    cdef string _cpp_mesh_name
+    cdef dict _data_dimensions # by data name
+    cdef const int[::1] _ids
+    cdef const Py_ssize_t[::1] _indices # None if the fields only contain the vertices
+    cdef Py_ssize_t _rows # minimum number of rows of the fields
+
+    cdef int _dimensions(self, data_name) except -1
+    cdef _check_field(self, field, int dimensions, function_name)
+    cdef CppParticipant.span[CppParticipant.const_double] _gather(self, const double[::1] field, int dimensions) noexcept nogil
+    cdef void _scatter(self, double[::1] field, int dimensions) noexcept nogil
+
+@cython.embedsignature(True)
+cdef class JustInTimeWriter:
+    cdef readonly Participant participant
+    cdef readonly object mesh_name
+    cdef readonly object data_name
+    cdef readonly bint sort
+    cdef object _coordinates # buffers with capacity for at least _size points
+    cdef object _values
+    cdef Py_ssize_t _size
+
+@cython.embedsignature(True)
+cdef class JustInTimeReader:
+    cdef readonly Participant participant
+    cdef readonly object mesh_name
+    cdef readonly object data_name
+    cdef readonly bint sort
+    cdef object _coordinates # buffer with capacity for at least _size points
+    cdef Py_ssize_t _size
+    cdef object _order # Morton order of the points, None if not computed yet
+    cdef object _sorted_coordinates
+
+@cython.embedsignature(True)
+cdef class VertexIndex:
+    cdef readonly object ids
+    cdef readonly object coordinates
+    cdef readonly int dimensions
+    cdef double _lower[3] # lower corner of the grid
+    cdef Py_ssize_t _cells[3] # number of cells per direction, 1 for unused directions
+    cdef double _cell_size
+    cdef const Py_ssize_t[::1] _cell_start # vertices of cell c are _cell_start[c] to _cell_start[c + 1] - 1
+    cdef const double[:, ::1] _points # coordinates sorted by cell
+    cdef const int[::1] _ids # vertex IDs sorted by cell
+
+    cdef Py_ssize_t _cell(self, double coordinate, int d) noexcept nogil
+    cdef double _distance(self, const double* point, Py_ssize_t vertex) noexcept nogil
+    cdef Py_ssize_t _search_cell(self, const double* point, Py_ssize_t cell, double* distance, Py_ssize_t nearest) noexcept nogil
+    cdef Py_ssize_t _nearest(self, const double* point, double* distance) noexcept nogil
+    cdef void _within(self, const double* point, double radius, vector[int]& found) noexcept nogil
+
+@cython.embedsignature(True)
+cdef class ParticipantCApi:
+    cdef readonly Participant participant
+    cdef ParticipantHandle _handle
+    cdef ParticipantCApiTable _table
@@ -7,11 +7,21 @@ The python module precice offers python language bindings to the C++ coupling li
 
 cimport cyprecice
 cimport numpy
+cimport cython
 import numpy as np
-from mpi4py import MPI
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
+import os
+import threading
 import warnings
 from libcpp.string cimport string
 from libcpp.vector cimport vector
+from libc.stdint cimport uint64_t
+from libc.math cimport INFINITY
+from libc.string cimport memcmp
+from cpython.pycapsule cimport PyCapsule_New
+from posix.time cimport clock_gettime, timespec, CLOCK_MONOTONIC
 
 from cpython.version cimport PY_MAJOR_VERSION  # important for determining python version in order to properly normalize string input. See http://docs.cython.org/en/latest/src/tutorial/strings.html#general-notes-about-c-strings and https://github.com/precice/precice/issues/68 .
 
@@ -35,6 +45,448 @@ def check_array_like(argument, argument_name, function_name):
         raise TypeError("{} requires array_like input for {}, but was provided the following input type: {}".format(
             function_name, argument_name, type(argument))) from None
 
+
+cdef size_t communicator_address(communicator) except 0:
+    """
+    Returns the address of the MPI_Comm handle held by communicator. Integers are interpreted as such an address
+    already, everything else is resolved via mpi4py. mpi4py is imported here and not at module level, since importing
+    mpi4py.MPI initializes MPI, which is expensive and not needed if no communicator is given.
+    """
+    if isinstance(communicator, int):
+        return communicator
+    from mpi4py import MPI
+    return MPI._addressof(communicator)
+
+
+cdef extern from *:
+    """
+    #include <exception>
+    #include <limits>
+    #include <string>
+
+    // functions of the C function-pointer table of a participant, see ParticipantCApi
+    namespace pyprecice {
+    static thread_local std::string lastError;
+
+    static int fail(const std::exception &error)
+    {
+      lastError = error.what();
+      return -1;
+    }
+
+    static precice::Participant &participant(void *handle)
+    {
+      return *static_cast<ParticipantHandle *>(handle)->participant;
+    }
+
+    static int initialize(void *handle)
+    {
+      try {
+        participant(handle).initialize();
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+      ++*static_cast<ParticipantHandle *>(handle)->window;
+      return 0;
+    }
+
+    static int advance(void *handle, double computedTimeStepSize)
+    {
+      try {
+        participant(handle).advance(computedTimeStepSize);
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+      ++*static_cast<ParticipantHandle *>(handle)->window;
+      return 0;
+    }
+
+    static int finalize(void *handle)
+    {
+      try {
+        participant(handle).finalize();
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+      return 0;
+    }
+
+    static int isCouplingOngoing(void *handle)
+    {
+      try {
+        return participant(handle).isCouplingOngoing();
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+    }
+
+    static int isTimeWindowComplete(void *handle)
+    {
+      try {
+        return participant(handle).isTimeWindowComplete();
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+    }
+
+    static int requiresWritingCheckpoint(void *handle)
+    {
+      try {
+        return participant(handle).requiresWritingCheckpoint();
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+    }
+
+    static int requiresReadingCheckpoint(void *handle)
+    {
+      try {
+        return participant(handle).requiresReadingCheckpoint();
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+    }
+
+    static double getMaxTimeStepSize(void *handle)
+    {
+      try {
+        return participant(handle).getMaxTimeStepSize();
+      } catch (const std::exception &error) {
+        fail(error);
+        return std::numeric_limits<double>::quiet_NaN();
+      }
+    }
+
+    static int writeData(void *handle, const char *meshName, const char *dataName, const int *ids, Py_ssize_t size, const double *values, Py_ssize_t valuesSize)
+    {
+      try {
+        participant(handle).writeData(meshName, dataName, precice::span<const int>(ids, size), precice::span<const double>(values, valuesSize));
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+      return 0;
+    }
+
+    static int readData(void *handle, const char *meshName, const char *dataName, const int *ids, Py_ssize_t size, double relativeReadTime, double *values, Py_ssize_t valuesSize)
+    {
+      try {
+        participant(handle).readData(meshName, dataName, precice::span<const int>(ids, size), relativeReadTime, precice::span<double>(values, valuesSize));
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+      return 0;
+    }
+
+    static int writeAndMapData(void *handle, const char *meshName, const char *dataName, const double *coordinates, Py_ssize_t coordinatesSize, const double *values, Py_ssize_t valuesSize)
+    {
+      try {
+        participant(handle).writeAndMapData(meshName, dataName, precice::span<const double>(coordinates, coordinatesSize), precice::span<const double>(values, valuesSize));
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+      return 0;
+    }
+
+    static int mapAndReadData(void *handle, const char *meshName, const char *dataName, const double *coordinates, Py_ssize_t coordinatesSize, double relativeReadTime, double *values, Py_ssize_t valuesSize)
+    {
+      try {
+        participant(handle).mapAndReadData(meshName, dataName, precice::span<const double>(coordinates, coordinatesSize), relativeReadTime, precice::span<double>(values, valuesSize));
+      } catch (const std::exception &error) {
+        return fail(error);
+      }
+      return 0;
+    }
+
+    static const char *getLastError()
+    {
+      return lastError.c_str();
+    }
+
+    static void fillCApiTable(ParticipantCApiTable *table, ParticipantHandle *handle)
+    {
+      table->version                     = 1;
+      table->participant                 = handle;
+      table->initialize                  = initialize;
+      table->advance                     = advance;
+      table->finalize                    = finalize;
+      table->is_coupling_ongoing         = isCouplingOngoing;
+      table->is_time_window_complete     = isTimeWindowComplete;
+      table->requires_writing_checkpoint = requiresWritingCheckpoint;
+      table->requires_reading_checkpoint = requiresReadingCheckpoint;
+      table->get_max_time_step_size      = getMaxTimeStepSize;
+      table->write_data                  = writeData;
+      table->read_data                   = readData;
+      table->write_and_map_data          = writeAndMapData;
+      table->map_and_read_data           = mapAndReadData;
+      table->last_error                  = getLastError;
+    }
+    } // namespace pyprecice
+    """
+    void fill_c_api_table "pyprecice::fillCApiTable" (ParticipantCApiTable* table, ParticipantHandle* handle)
+
+
+cdef summarize_counters(list counters, int slowest):
+    """
+    Returns minimum, maximum and mean over ranks of the counters of every method, see Participant.get_counters(),
+    as well as the ranks which spent the most time in it. Ranks that did not call a method count with zeros.
+    """
+    names = sorted(set().union(*counters))
+    summary = {"ranks": len(counters), "methods": {}}
+    for name in names:
+        method = summary["methods"][name] = {}
+        for quantity in ("calls", "time", "precice", "bytes"):
+            values = np.array([rank_counters.get(name, {}).get(quantity, 0) for rank_counters in counters])
+            method[quantity] = {"min": values.min().item(), "max": values.max().item(), "mean": values.mean().item()}
+            if quantity == "time":
+                ranks = np.argsort(-values, kind="stable")[:slowest]
+                method["slowest"] = [[rank.item(), values[rank].item()] for rank in ranks]
+    return summary
+
+
+cdef open_npy(argument):
+    """
+    Opens argument memory-mapped and read-only if it is the path of a .npy file, otherwise returns it unchanged.
+    """
+    if isinstance(argument, (str, os.PathLike)):
+        return np.load(argument, mmap_mode="r")
+    return argument
+
+
+cdef as_element_array(vertices, vertices_per_element, argument_name, function_name):
+    """
+    Returns the vertex IDs of mesh elements as numpy.ndarray [N x vertices_per_element]. Paths of .npy files are
+    opened memory-mapped.
+    """
+    vertices = open_npy(vertices)
+    check_array_like(vertices, argument_name, function_name)
+
+    if not isinstance(vertices, np.ndarray):
+        vertices = np.asarray(vertices)
+
+    if len(vertices) > 0:
+        assert vertices.ndim == 2, "Provided {} are not of a [N x {}] format, but instead of shape {}".format(argument_name, vertices_per_element, vertices.shape)
+        _, n = vertices.shape
+        assert n == vertices_per_element, "Provided {} are not of a [N x {}] format, but instead of a [N x {}]".format(argument_name, vertices_per_element, n)
+
+    return vertices
+
+
+cdef enum MeshElement:
+    EDGE
+    TRIANGLE
+    QUAD
+    TETRAHEDRON
+
+
+cdef as_contiguous_array(argument, dtype):
+    """
+    Returns argument as a C-contiguous numpy.ndarray of the given dtype. Objects which already provide such a buffer
+    (via the buffer protocol, __array_interface__ or DLPack) are wrapped without copying. A copy is only made if
+    the layout or the dtype of the input does not match.
+    """
+    if not isinstance(argument, np.ndarray) and hasattr(argument, "__dlpack__"):
+        try:
+            argument = np.from_dlpack(argument)
+        except (BufferError, RuntimeError, TypeError):
+            pass  # e.g. device memory, fall back to the generic conversion below
+    return np.ascontiguousarray(argument, dtype=dtype)
+
+
+cdef bint is_single_precision(argument):
+    """
+    Returns whether argument is a numpy.ndarray of dtype numpy.float32, which is passed to preCICE by widening it to
+    double precision instead of converting it via numpy.
+    """
+    return isinstance(argument, np.ndarray) and argument.dtype == np.single
+
+
+cdef precision_dtype(array):
+    """
+    Returns the dtype data values are exchanged in for the given input or output array: numpy.float32 for single
+    precision arrays, numpy.float64 otherwise.
+    """
+    return np.single if is_single_precision(array) else np.double
+
+
+cdef check_output_array(out, dtype, expected_size, argument_name, function_name):
+    """
+    Checks that out can be filled by preCICE directly, i.e. it is a writeable, C-contiguous numpy.ndarray of the given
+    dtype with expected_size entries.
+    """
+    if not isinstance(out, np.ndarray) or out.dtype != dtype or not out.flags["C_CONTIGUOUS"] or not out.flags["WRITEABLE"]:
+        raise TypeError("{} requires a writeable, C-contiguous numpy.ndarray of dtype {} for {}, but was provided the following input: {}".format(
+            function_name, np.dtype(dtype).name, argument_name, repr(out)))
+    assert out.size == expected_size, "Provided output array {} in {} is of incorrect size. Provided size: {}, expected size: {}".format(
+        argument_name, function_name, out.size, expected_size)
+
+
+cdef create_output_array(out, dtype, shape, argument_name, function_name):
+    """
+    Returns the array preCICE writes to: a new array if out is None, a new memory-mapped .npy file if out is a path,
+    and out itself otherwise.
+    """
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if isinstance(out, (str, os.PathLike)):
+        return np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=shape)
+    check_output_array(out, dtype, np.prod(shape), argument_name, function_name)
+    assert out.shape == tuple(shape), "Provided output array {} in {} is of incorrect shape. Provided shape: {}, expected shape: {}".format(
+        argument_name, function_name, out.shape, tuple(shape))
+    return out
+
+
+cdef check_chunk_size(chunk_size, size):
+    """
+    Returns the number of rows passed to preCICE at once. Without a chunk_size, everything is passed at once.
+    """
+    if chunk_size is None:
+        return max(size, 1)
+    assert chunk_size > 0, "chunk_size has to be positive, but is {}".format(chunk_size)
+    return chunk_size
+
+
+cdef grow_rows(array, Py_ssize_t size, Py_ssize_t required):
+    """
+    Returns array if it has at least required rows, otherwise a larger array holding the first size rows of array.
+    The capacity is at least doubled, such that appending rows one by one takes amortized constant time.
+    """
+    if len(array) >= required:
+        return array
+    grown = np.empty((max(required, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:size] = array[:size]
+    return grown
+
+
+cdef inline uint64_t spread_bits(uint64_t x, Py_ssize_t dimensions) noexcept nogil:
+    """
+    Inserts dimensions - 1 zero bits between the lower bits of x, see morton_order().
+    """
+    if dimensions == 2:
+        x &= 0x7fffffffULL
+        x = (x | (x << 16)) & 0x0000ffff0000ffffULL
+        x = (x | (x << 8)) & 0x00ff00ff00ff00ffULL
+        x = (x | (x << 4)) & 0x0f0f0f0f0f0f0f0fULL
+        x = (x | (x << 2)) & 0x3333333333333333ULL
+        x = (x | (x << 1)) & 0x5555555555555555ULL
+    elif dimensions == 3:
+        x &= 0x1fffffULL
+        x = (x | (x << 32)) & 0x001f00000000ffffULL
+        x = (x | (x << 16)) & 0x001f0000ff0000ffULL
+        x = (x | (x << 8)) & 0x100f00f00f00f00fULL
+        x = (x | (x << 4)) & 0x10c30c30c30c30c3ULL
+        x = (x | (x << 2)) & 0x1249249249249249ULL
+    return x
+
+
+cdef morton_order(coordinates):
+    """
+    Returns the permutation which sorts the points given by coordinates [N x D] along a Z-order (Morton) curve
+    through their bounding box, such that points close in space are mostly close in the sorted order.
+    """
+    cdef const double[:, ::1] points = as_contiguous_array(coordinates, np.double)
+    cdef Py_ssize_t size = points.shape[0], dimensions = points.shape[1], i, d
+    if size == 0:
+        return np.empty(0, dtype=np.intp)
+
+    # each coordinate is quantized to as many bits as fit into a 64 bit code
+    cdef double levels = 2.0 ** (63 // dimensions) - 1
+    lower = np.min(coordinates, axis=0)
+    extent = np.max(coordinates, axis=0) - lower
+    cdef const double[::1] cpp_lower = as_contiguous_array(lower, np.double)
+    cdef const double[::1] cpp_scale = as_contiguous_array(np.divide(levels, extent, out=np.zeros_like(extent), where=extent > 0), np.double)
+    codes = np.empty(size, dtype=np.uint64)
+    cdef uint64_t[::1] cpp_codes = codes
+    cdef uint64_t code
+
+    with nogil:
+        for i in range(size):
+            code = 0
+            for d in range(dimensions):
+                code |= spread_bits(<uint64_t>((points[i, d] - cpp_lower[d]) * cpp_scale[d]), dimensions) << d
+            cpp_codes[i] = code
+
+    return np.argsort(codes, kind="stable")
+
+
+cdef inline double monotonic_time() noexcept nogil:
+    """
+    Returns the time in seconds of a monotonic clock, used for the counters of Participant.enable_counters().
+    """
+    cdef timespec ts
+    clock_gettime(CLOCK_MONOTONIC, &ts)
+    return ts.tv_sec + 1e-9 * ts.tv_nsec
+
+
+@cython.boundscheck(False)  # callers check that the view is not empty
+cdef inline CppParticipant.span[double] as_mutable_double_span(double[::1] view) noexcept nogil:
+    if view.shape[0] == 0:
+        return CppParticipant.span[double]()
+    return CppParticipant.span[double](&view[0], view.shape[0])
+
+
+@cython.boundscheck(False)  # callers check that the view is not empty
+cdef inline CppParticipant.span[int] as_mutable_int_span(int[::1] view) noexcept nogil:
+    if view.shape[0] == 0:
+        return CppParticipant.span[int]()
+    return CppParticipant.span[int](&view[0], view.shape[0])
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline CppParticipant.span[CppParticipant.const_double] widen(const float[::1] view, vector[double]& buffer) noexcept nogil:
+    """
+    Copies view into buffer in double precision and returns a span of buffer.
+    """
+    cdef Py_ssize_t i
+    buffer.resize(view.shape[0])
+    for i in range(view.shape[0]):
+        buffer[i] = view[i]
+    return CppParticipant.span[CppParticipant.const_double](buffer.data(), buffer.size())
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void narrow(const vector[double]& buffer, float[::1] view) noexcept nogil:
+    """
+    Copies buffer into view in single precision.
+    """
+    cdef Py_ssize_t i
+    for i in range(view.shape[0]):
+        view[i] = <float> buffer[i]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef CppParticipant.span[CppParticipant.const_double] transpose_blocks(const double[::1] view, int rows, int columns, vector[double]& buffer) noexcept nogil:
+    """
+    Copies view, consecutive blocks of rows x columns values, into buffer with every block transposed and returns a
+    span of buffer.
+    """
+    cdef Py_ssize_t block, offset, size = rows * columns
+    cdef int row, column
+    buffer.resize(view.shape[0])
+    for block in range(view.shape[0] // size):
+        offset = block * size
+        for row in range(rows):
+            for column in range(columns):
+                buffer[offset + column * rows + row] = view[offset + row * columns + column]
+    return CppParticipant.span[CppParticipant.const_double](buffer.data(), buffer.size())
+
+
+@cython.boundscheck(False)  # callers check that the view is not empty
+cdef inline CppParticipant.span[CppParticipant.const_double] as_double_span(const double[::1] view) noexcept nogil:
+    if view.shape[0] == 0:
+        return CppParticipant.span[CppParticipant.const_double]()
+    return CppParticipant.span[CppParticipant.const_double](&view[0], view.shape[0])
+
+
+@cython.boundscheck(False)  # callers check that the view is not empty
+cdef inline CppParticipant.span[CppParticipant.const_int] as_int_span(const int[::1] view) noexcept nogil:
+    if view.shape[0] == 0:
+        return CppParticipant.span[CppParticipant.const_int]()
+    return CppParticipant.span[CppParticipant.const_int](&view[0], view.shape[0])
+
+
 cdef class Participant:
     """
     Main Application Programming Interface of preCICE.
@@ -46,6 +498,9 @@ cdef class Participant:
     - Finalize preCICE with Participant::finalize()
     - We use solver, simulation code, and participant as synonyms.
     - The preferred name in the documentation is participant.
+
+    A Participant may be used from several threads. Calls into preCICE are serialized per object and
+    blocking or bulk calls, such as advance() or read_data(), release the GIL while preCICE is working.
     """
 
     # fake __init__ needed to display docstring for __cinit__ (see https://stackoverflow.com/a/42733794/5158031)
@@ -63,8 +518,10 @@ cdef class Participant:
             Rank of the process
         solver_process_size : int
             Size of the process
-        communicator: mpi4py.MPI.Comm, optional
-            Custom MPI communicator to use
+        communicator: mpi4py.MPI.Comm or int, optional
+            Custom MPI communicator to use. Any communicator object supported by mpi4py is accepted, as well as an
+            int holding the address of an MPI_Comm handle (e.g. obtained via mpi4py.MPI._addressof or ctypes.addressof).
+            mpi4py is only imported if a communicator is given.
 
         Returns
         -------
@@ -83,8 +540,15 @@ cdef class Participant:
 
     def __cinit__ (self, solver_name, configuration_file_name, solver_process_index, solver_process_size, communicator=None):
         cdef size_t c_comm_addr;
+        self._lock = threading.Lock()
+        self._executor_lock = threading.Lock()
+        self._profiling_names = {}
+        self._vertex_indices = {}
+        self._communicator = communicator
+        self._solver_name = solver_name
+        self._process_index = solver_process_index
         if communicator:
-            c_comm_addr = MPI._addressof(communicator)
+            c_comm_addr = communicator_address(communicator)
             self.thisptr = new CppParticipant.Participant (convert(solver_name), convert(configuration_file_name), solver_process_index, solver_process_size, <void*>c_comm_addr)
         else:
             self.thisptr = new CppParticipant.Participant (convert(solver_name), convert(configuration_file_name), solver_process_index, solver_process_size)
@@ -116,7 +580,16 @@ cdef class Participant:
         max_timestep : double
             Maximum length of first timestep to be computed by the solver.
         """
-        self.thisptr.initialize ()
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        with self._lock:
+            with nogil:
+                precice_start = monotonic_time()
+                self.thisptr.initialize ()
+                precice_time = monotonic_time() - precice_start
+            self._window += 1
+        self._count("initialize", start, precice_time, 0)
+        if self._recorder is not None:
+            self._recorder.record({"call": "initialize", "state": self._coupling_state()})
 
 
     def advance (self, double computed_timestep_length):
@@ -144,7 +617,17 @@ cdef class Participant:
             [Second Participant] Configured post processing schemes are applied.
             Meshes with data are exported to files if configured.
         """
-        self.thisptr.advance (computed_timestep_length)
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        with self._lock:
+            with nogil:
+                precice_start = monotonic_time()
+                self.thisptr.advance (computed_timestep_length)
+                precice_time = monotonic_time() - precice_start
+            self._window += 1
+        self._count("advance", start, precice_time, 0)
+        self._mark_time_window(precice_start + precice_time)
+        if self._recorder is not None:
+            self._recorder.record({"call": "advance", "dt": computed_timestep_length, "state": self._coupling_state()})
 
 
     def finalize (self):
@@ -159,8 +642,78 @@ cdef class Participant:
         Tasks completed:
             Communication channels are closed.
             Meshes and data are deallocated.
+            The counter report requested via enable_counters() is written.
+            The trace recorded since enable_recording() is closed.
+        """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        if self._counter_report is not None and self._counters is not None:
+            # before finalizing preCICE, which may finalize MPI
+            self.write_counter_report(*self._counter_report)
+        with self._lock:
+            with nogil:
+                precice_start = monotonic_time()
+                self.thisptr.finalize ()
+                precice_time = monotonic_time() - precice_start
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self._count("finalize", start, precice_time, 0)
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+
+    # asynchronous steering methods
+
+    cdef _steering_executor(self):
+        """
+        Returns the single worker thread on which the asynchronous steering methods run.
+        The thread is created on first use and shut down by finalize(). It is guarded by its own lock, as _lock is
+        held by a running advance() and the event loop must not wait for it.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="precice-steering")
+            return self._executor
+
+
+    async def initialize_async (self):
+        """
+        Awaitable variant of initialize(). preCICE is initialized on a dedicated worker thread with the GIL released,
+        such that the event loop can run other tasks while waiting for the coupling partner.
+
+        Examples
+        --------
+        >>> await participant.initialize_async()
+        """
+        import asyncio  # imported on demand to keep "import precice" fast
+
+        await asyncio.get_running_loop().run_in_executor(self._steering_executor(), self.initialize)
+
+
+    async def advance_async (self, double computed_timestep_length):
+        """
+        Awaitable variant of advance(). preCICE advances on a dedicated worker thread with the GIL released,
+        such that the event loop can run other tasks while waiting for the coupling partner.
+
+        Parameters
+        ----------
+        computed_timestep_length : double
+            Length of timestep used by the solver.
+
+        Notes
+        -----
+        Do not call other methods of the participant until the returned coroutine has completed.
+
+        Examples
+        --------
+        >>> dt = participant.get_max_time_step_size()
+        >>> await asyncio.gather(participant.advance_async(dt), upload_checkpoint())
         """
-        self.thisptr.finalize ()
+        import asyncio  # imported on demand to keep "import precice" fast
+
+        await asyncio.get_running_loop().run_in_executor(self._steering_executor(), self.advance, computed_timestep_length)
 
 
     # status queries
@@ -180,7 +733,8 @@ cdef class Participant:
             The dimensions of the given mesh.
         """
 
-        return self.thisptr.getMeshDimensions (convert(mesh_name))
+        with self._lock:
+            return self.thisptr.getMeshDimensions (convert(mesh_name))
 
 
     def get_data_dimensions (self, mesh_name, data_name):
@@ -200,7 +754,8 @@ cdef class Participant:
             The dimensions of the given data.
         """
 
-        return self.thisptr.getDataDimensions (convert(mesh_name), convert(data_name))
+        with self._lock:
+            return self.thisptr.getDataDimensions (convert(mesh_name), convert(data_name))
 
 
     def is_coupling_ongoing (self):
@@ -223,7 +778,8 @@ cdef class Participant:
         Previous calls:
            initialize() has been called successfully.
         """
-        return self.thisptr.isCouplingOngoing ()
+        with self._lock:
+            return self.thisptr.isCouplingOngoing ()
 
 
     def is_time_window_complete (self):
@@ -244,7 +800,8 @@ cdef class Participant:
         Previous calls:
             initialize() has been called successfully.
         """
-        return self.thisptr.isTimeWindowComplete ()
+        with self._lock:
+            return self.thisptr.isTimeWindowComplete ()
 
 
     def get_max_time_step_size (self):
@@ -264,7 +821,8 @@ cdef class Participant:
         Previous calls:
             initialize() has been called successfully.
         """
-        return self.thisptr.getMaxTimeStepSize ()
+        with self._lock:
+            return self.thisptr.getMaxTimeStepSize ()
 
 
     def requires_initial_data (self):
@@ -283,7 +841,8 @@ cdef class Participant:
         Previous calls:
             initialize() has not yet been called
         """
-        return self.thisptr.requiresInitialData ()
+        with self._lock:
+            return self.thisptr.requiresInitialData ()
 
     def requires_writing_checkpoint (self):
         """
@@ -300,7 +859,8 @@ cdef class Participant:
         Previous calls:
             initialize() has been called
         """
-        return self.thisptr.requiresWritingCheckpoint ()
+        with self._lock:
+            return self.thisptr.requiresWritingCheckpoint ()
 
     def requires_reading_checkpoint (self):
         """
@@ -319,7 +879,8 @@ cdef class Participant:
         Previous calls:
             initialize() has been called
         """
-        return self.thisptr.requiresReadingCheckpoint ()
+        with self._lock:
+            return self.thisptr.requiresReadingCheckpoint ()
 
     # mesh access
 
@@ -337,7 +898,8 @@ cdef class Participant:
         tag : bool
             True if mesh connectivity is required.
         """
-        return self.thisptr.requiresMeshConnectivityFor(convert(mesh_name))
+        with self._lock:
+            return self.thisptr.requiresMeshConnectivityFor(convert(mesh_name))
 
 
     def set_mesh_vertex(self, mesh_name, position):
@@ -371,8 +933,11 @@ cdef class Participant:
 
         cdef vector[double] cpp_position = position
 
-        vertex_id = self.thisptr.setMeshVertex(convert(mesh_name), cpp_position)
+        with self._lock:
+            vertex_id = self.thisptr.setMeshVertex(convert(mesh_name), cpp_position)
 
+        if self._recorder is not None:
+            self._recorder.record({"call": "set_mesh_vertices", "mesh": convert(mesh_name).decode(), "dimensions": self.get_mesh_dimensions(mesh_name)}, {"ids": np.array([vertex_id], dtype=np.int32)})
         return vertex_id
 
 
@@ -391,10 +956,11 @@ cdef class Participant:
             Number of vertices of the mesh.
         """
 
-        return self.thisptr.getMeshVertexSize(convert(mesh_name))
+        with self._lock:
+            return self.thisptr.getMeshVertexSize(convert(mesh_name))
 
 
-    def set_mesh_vertices (self, mesh_name, positions):
+    def set_mesh_vertices (self, mesh_name, positions, out=None, chunk_size=None):
         """
         Creates multiple mesh vertices
 
@@ -405,12 +971,19 @@ cdef class Participant:
         positions : array_like
             The coordinates of the vertices in a numpy array [N x D] where
             N = number of vertices and D = dimensions of geometry.
-            A list of the same shape is also accepted.
+            A list of the same shape is also accepted, as well as a numpy.memmap or
+            the path of a .npy file, which is then memory-mapped.
+        out : numpy.ndarray or path, optional
+            Array of dtype numpy.int32 with N entries into which the IDs are written. If a path
+            is given, the IDs are written into a new memory-mapped .npy file at this path.
+        chunk_size : int, optional
+            Maximum number of vertices passed to preCICE at once. Together with memory-mapped
+            positions and IDs, this bounds the memory needed to register very large meshes.
 
         Returns
         -------
         vertex_ids : numpy.ndarray
-            IDs of the created vertices.
+            IDs of the created vertices. If out is given, this is the array written to.
 
         Notes
         -----
@@ -450,7 +1023,13 @@ cdef class Participant:
         >>> vertex_ids = participant.set_mesh_vertices(mesh_name, positions)
         >>> vertex_ids.shape
         (5,)
+
+        Set mesh vertices from a memory-mapped .npy file in chunks of 10^6 vertices and write the IDs into another .npy file.
+
+        >>> vertex_ids = participant.set_mesh_vertices(mesh_name, "positions.npy", out="ids.npy", chunk_size=10**6)
         """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        positions = open_npy(positions)
         check_array_like(positions, "positions", "set_mesh_vertices")
 
         if not isinstance(positions, np.ndarray):
@@ -461,16 +1040,38 @@ cdef class Participant:
             assert dimensions == self.get_mesh_dimensions(mesh_name), "Dimensions of vertex coordinates in set_mesh_vertices does not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(dimensions, self.get_mesh_dimensions(mesh_name))
         elif len(positions) == 0:
             size = 0
-            dimensions = self.get_mesh_dimensions(mesh_name)
 
-        cdef vector[double] cpp_positions = positions.flatten()
-        cdef vector[int] cpp_ids = [-1 for _ in range(size)]
+        vertex_ids = create_output_array(out, np.int32, (size,), "out", "set_mesh_vertices")
+        chunk_size = check_chunk_size(chunk_size, size)
+
+        cdef string cpp_mesh_name = convert(mesh_name)
+        cdef const double[::1] cpp_positions
+        cdef int[::1] cpp_ids
+        cdef CppParticipant.span[CppParticipant.const_double] positions_span
+        cdef CppParticipant.span[int] ids_span
+        cdef Py_ssize_t nbytes = 0
+
+        for first in range(0, max(size, 1), chunk_size):
+            # slices of C-contiguous float64 input are views, such that only the current chunk is paged in
+            cpp_positions = as_contiguous_array(positions[first:first + chunk_size], np.double).ravel()
+            cpp_ids = vertex_ids[first:first + chunk_size]
+            nbytes += cpp_positions.nbytes + cpp_ids.nbytes
+            positions_span = as_double_span(cpp_positions)
+            ids_span = as_mutable_int_span(cpp_ids)
 
-        self.thisptr.setMeshVertices (convert(mesh_name), cpp_positions, cpp_ids)
+            with self._lock:
+                with nogil:
+                    precice_start = monotonic_time()
+                    self.thisptr.setMeshVertices (cpp_mesh_name, positions_span, ids_span)
+                    precice_time += monotonic_time() - precice_start
 
-        cdef np.ndarray[int, ndim=1] np_ids = np.array(cpp_ids, dtype=np.int32)
+        if isinstance(vertex_ids, np.memmap):
+            vertex_ids.flush()
 
-        return np_ids
+        self._count("set_mesh_vertices", start, precice_time, nbytes)
+        if self._recorder is not None:
+            self._recorder.record({"call": "set_mesh_vertices", "mesh": cpp_mesh_name.decode(), "dimensions": self.get_mesh_dimensions(mesh_name)}, {"ids": vertex_ids})
+        return vertex_ids
 
 
     def set_mesh_edge (self, mesh_name, first_vertex_id, second_vertex_id):
@@ -497,10 +1098,11 @@ cdef class Participant:
             vertices with firstVertexID and secondVertexID were added to the mesh with name mesh_name
         """
 
-        self.thisptr.setMeshEdge (convert(mesh_name), first_vertex_id, second_vertex_id)
+        with self._lock:
+            self.thisptr.setMeshEdge (convert(mesh_name), first_vertex_id, second_vertex_id)
 
 
-    def set_mesh_edges (self, mesh_name, vertices):
+    def set_mesh_edges (self, mesh_name, vertices, chunk_size=None):
         """
         Creates multiple mesh edges
 
@@ -511,7 +1113,10 @@ cdef class Participant:
         vertices : array_like
             The IDs of the vertices in a numpy array [N x 2] where
             N = number of edges and D = dimensions of geometry.
-            A list of the same shape is also accepted.
+            A list of the same shape is also accepted, as well as a numpy.memmap or
+            the path of a .npy file, which is then memory-mapped.
+        chunk_size : int, optional
+            Maximum number of edges passed to preCICE at once, see set_mesh_vertices.
 
         Examples
         --------
@@ -522,20 +1127,7 @@ cdef class Participant:
         (6, 2)
         >>> participant.set_mesh_edges(mesh_name, vertices)
         """
-        check_array_like(vertices, "vertices", "set_mesh_edges")
-
-        if not isinstance(vertices, np.ndarray):
-            vertices = np.asarray(vertices)
-
-        if len(vertices) > 0:
-            _, n = vertices.shape
-            assert n == 2, "Provided vertices are not of a [N x 2] format, but instead of a [N x {}]".format(n)
-        elif len(vertices) == 0:
-            dimensions = self.get_mesh_dimensions(mesh_name)
-
-        cdef vector[int] cpp_vertices = vertices.flatten()
-
-        self.thisptr.setMeshEdges (convert(mesh_name), cpp_vertices)
+        self._set_mesh_elements(mesh_name, vertices, EDGE, 2, chunk_size, "set_mesh_edges")
 
 
     def set_mesh_triangle (self, mesh_name, first_vertex_id, second_vertex_id, third_vertex_id):
@@ -559,10 +1151,11 @@ cdef class Participant:
             vertices with first_vertex_id, second_vertex_id, and third_vertex_id were added to the mesh with the name mesh_name
         """
 
-        self.thisptr.setMeshTriangle (convert(mesh_name), first_vertex_id, second_vertex_id, third_vertex_id)
+        with self._lock:
+            self.thisptr.setMeshTriangle (convert(mesh_name), first_vertex_id, second_vertex_id, third_vertex_id)
 
 
-    def set_mesh_triangles (self, mesh_name, vertices):
+    def set_mesh_triangles (self, mesh_name, vertices, chunk_size=None):
         """
         Creates multiple mesh triangles
 
@@ -573,7 +1166,10 @@ cdef class Participant:
         vertices : array_like
             The IDs of the vertices in a numpy array [N x 3] where
             N = number of triangles and D = dimensions of geometry.
-            A list of the same shape is also accepted.
+            A list of the same shape is also accepted, as well as a numpy.memmap or
+            the path of a .npy file, which is then memory-mapped.
+        chunk_size : int, optional
+            Maximum number of triangles passed to preCICE at once, see set_mesh_vertices.
 
         Examples
         --------
@@ -584,20 +1180,7 @@ cdef class Participant:
         (4, 2)
         >>> participant.set_mesh_triangles(mesh_name, vertices)
         """
-        check_array_like(vertices, "vertices", "set_mesh_triangles")
-
-        if not isinstance(vertices, np.ndarray):
-            vertices = np.asarray(vertices)
-
-        if len(vertices) > 0:
-            _, n = vertices.shape
-            assert n == self.get_mesh_dimensions(mesh_name), "Provided vertices are not of a [N x {}] format, but instead of a [N x {}]".format(self.get_mesh_dimensions(mesh_name), n)
-        elif len(vertices) == 0:
-            dimensions = self.get_mesh_dimensions(mesh_name)
-
-        cdef vector[int] cpp_vertices = vertices.flatten()
-
-        self.thisptr.setMeshTriangles (convert(mesh_name), cpp_vertices)
+        self._set_mesh_elements(mesh_name, vertices, TRIANGLE, 3, chunk_size, "set_mesh_triangles")
 
 
     def set_mesh_quad (self, mesh_name, first_vertex_id, second_vertex_id, third_vertex_id, fourth_vertex_id):
@@ -624,10 +1207,11 @@ cdef class Participant:
             to the mesh with the name mesh_name
         """
 
-        self.thisptr.setMeshQuad (convert(mesh_name), first_vertex_id, second_vertex_id, third_vertex_id, fourth_vertex_id)
+        with self._lock:
+            self.thisptr.setMeshQuad (convert(mesh_name), first_vertex_id, second_vertex_id, third_vertex_id, fourth_vertex_id)
 
 
-    def set_mesh_quads (self, mesh_name, vertices):
+    def set_mesh_quads (self, mesh_name, vertices, chunk_size=None):
         """
         Creates multiple mesh quads
 
@@ -638,7 +1222,10 @@ cdef class Participant:
         vertices : array_like
             The IDs of the vertices in a numpy array [N x 4] where
             N = number of quads and D = dimensions of geometry.
-            A list of the same shape is also accepted.
+            A list of the same shape is also accepted, as well as a numpy.memmap or
+            the path of a .npy file, which is then memory-mapped.
+        chunk_size : int, optional
+            Maximum number of quads passed to preCICE at once, see set_mesh_vertices.
 
         Examples
         --------
@@ -649,20 +1236,7 @@ cdef class Participant:
         (1, 2)
         >>> participant.set_mesh_quads(mesh_name, vertices)
         """
-        check_array_like(vertices, "vertices", "set_mesh_quads")
-
-        if not isinstance(vertices, np.ndarray):
-            vertices = np.asarray(vertices)
-
-        if len(vertices) > 0:
-            _, n = vertices.shape
-            assert n == 4, "Provided vertices are not of a [N x 4] format, but instead of a [N x {}]".format(n)
-        elif len(vertices) == 0:
-            dimensions = self.get_mesh_dimensions(mesh_name)
-
-        cdef vector[int] cpp_vertices = vertices.flatten()
-
-        self.thisptr.setMeshQuads (convert(mesh_name), cpp_vertices)
+        self._set_mesh_elements(mesh_name, vertices, QUAD, 4, chunk_size, "set_mesh_quads")
 
 
     def set_mesh_tetrahedron (self, mesh_name, first_vertex_id, second_vertex_id, third_vertex_id, fourth_vertex_id):
@@ -689,10 +1263,11 @@ cdef class Participant:
             to the mesh with the name mesh_name
         """
 
-        self.thisptr.setMeshTetrahedron (convert(mesh_name), first_vertex_id, second_vertex_id, third_vertex_id, fourth_vertex_id)
+        with self._lock:
+            self.thisptr.setMeshTetrahedron (convert(mesh_name), first_vertex_id, second_vertex_id, third_vertex_id, fourth_vertex_id)
 
 
-    def set_mesh_tetrahedra (self, mesh_name, vertices):
+    def set_mesh_tetrahedra (self, mesh_name, vertices, chunk_size=None):
         """
         Creates multiple mesh tetdrahedrons
 
@@ -703,7 +1278,10 @@ cdef class Participant:
         vertices : array_like
             The IDs of the vertices in a numpy array [N x 4] where
             N = number of quads and D = dimensions of geometry.
-            A list of the same shape is also accepted.
+            A list of the same shape is also accepted, as well as a numpy.memmap or
+            the path of a .npy file, which is then memory-mapped.
+        chunk_size : int, optional
+            Maximum number of tetrahedra passed to preCICE at once, see set_mesh_vertices.
 
         Examples
         --------
@@ -714,20 +1292,62 @@ cdef class Participant:
         (1, 2)
         >>> participant.set_mesh_tetradehra(mesh_name, vertices)
         """
-        check_array_like(vertices, "vertices", "set_mesh_tetrahedra")
+        self._set_mesh_elements(mesh_name, vertices, TETRAHEDRON, 4, chunk_size, "set_mesh_tetrahedra")
 
-        if not isinstance(vertices, np.ndarray):
-            vertices = np.asarray(vertices)
+    def set_mesh_connectivity (self, mesh_name, edges=None, triangles=None, quads=None, tetrahedra=None):
+        """
+        Creates edges, triangles, quads and tetrahedra of a mesh in one call. All arrays are validated before
+        any element is passed to preCICE. C-contiguous numpy.int32 arrays are passed without copying.
 
-        if len(vertices) > 0:
-            _, n = vertices.shape
-            assert n == 4, "Provided vertices are not of a [N x 4] format, but instead of a [N x {}]".format(n)
-        elif len(vertices) == 0:
-            dimensions = self.get_mesh_dimensions(mesh_name)
+        Parameters
+        ----------
+        mesh_name : str
+            Name of the mesh to add the elements to.
+        edges : array_like, optional
+            The IDs of the vertices of the edges in a numpy array [N x 2], see set_mesh_edges.
+        triangles : array_like, optional
+            The IDs of the vertices of the triangles in a numpy array [N x 3], see set_mesh_triangles.
+        quads : array_like, optional
+            The IDs of the vertices of the quads in a numpy array [N x 4], see set_mesh_quads.
+        tetrahedra : array_like, optional
+            The IDs of the vertices of the tetrahedra in a numpy array [N x 4], see set_mesh_tetrahedra.
 
-        cdef vector[int] cpp_vertices = vertices.flatten()
+        Examples
+        --------
+        Set the surface triangles and volume tetrahedra of a mesh with 5 vertices.
 
-        self.thisptr.setMeshTetrahedra (convert(mesh_name), cpp_vertices)
+        >>> triangles = np.array([[0, 1, 2], [0, 2, 3]], dtype=np.int32)
+        >>> tetrahedra = np.array([[0, 1, 2, 4], [0, 2, 3, 4]], dtype=np.int32)
+        >>> participant.set_mesh_connectivity(mesh_name, triangles=triangles, tetrahedra=tetrahedra)
+        """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        empty = np.empty(0, dtype=np.int32)
+
+        edges = empty if edges is None else as_element_array(edges, 2, "edges", "set_mesh_connectivity")
+        triangles = empty if triangles is None else as_element_array(triangles, 3, "triangles", "set_mesh_connectivity")
+        quads = empty if quads is None else as_element_array(quads, 4, "quads", "set_mesh_connectivity")
+        tetrahedra = empty if tetrahedra is None else as_element_array(tetrahedra, 4, "tetrahedra", "set_mesh_connectivity")
+
+        cdef const int[::1] cpp_edges = as_contiguous_array(edges, np.int32).ravel()
+        cdef const int[::1] cpp_triangles = as_contiguous_array(triangles, np.int32).ravel()
+        cdef const int[::1] cpp_quads = as_contiguous_array(quads, np.int32).ravel()
+        cdef const int[::1] cpp_tetrahedra = as_contiguous_array(tetrahedra, np.int32).ravel()
+        cdef string cpp_mesh_name = convert(mesh_name)
+
+        with self._lock:
+            with nogil:
+                precice_start = monotonic_time()
+                if cpp_edges.shape[0] > 0:
+                    self.thisptr.setMeshEdges (cpp_mesh_name, as_int_span(cpp_edges))
+                if cpp_triangles.shape[0] > 0:
+                    self.thisptr.setMeshTriangles (cpp_mesh_name, as_int_span(cpp_triangles))
+                if cpp_quads.shape[0] > 0:
+                    self.thisptr.setMeshQuads (cpp_mesh_name, as_int_span(cpp_quads))
+                if cpp_tetrahedra.shape[0] > 0:
+                    self.thisptr.setMeshTetrahedra (cpp_mesh_name, as_int_span(cpp_tetrahedra))
+                precice_time = monotonic_time() - precice_start
+
+        self._count("set_mesh_connectivity", start, precice_time, cpp_edges.nbytes + cpp_triangles.nbytes + cpp_quads.nbytes + cpp_tetrahedra.nbytes)
 
     # remeshing
 
@@ -763,7 +1383,9 @@ cdef class Participant:
         >>>     vertex_ids = participant.set_mesh_vertices(mesh_name, positions)
         """
 
-        self.thisptr.resetMesh (convert(mesh_name))
+        with self._lock:
+            self.thisptr.resetMesh (convert(mesh_name))
+            self._window += 1
 
     # data access
 
@@ -772,6 +1394,10 @@ cdef class Participant:
         This function writes values of specified vertices to data of a mesh.
         Values are provided as a block of continuous memory defined by values. Values are stored in a numpy array [N x D] where N = number of vertices and D = dimensions of geometry.
         The order of the provided data follows the order specified by vertices.
+        C-contiguous input of type numpy.float64 (values) and numpy.int32 (vertex_ids) is handed to preCICE without copying.
+        This includes any object exposing such memory via the buffer protocol, __array_interface__ or DLPack. Values
+        given as numpy.ndarray of type numpy.float32 are widened to double precision without temporary arrays. Other
+        input is converted once.
 
         Parameters
         ----------
@@ -828,29 +1454,10 @@ cdef class Participant:
         check_array_like(vertex_ids, "vertex_ids", "write_data")
         check_array_like(values, "values", "write_data")
 
-        if not isinstance(values, np.ndarray):
-            values = np.asarray(values)
-
-        if len(values) == 0:
-            size = 0
-        elif self.get_data_dimensions(mesh_name, data_name) == 1:
-            size = values.flatten().shape[0]
-            dimensions = 1
-        else:
-            assert len(values.shape) == 2, "Vector valued data has to be provided as a numpy array of shape [N x D] where N = number of vertices and D = number of dimensions."
-            size, dimensions = values.shape
-
-            assert dimensions == self.get_data_dimensions(mesh_name, data_name), "Dimensions of vector data in write_data do not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(dimensions, self.get_data_dimensions(mesh_name, data_name))
-
-        assert len(vertex_ids) == size, "Vertex IDs are of incorrect length in write_data. Check length of vertex ids input. Provided size: {}, expected size: {}".format(vertex_ids.size, size)
-
-        cdef vector[int] cpp_ids = vertex_ids
-        cdef vector[double] cpp_values = values.flatten()
+        self._write_data(convert(mesh_name), convert(data_name), self.get_data_dimensions(mesh_name, data_name), vertex_ids, values)
 
-        self.thisptr.writeData (convert(mesh_name), convert(data_name), cpp_ids, cpp_values)
 
-
-    def read_data (self, mesh_name, data_name, vertex_ids, relative_read_time):
+    def read_data (self, mesh_name, data_name, vertex_ids, double relative_read_time, out=None):
         """
         Reads data into a provided block. This function reads values of specified vertices
         from a dataID. Values are read into a block of continuous memory.
@@ -865,11 +1472,15 @@ cdef class Participant:
             Indices of the vertices.
         relative_read_time : double
             Point in time where data is read relative to the beginning of the current time step
+        out : numpy.ndarray, optional
+            Preallocated, writeable and C-contiguous array of dtype numpy.float64 with N * D entries. preCICE writes
+            the data directly into this array, which avoids allocating a new array on every call. An array of dtype
+            numpy.float32 is filled with the data rounded to single precision.
 
         Returns
         -------
         values : numpy.ndarray
-            Contains the read data.
+            Contains the read data. If out is given, out itself is returned.
 
         Notes
         -----
@@ -909,32 +1520,62 @@ cdef class Participant:
         >>> values = read_data(mesh_name, data_name, vertex_ids, dt)
         >>> values.shape
         >>> (5, 3)
+
+        Read vector data for a 3D system with 5 vertices into a preallocated array:
+
+        >>> values = np.empty((5, 3))
+        >>> result = read_data(mesh_name, data_name, vertex_ids, dt, out=values)
+        >>> result is values
+        >>> True
+
+        Read vector data in single precision:
+
+        >>> values = np.empty((5, 3), dtype=np.float32)
+        >>> read_data(mesh_name, data_name, vertex_ids, dt, out=values)
         """
         check_array_like(vertex_ids, "vertex_ids", "read_data")
 
-        if len(vertex_ids) == 0:
-            size = 0
-            dimensions =  self.get_data_dimensions(mesh_name, data_name)
-        elif self.get_data_dimensions(mesh_name, data_name) == 1:
-            size = len(vertex_ids)
-            dimensions = 1
-        else:
-            size = len(vertex_ids)
-            dimensions =  self.get_data_dimensions(mesh_name, data_name)
+        return self._read_data(convert(mesh_name), convert(data_name), self.get_data_dimensions(mesh_name, data_name), vertex_ids, relative_read_time, out)
+
+    def read_data_at_times (self, mesh_name, data_name, vertex_ids, relative_read_times, out=None):
+        """
+        Reads data of the given vertices at several points in time in one call, e.g. for all substeps of a
+        subcycling solver. Arguments are validated once and the data of all points in time is read into one array.
+
+        Parameters
+        ----------
+        mesh_name : str
+            Name of the mesh to read from.
+        data_name : str
+            Name of the data to read from.
+        vertex_ids : array_like
+            Indices of the vertices.
+        relative_read_times : array_like
+            Points in time where data is read relative to the beginning of the current time step.
+        out : numpy.ndarray, optional
+            Preallocated, writeable and C-contiguous array of dtype numpy.float64 with T * N * D entries. An array of
+            dtype numpy.float32 is filled with the data rounded to single precision.
 
-        cdef vector[int] cpp_ids = vertex_ids
-        cdef vector[double] cpp_values = [-1 for _ in range(size * dimensions)]
+        Returns
+        -------
+        values : numpy.ndarray
+            Contains the read data, values[i] holds the data at relative_read_times[i]. The shape is [T x N] for
+            scalar data and [T x N x D] for vector data. If out is given, out itself is returned.
 
-        self.thisptr.readData (convert(mesh_name), convert(data_name), cpp_ids, relative_read_time, cpp_values)
+        Examples
+        --------
+        Read vector data for a 3D system with 5 vertices at four substeps:
 
-        cdef np.ndarray[double, ndim=1] np_values = np.array(cpp_values, dtype=np.double)
+        >>> vertex_ids = [1, 2, 3, 4, 5]
+        >>> times = np.linspace(0.25, 1.0, 4) * dt
+        >>> values = participant.read_data_at_times("MeshOne", "DataOne", vertex_ids, times)
+        >>> values.shape
+        >>> (4, 5, 3)
+        """
+        check_array_like(vertex_ids, "vertex_ids", "read_data_at_times")
+        check_array_like(relative_read_times, "relative_read_times", "read_data_at_times")
 
-        if len(vertex_ids) == 0:
-            return np_values.reshape((size))
-        elif self.get_data_dimensions(mesh_name, data_name) == 1:
-            return np_values.reshape((size))
-        else:
-            return np_values.reshape((size, dimensions))
+        return self._read_data_at_times(convert(mesh_name), convert(data_name), self.get_data_dimensions(mesh_name, data_name), vertex_ids, relative_read_times, out)
 
     def write_and_map_data (self, mesh_name, data_name, coordinates, values):
         """
@@ -977,21 +1618,43 @@ cdef class Participant:
         >>> values = [v1, v2, v3, v4, v5]
         >>> participant.write_and_map_data(mesh_name, data_name, coordinates, values)
         """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
         check_array_like(coordinates, "coordinates", "write_and_map_data")
         check_array_like(values, "values", "write_and_map_data")
 
-        if not isinstance(coordinates, np.ndarray):
-            coordinates = np.asarray(coordinates)
-
-        if not isinstance(values, np.ndarray):
-            values = np.asarray(values)
-
-        cdef vector[double] cpp_coordinates = coordinates.flatten()
-        cdef vector[double] cpp_values = values.flatten()
-
-        self.thisptr.writeAndMapData (convert(mesh_name), convert(data_name), cpp_coordinates, cpp_values)
-
-    def map_and_read_data (self, mesh_name, data_name, coordinates, relative_read_time):
+        coordinates = as_contiguous_array(coordinates, np.double)
+        values = as_contiguous_array(values, precision_dtype(values))
+
+        cdef const double[::1] cpp_coordinates = coordinates.ravel()
+        cdef const double[::1] cpp_values
+        cdef const float[::1] cpp_single_values
+        cdef string cpp_mesh_name = convert(mesh_name)
+        cdef string cpp_data_name = convert(data_name)
+        cdef CppParticipant.span[CppParticipant.const_double] coordinates_span = as_double_span(cpp_coordinates)
+        cdef CppParticipant.span[CppParticipant.const_double] values_span
+
+        if values.dtype == np.single:
+            cpp_single_values = values.ravel()
+            with self._lock:
+                with nogil:
+                    values_span = widen(cpp_single_values, self._buffer)
+                    precice_start = monotonic_time()
+                    self.thisptr.writeAndMapData (cpp_mesh_name, cpp_data_name, coordinates_span, values_span)
+                    precice_time = monotonic_time() - precice_start
+        else:
+            cpp_values = values.ravel()
+            values_span = as_double_span(cpp_values)
+            with self._lock:
+                with nogil:
+                    precice_start = monotonic_time()
+                    self.thisptr.writeAndMapData (cpp_mesh_name, cpp_data_name, coordinates_span, values_span)
+                    precice_time = monotonic_time() - precice_start
+
+        self._count("write_and_map_data", start, precice_time, cpp_coordinates.nbytes + values.nbytes)
+        if self._recorder is not None:
+            self._recorder.record({"call": "write_and_map_data", "mesh": cpp_mesh_name.decode(), "data": cpp_data_name.decode(), "dimensions": self.get_data_dimensions(mesh_name, data_name)}, {"coordinates": coordinates, "values": values})
+
+    def map_and_read_data (self, mesh_name, data_name, coordinates, double relative_read_time, out=None):
         """
         This function reads values at temporary locations from data of a mesh.
         As opposed to the readData function using VertexIDs, this function allows reading data via coordinates,
@@ -1012,11 +1675,13 @@ cdef class Participant:
             Coordinates of the vertices.
         relative_read_time : double
             Point in time where data is read relative to the beginning of the current time step
+        out : numpy.ndarray, optional
+            Preallocated output array, see read_data.
 
         Returns
         -------
         values : numpy.ndarray
-            Contains the read data.
+            Contains the read data. If out is given, out itself is returned.
 
         Examples
         --------
@@ -1040,33 +1705,61 @@ cdef class Participant:
         >>> values.shape
         >>> (2, )
         """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
         check_array_like(coordinates, "coordinates", "map_and_read_data")
 
-        if not isinstance(coordinates, np.ndarray):
-            coordinates = np.asarray(coordinates)
+        coordinates = as_contiguous_array(coordinates, np.double)
 
         size = coordinates.shape[0]
-        dimensions =  self.get_data_dimensions(mesh_name, data_name)
-
-        cdef vector[double] cpp_coordinates = coordinates.flatten()
-        cdef vector[double] cpp_values = [-1 for _ in range(size * dimensions)]
+        dimensions = self.get_data_dimensions(mesh_name, data_name)
 
-        self.thisptr.mapAndReadData (convert(mesh_name), convert(data_name), cpp_coordinates, relative_read_time, cpp_values)
-
-        cdef np.ndarray[double, ndim=1] np_values = np.array(cpp_values, dtype=np.double)
-
-        if len(coordinates) == 0:
-            return np_values.reshape((size))
-        elif self.get_data_dimensions(mesh_name, data_name) == 1:
-            return np_values.reshape((size))
+        if out is None:
+            if size == 0 or dimensions == 1:
+                out = np.empty(size, dtype=np.double)
+            else:
+                out = np.empty((size, dimensions), dtype=np.double)
         else:
-            return np_values.reshape((size, dimensions))
-
-    def write_gradient_data (self, mesh_name, data_name, vertex_ids, gradients):
+            check_output_array(out, precision_dtype(out), size * dimensions, "out", "map_and_read_data")
+
+        cdef const double[::1] cpp_coordinates = coordinates.ravel()
+        cdef double[::1] cpp_values
+        cdef float[::1] cpp_single_values
+        cdef string cpp_mesh_name = convert(mesh_name)
+        cdef string cpp_data_name = convert(data_name)
+        cdef CppParticipant.span[CppParticipant.const_double] coordinates_span = as_double_span(cpp_coordinates)
+        cdef CppParticipant.span[double] values_span
+
+        if out.dtype == np.single:
+            cpp_single_values = out.reshape(-1)
+            with self._lock:
+                with nogil:
+                    self._buffer.resize(cpp_single_values.shape[0])
+                    values_span = CppParticipant.span[double](self._buffer.data(), self._buffer.size())
+                    precice_start = monotonic_time()
+                    self.thisptr.mapAndReadData (cpp_mesh_name, cpp_data_name, coordinates_span, relative_read_time, values_span)
+                    precice_time = monotonic_time() - precice_start
+                    narrow(self._buffer, cpp_single_values)
+        else:
+            cpp_values = out.reshape(-1)
+            values_span = as_mutable_double_span(cpp_values)
+            with self._lock:
+                with nogil:
+                    precice_start = monotonic_time()
+                    self.thisptr.mapAndReadData (cpp_mesh_name, cpp_data_name, coordinates_span, relative_read_time, values_span)
+                    precice_time = monotonic_time() - precice_start
+
+        self._count("map_and_read_data", start, precice_time, cpp_coordinates.nbytes + out.nbytes)
+        if self._recorder is not None:
+            self._recorder.record({"call": "map_and_read_data", "mesh": cpp_mesh_name.decode(), "data": cpp_data_name.decode(), "dimensions": dimensions, "dt": relative_read_time}, {"coordinates": coordinates, "values": out})
+        return out
+
+    def write_gradient_data (self, mesh_name, data_name, vertex_ids, gradients, axis_order=None):
         """
         Writes gradient data given as block. This function writes gradient values of specified vertices to a dataID.
         Values are provided as a block of continuous memory. Values are stored in a numpy array [N x D] where N = number
-        of vertices and D = number of gradient components.
+        of vertices and D = number of gradient components. Zero-copy rules are identical to write_data.
+        Gradients of vector data can also be given per vertex as matrix [N x D_data x D_mesh] or [N x D_mesh x D_data],
+        see axis_order.
 
         Parameters
         ----------
@@ -1078,6 +1771,11 @@ cdef class Participant:
             Indices of the vertices.
         gradients : array_like
              Gradient values differentiated in the spatial direction (dx, dy) for 2D space, (dx, dy, dz) for 3D space
+        axis_order : str, optional
+            Order of the axes of gradients of vector data given as [N x D x D] array. "component-first" for
+            gradients[n, i, j] = dv_i/dx_j as in a Jacobian, which is permuted to the order of preCICE in one pass
+            without temporary arrays, and "derivative-first" for gradients[n, j, i] = dv_i/dx_j, which is the order of
+            preCICE. Required for [N x D x D] arrays, ignored for scalar data.
 
         Notes
         -----
@@ -1112,26 +1810,16 @@ cdef class Participant:
         >>> vertex_ids = [1, 2]
         >>> gradients = np.array([[v1x_dx, v1y_dx, v1z_dx, v1x_dy, v1y_dy, v1z_dy, v1x_dz, v1y_dz, v1z_dz], [v2x_dx, v2y_dx, v2z_dx, v2x_dy, v2y_dy, v2z_dy, v2x_dz, v2y_dz, v2z_dz]])
         >>> participant.write_gradient_data(mesh_name, data_name, vertex_ids, gradients)
+
+        Write the Jacobians of vector data for a 3D problem with 2 vertices:
+
+        >>> jacobians = np.array([[[v1x_dx, v1x_dy, v1x_dz], [v1y_dx, v1y_dy, v1y_dz], [v1z_dx, v1z_dy, v1z_dz]], [[v2x_dx, v2x_dy, v2x_dz], [v2y_dx, v2y_dy, v2y_dz], [v2z_dx, v2z_dy, v2z_dz]]])
+        >>> participant.write_gradient_data(mesh_name, data_name, vertex_ids, jacobians, axis_order="component-first")
         """
         check_array_like(vertex_ids, "vertex_ids", "write_gradient_data")
         check_array_like(gradients, "gradients", "write_gradient_data")
 
-        if not isinstance(gradients, np.ndarray):
-            gradients = np.asarray(gradients)
-
-        if len(gradients) > 0:
-            size, dimensions = gradients.shape
-            assert dimensions == self.get_mesh_dimensions(mesh_name) * self.get_data_dimensions(mesh_name, data_name), "Dimensions of vector data in write_gradient_data does not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(dimensions, self.get_mesh_dimensions(mesh_name) *  self.get_data_dimensions (mesh_name, data_name))
-        if len(gradients) == 0:
-            size = 0
-
-        cdef vector[int] cpp_vertex_ids = vertex_ids
-        cdef vector[double] cpp_gradients = gradients.flatten()
-
-        assert cpp_gradients.size() == size * self.get_mesh_dimensions(mesh_name) * self.get_data_dimensions (mesh_name, data_name), "Dimension of gradient data provided in write_gradient_data does not match problem definition. Check length of input data provided. Provided size: {}, expected size: {}".format(cpp_gradients.size(), size * self.get_mesh_dimensions(mesh_name) * self.get_data_dimensions (mesh_name, data_name))
-        assert cpp_vertex_ids.size() == size, "Vertex IDs are of incorrect length in write_gradient_data. Check length of vertex ids input. Provided size: {}, expected size: {}".format(cpp_vertex_ids.size(), size)
-
-        self.thisptr.writeGradientData (convert(mesh_name), convert(data_name), cpp_vertex_ids, cpp_gradients)
+        self._write_gradient_data(convert(mesh_name), convert(data_name), self.get_mesh_dimensions(mesh_name), self.get_data_dimensions(mesh_name, data_name), vertex_ids, gradients, axis_order)
 
     def requires_gradient_data_for(self, mesh_name, data_name):
         """
@@ -1157,7 +1845,8 @@ cdef class Participant:
         >>> data_name = "DataOne"
         >>> participant.is_gradient_data_required(mesh_name, data_name)
         """
-        return self.thisptr.requiresGradientDataFor(convert(mesh_name), convert(data_name))
+        with self._lock:
+            return self.thisptr.requiresGradientDataFor(convert(mesh_name), convert(data_name))
 
     def set_mesh_access_region(self, mesh_name, bounding_box):
         """
@@ -1213,9 +1902,10 @@ cdef class Participant:
 
         cdef vector[double] cpp_bounding_box = list(bounding_box)
 
-        self.thisptr.setMeshAccessRegion(convert(mesh_name), cpp_bounding_box)
+        with self._lock:
+            self.thisptr.setMeshAccessRegion(convert(mesh_name), cpp_bounding_box)
 
-    def get_mesh_vertex_ids_and_coordinates(self, mesh_name):
+    def get_mesh_vertex_ids_and_coordinates(self, mesh_name, out=None):
         """
         Iterating over the region of interest defined by bounding boxes and reading the corresponding
         coordinates omitting the mapping. This function is still experimental.
@@ -1224,6 +1914,10 @@ cdef class Participant:
         ----------
         mesh_name : str
             Corresponding mesh name
+        out : tuple of numpy.ndarray, optional
+            Preallocated arrays (ids, coordinates) which are filled directly by preCICE. ids has to be a
+            C-contiguous numpy.int32 array with N entries and coordinates a C-contiguous numpy.float64 array
+            with N * D entries, where N = get_mesh_vertex_size(mesh_name) and D = get_mesh_dimensions(mesh_name).
 
         Returns
         -------
@@ -1232,18 +1926,70 @@ cdef class Participant:
         coordinates : numpy.ndarray
             he coordinates associated to the IDs and corresponding data values (dim * size)
         """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
         size = self.get_mesh_vertex_size(mesh_name)
         dimensions = self.get_mesh_dimensions(mesh_name)
 
-        cdef vector[int] cpp_ids = [-1 for _ in range(size)]
-        cdef vector[double] cpp_coordinates = [-1 for _ in range(size * dimensions)]
+        if out is None:
+            ids = np.empty(size, dtype=np.int32)
+            coordinates = np.empty((size, dimensions), dtype=np.double)
+        else:
+            ids, coordinates = out
+            check_output_array(ids, np.int32, size, "ids", "get_mesh_vertex_ids_and_coordinates")
+            check_output_array(coordinates, np.double, size * dimensions, "coordinates", "get_mesh_vertex_ids_and_coordinates")
+
+        cdef int[::1] cpp_ids = ids.reshape(-1)
+        cdef double[::1] cpp_coordinates = coordinates.reshape(-1)
+        cdef string cpp_mesh_name = convert(mesh_name)
+        cdef CppParticipant.span[int] ids_span = as_mutable_int_span(cpp_ids)
+        cdef CppParticipant.span[double] coordinates_span = as_mutable_double_span(cpp_coordinates)
+
+        with self._lock:
+            with nogil:
+                precice_start = monotonic_time()
+                self.thisptr.getMeshVertexIDsAndCoordinates(cpp_mesh_name, ids_span, coordinates_span)
+                precice_time = monotonic_time() - precice_start
+
+        self._count("get_mesh_vertex_ids_and_coordinates", start, precice_time, ids.nbytes + coordinates.nbytes)
+        if self._recorder is not None:
+            self._recorder.record({"call": "get_mesh_vertex_ids_and_coordinates", "mesh": cpp_mesh_name.decode(), "dimensions": dimensions}, {"ids": ids, "coordinates": coordinates})
+        return ids, coordinates
+
+    def get_mesh_vertex_index(self, mesh_name):
+        """
+        Returns a spatial index over the vertices of a mesh received via direct access, i.e. over the vertices
+        returned by get_mesh_vertex_ids_and_coordinates(), for finding the vertices close to given points.
+
+        The index is kept and only rebuilt if the received vertices changed. They are only fetched again after the
+        participant was initialized or advanced or a mesh was reset.
+
+        Parameters
+        ----------
+        mesh_name : str
+            Name of the mesh, see set_mesh_access_region().
 
-        self.thisptr.getMeshVertexIDsAndCoordinates(convert(mesh_name), cpp_ids, cpp_coordinates)
+        Returns
+        -------
+        index : VertexIndex
+            Spatial index over the received vertices.
 
-        cdef np.ndarray[int, ndim=1] np_ids = np.array(cpp_ids, dtype=np.int32)
-        cdef np.ndarray[double, ndim=1] np_coordinates = np.array(cpp_coordinates, dtype=np.double)
+        Examples
+        --------
+        >>> index = participant.get_mesh_vertex_index("Fluid-Mesh")
+        >>> vertex_ids, distances = index.nearest(solid_points)
+        >>> values = participant.read_data("Fluid-Mesh", "Pressure", vertex_ids, dt)
+        """
+        cached = self._vertex_indices.get(mesh_name)
+        if cached is not None and cached[0] == self._window:
+            return cached[1]
 
-        return np_ids, np_coordinates.reshape((size, dimensions))
+        ids, coordinates = self.get_mesh_vertex_ids_and_coordinates(mesh_name)
+        if cached is not None and np.array_equal(cached[1].ids, ids) and np.array_equal(cached[1].coordinates, coordinates):
+            index = cached[1]
+        else:
+            index = VertexIndex(ids, coordinates)
+        self._vertex_indices[mesh_name] = (self._window, index)
+        return index
 
     def start_profiling_section(self, event_name):
         """
@@ -1261,7 +2007,10 @@ cdef class Participant:
         >>> event_name = "EventOne"
         >>> participant.start_profiling_section(event_name)
         """
-        self.thisptr.startProfilingSection(convert(event_name))
+        cdef string cpp_name = self._profiling_name(event_name)
+
+        with self._lock:
+            self.thisptr.startProfilingSection(cpp_name)
 
     def stop_last_profiling_section(self):
         """
@@ -1273,7 +2022,2373 @@ cdef class Participant:
 
         >>> participant.stop_last_profiling_section()
         """
-        self.thisptr.stopLastProfilingSection()
+        with self._lock:
+            self.thisptr.stopLastProfilingSection()
+
+    def profile(self, event_name):
+        """
+        Returns a context manager which profiles the enclosed block as a section with the given event name. The
+        section is stopped also if the block raises an exception, such that nested sections stay consistent.
+        The event name is only encoded on first use.
+
+        Parameters
+        ----------
+        event_name : str
+            Name of the event to profile.
+
+        Returns
+        -------
+        section : ProfilingSection
+            Context manager starting and stopping the profiling section.
+
+        Examples
+        --------
+        >>> with participant.profile("assemble"):
+        ...     assemble_system()
+        """
+        return ProfilingSection(self, event_name, self._profiling_name(event_name))
+
+    cdef bytes _profiling_name(self, event_name):
+        """
+        Returns the encoded event name, which is only encoded on first use. Only names are kept on the participant,
+        since sections hold a reference to the participant.
+        """
+        cpp_name = self._profiling_names.get(event_name)
+        if cpp_name is None:
+            cpp_name = self._profiling_names[event_name] = convert(event_name)
+        return cpp_name
+
+    def profiled(self, func=None, event_name=None):
+        """
+        Decorator which profiles every call of the decorated function as a section, see profile(). The event name
+        defaults to the qualified name of the function.
+
+        Parameters
+        ----------
+        func : callable, optional
+            Function to profile.
+        event_name : str, optional
+            Name of the event to profile.
+
+        Examples
+        --------
+        >>> @participant.profiled
+        ... def assemble_system():
+        ...     pass
+
+        >>> @participant.profiled("solve")
+        ... def solve_system():
+        ...     pass
+        """
+        if isinstance(func, str):
+            func, event_name = None, func
+        if func is None:
+            return functools.partial(self.profiled, event_name=event_name)
+
+        return self.profile(event_name or func.__qualname__)(func)
+
+    # counters
+
+    def enable_counters(self, enabled=True, report=None, communicator=None):
+        """
+        Enables or disables counting calls, time and bytes moved of the methods passing data to preCICE and of the
+        steering methods. Enabling resets all counters.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Whether to count.
+        report : str, optional
+            Path of a JSON file to which finalize() writes the counters of all ranks, see write_counter_report().
+        communicator : mpi4py.MPI.Comm, optional
+            Communicator of the ranks of this participant for the report, see write_counter_report().
+        """
+        self._counters = {} if enabled else None
+        self._counter_report = (report, communicator) if enabled and report is not None else None
+
+    def write_counter_report(self, file_name, communicator=None):
+        """
+        Gathers the counters of all ranks of this participant and writes the minimum, maximum and mean of each
+        counter over the ranks as well as the five ranks which spent the most time in each method as one JSON file
+        from rank 0. This has to be called by all ranks.
+
+        Parameters
+        ----------
+        file_name : str
+            Path of the JSON file.
+        communicator : mpi4py.MPI.Comm, optional
+            Communicator of the ranks of this participant. Defaults to the communicator given to the constructor if
+            it is an mpi4py communicator and to MPI.COMM_WORLD otherwise. Without mpi4py, only the counters of this
+            rank are written.
+
+        Examples
+        --------
+        >>> participant.enable_counters()
+        >>> ...
+        >>> participant.write_counter_report("counters.json")
+
+        The report contains, e.g.:
+
+        {"ranks": 2000, "methods": {"read_data": {"calls": {"min": 100, "max": 100, "mean": 100.0},
+         "time": {"min": 0.01, "max": 0.9, "mean": 0.02}, "slowest": [[1337, 0.9], ...], ...}}}
+        """
+        if communicator is None and self._communicator is not None and not isinstance(self._communicator, int):
+            communicator = self._communicator
+        if communicator is None:
+            try:
+                from mpi4py import MPI
+                communicator = MPI.COMM_WORLD
+            except ImportError:
+                pass
+
+        counters = self.get_counters()
+        if communicator is None:
+            rank = self._process_index
+            counters = [counters]
+        else:
+            rank = communicator.Get_rank()
+            counters = communicator.gather(counters, root=0)
+
+        if rank == 0:
+            with open(file_name, "w") as file:
+                json.dump(summarize_counters(counters, 5), file, separators=(",", ":"))
+
+    def get_counters(self):
+        """
+        Returns the counters collected since enable_counters() was called.
+
+        Returns
+        -------
+        counters : dict
+            Maps the name of each called method to a dict with the number of "calls", the total "time" spent in the
+            method, the part of it spent in "precice" and the number of "bytes" passed in or out, including vertex
+            IDs. The difference of "time" and "precice" is the time needed for converting and checking arguments.
+
+        Examples
+        --------
+        >>> participant.enable_counters()
+        >>> participant.read_data(mesh_name, data_name, vertex_ids, dt)
+        >>> participant.get_counters()["read_data"]
+        {'calls': 1, 'time': 1.2e-05, 'precice': 2.1e-06, 'bytes': 60}
+        """
+        if self._counters is None:
+            return {}
+        return {name: dict(zip(("calls", "time", "precice", "bytes"), counter)) for name, counter in self._counters.items()}
+
+    cdef _count(self, name, double start, double precice_time, Py_ssize_t nbytes, double end=0):
+        # end defaults to now, it is given for calls counted after further work, e.g. in _step()
+        if self._counters is None and self._timeline is None:
+            return
+        cdef double elapsed = (end if end > 0 else monotonic_time()) - start
+        if self._timeline is not None:
+            self._timeline.append((name, start, elapsed, precice_time))
+        if self._counters is None:
+            return
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = self._counters[name] = [0, 0.0, 0.0, 0]
+        counter[0] += 1
+        counter[1] += elapsed
+        counter[2] += precice_time
+        counter[3] += nbytes
+
+    # timeline
+
+    def enable_timeline(self, enabled=True):
+        """
+        Enables or disables recording a timeline of the calls of the methods passing data to preCICE and of the
+        steering methods, see write_timeline(). Enabling discards the timeline recorded so far.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Whether to record.
+        """
+        self._timeline = [] if enabled else None
+
+    def write_timeline(self, file_name):
+        """
+        Writes the timeline recorded since enable_timeline() as Chrome trace JSON file, which can be opened in
+        Perfetto (ui.perfetto.dev) or chrome://tracing, and returns the summary of every time window.
+
+        Every call is shown with the part spent in preCICE, e.g. waiting for the coupling partners in advance(),
+        at its end, such that the remaining part is the time needed for converting and checking arguments. The time
+        between calls is shown as "solver". Implicit iterations and time windows are shown in a second row.
+        Timestamps are taken from the monotonic clock of the node, such that timelines of participants on the same
+        node can be merged by concatenating their "traceEvents".
+
+        Parameters
+        ----------
+        file_name : str
+            Path of the JSON file.
+
+        Returns
+        -------
+        windows : list of dict
+            Per time window, the number of "iterations" and the total "duration", the time spent in the "solver"
+            between calls, in the "bindings" converting and checking arguments, in "precice" for data access and in
+            "advance" (in seconds). The summary is also stored as "windows" in the file.
+
+        Examples
+        --------
+        >>> participant.enable_timeline()
+        >>> ...
+        >>> participant.finalize()
+        >>> windows = participant.write_timeline("timeline.json")
+        >>> max(window["advance"] for window in windows)
+        0.8
+        """
+        assert self._timeline is not None, "write_timeline requires enable_timeline() to be called before"
+
+        pid = self._process_index
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "{} (rank {})".format(self._solver_name, pid)}}]
+        windows = []
+        window = dict.fromkeys(("iterations", "duration", "solver", "bindings", "precice", "advance"), 0)
+        iteration_start = end = None
+
+        for name, start, duration, precice_time in sorted(self._timeline, key=lambda event: event[1]):
+            if name == "time window complete":
+                windows.append(window)
+                events.append({"name": "time window {}".format(len(windows)), "ph": "X", "pid": pid, "tid": 1,
+                               "ts": (start - window["duration"]) * 1e6, "dur": window["duration"] * 1e6})
+                window = dict.fromkeys(window, 0)
+                continue
+
+            if end is not None and start > end:
+                events.append({"name": "solver", "ph": "X", "pid": pid, "tid": 0, "ts": end * 1e6, "dur": (start - end) * 1e6})
+                if iteration_start is not None:
+                    window["solver"] += start - end
+            events.append({"name": name, "ph": "X", "pid": pid, "tid": 0, "ts": start * 1e6, "dur": duration * 1e6,
+                           "args": {"precice": precice_time * 1e6, "bindings": (duration - precice_time) * 1e6}})
+            if precice_time > 0:
+                events.append({"name": "preCICE", "ph": "X", "pid": pid, "tid": 0, "ts": (start + duration - precice_time) * 1e6, "dur": precice_time * 1e6})
+            end = start + duration
+
+            if iteration_start is None:
+                iteration_start = end if name == "initialize" else None
+                continue
+            if name == "advance":
+                window["advance"] += duration
+                window["iterations"] += 1
+                window["duration"] += end - iteration_start
+                events.append({"name": "iteration", "ph": "X", "pid": pid, "tid": 1, "ts": iteration_start * 1e6, "dur": (end - iteration_start) * 1e6})
+                iteration_start = end
+            else:
+                window["bindings"] += duration - precice_time
+                window["precice"] += precice_time
+
+        with open(file_name, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "windows": windows}, file, separators=(",", ":"))
+        return windows
+
+    cdef _mark_time_window(self, double time):
+        """
+        Marks the end of a time window at the given time on the timeline if the last advance() completed one.
+        """
+        if self._timeline is None:
+            return
+        with self._lock:
+            complete = self.thisptr.isTimeWindowComplete()
+        if complete:
+            self._timeline.append(("time window complete", time, 0.0, 0.0))
+
+    # recording
+
+    def enable_recording(self, directory=None):
+        """
+        Records the coupling traffic of this participant into a trace directory, which ReplayParticipant replays
+        without the coupling partners. Recorded are the vertex IDs returned by set_mesh_vertex() and
+        set_mesh_vertices(), the vertices returned by get_mesh_vertex_ids_and_coordinates(), all calls of read_data(),
+        read_data_at_times(), map_and_read_data(), write_data() and write_and_map_data() including those of Data
+        handles with vertex IDs or coordinates and values, the relative read times and the time step sizes as well
+        as the coupling state after initialize() and every advance(), including steps(). Reads of an ExchangePlan, also by steps(), are recorded like read_data(), while its writes
+        are not recorded, as they are discarded on replay. Data exchanged by VertexSet or the unchecked API is not
+        recorded.
+
+        Vertex IDs and values are appended to the file arrays.bin, which is read memory-mapped by ReplayParticipant,
+        and every call to the file events.jsonl. The trace is closed by finalize().
+
+        Parameters
+        ----------
+        directory : str, optional
+            Directory of the trace, which is created if needed. None stops recording.
+
+        Examples
+        --------
+        >>> participant.enable_recording("solid-trace")
+        >>> participant.initialize()
+        """
+        if self._recorder is not None:
+            self._recorder.close()
+        self._recorder = None if directory is None else TraceRecorder(directory)
+
+    cdef _record_plan_reads(self, plan, double relative_read_time):
+        """
+        Records the reads of an ExchangePlan executed last, as if read by read_data().
+        """
+        cdef ExchangePlan exchange = plan
+        for mesh_name, data_name, dimensions, vertex_ids, out in exchange._reads:
+            self._recorder.record({"call": "read_data", "mesh": mesh_name, "data": data_name, "dimensions": dimensions, "dt": relative_read_time}, {"ids": vertex_ids, "values": out})
+
+    cdef dict _coupling_state(self):
+        """
+        Returns the state of the coupling queried by the adapter between time steps.
+        """
+        with self._lock:
+            state = {
+                "ongoing": self.thisptr.isCouplingOngoing(),
+                "time_window_complete": self.thisptr.isTimeWindowComplete(),
+                "writing_checkpoint": self.thisptr.requiresWritingCheckpoint(),
+                "reading_checkpoint": self.thisptr.requiresReadingCheckpoint(),
+            }
+            state["max_time_step_size"] = self.thisptr.getMaxTimeStepSize() if state["ongoing"] else 0.0
+        return state
+
+    # handles
+
+    def mesh(self, mesh_name):
+        """
+        Returns a handle to the given mesh. Name and dimensions of the mesh are resolved once, such that data
+        handles obtained from it can exchange data without repeated lookups.
+
+        Parameters
+        ----------
+        mesh_name : str
+            Name of the mesh.
+
+        Returns
+        -------
+        mesh : Mesh
+            Handle to the mesh.
+
+        Examples
+        --------
+        >>> forces = participant.mesh("Fluid-Mesh").data("Forces")
+        >>> forces.write(vertex_ids, values)
+        """
+        return Mesh(self, mesh_name)
+
+    @property
+    def unchecked(self):
+        """
+        Low-level API of this participant without validation and conversion of the arguments, see
+        UncheckedParticipant. Every access creates a new handle, hence keep it in a local variable for hot loops.
+
+        Examples
+        --------
+        >>> raw = participant.unchecked
+        >>> raw.write_data(b"Fluid-Mesh", b"Forces", vertex_ids, forces.reshape(-1))
+        """
+        return UncheckedParticipant(self)
+
+    @property
+    def c_api(self):
+        """
+        C function-pointer table of this participant for compiled code, see ParticipantCApi. Every access creates
+        a new table, which has to be kept alive as long as its functions are called.
+
+        Examples
+        --------
+        >>> c_api = participant.c_api
+        >>> functions = c_api.ctypes_functions()
+        >>> functions["write_data"](functions["participant"], b"Fluid-Mesh", b"Forces", ids, n, values, values.size)
+        """
+        return ParticipantCApi(self)
+
+    # coupling loop
+
+    def steps(self, plan=None, checkpoint=None, max_time_step_size=None):
+        """
+        Drives the coupling loop: yields the size of every time step to compute as long as the coupling is ongoing,
+        writes the data of plan and advances preCICE after each step, and saves and restores checkpoint as required
+        by preCICE. Right after advancing, all read data of plan is read for the next step in the same native pass
+        as the queries of the coupling state, such that the read buffers are ready when the next step starts.
+
+        Parameters
+        ----------
+        plan : ExchangePlan, optional
+            Data to read before and write after every time step. Data is read at the end of the time step.
+        checkpoint : Checkpoint, optional
+            Solver state to save and restore for implicit coupling. The read buffers of plan must not be part of it,
+            as they are filled before the checkpoint is saved or restored.
+        max_time_step_size : double, optional
+            Maximum time step size of the solver. Time steps are the smaller of this and the maximum time step size
+            of preCICE.
+
+        Yields
+        ------
+        dt : double
+            Size of the time step to compute.
+
+        Examples
+        --------
+        >>> plan = precice.ExchangePlan(participant)
+        >>> plan.add_read("Fluid-Mesh", "Displacements", vertex_ids, displacements)
+        >>> plan.add_write("Fluid-Mesh", "Forces", vertex_ids, forces)
+        >>> checkpoint = precice.Checkpoint(participant)
+        >>> checkpoint.register(state)
+        >>> participant.initialize()
+        >>> for dt in participant.steps(plan, checkpoint, max_time_step_size=0.1):
+        ...     solve(state, displacements, forces, dt)
+        >>> participant.finalize()
+        """
+        if plan is not None and not isinstance(plan, ExchangePlan):
+            raise TypeError("steps requires an ExchangePlan for plan, but was provided the following input type: {}".format(type(plan)))
+        if checkpoint is not None and not isinstance(checkpoint, Checkpoint):
+            raise TypeError("steps requires a Checkpoint for checkpoint, but was provided the following input type: {}".format(type(checkpoint)))
+
+        cdef double max_dt = INFINITY if max_time_step_size is None else max_time_step_size
+        reading_checkpoint, ongoing, writing_checkpoint, dt = self._step(plan, False, 0, max_dt)
+        while ongoing:
+            if writing_checkpoint and checkpoint is not None:
+                checkpoint.save()
+            yield dt
+            if plan is not None:
+                plan.execute_writes()
+            reading_checkpoint, ongoing, writing_checkpoint, dt = self._step(plan, True, dt, max_dt)
+            if reading_checkpoint and checkpoint is not None:
+                checkpoint.restore()
+
+    cdef tuple _step(self, plan, bint advance, double computed_timestep_length, double max_time_step_size):
+        """
+        Advances preCICE if requested, queries the coupling state and reads the data of plan for the next time step,
+        all without releasing the lock. Returns whether a checkpoint has to be read, whether the coupling is ongoing,
+        whether a checkpoint has to be written and the size of the next time step.
+        """
+        cdef ExchangePlan exchange = plan
+        cdef double precice_start = 0, precice_time = 0, reads_start = 0, reads_time = 0
+        cdef bint reading_checkpoint = False, ongoing, writing_checkpoint = False
+        cdef double dt = 0
+        cdef size_t i
+        cdef Py_ssize_t nbytes = 0
+
+        with self._lock:
+            with nogil:
+                if advance:
+                    precice_start = monotonic_time()
+                    self.thisptr.advance (computed_timestep_length)
+                    precice_time = monotonic_time() - precice_start
+                    reading_checkpoint = self.thisptr.requiresReadingCheckpoint ()
+                ongoing = self.thisptr.isCouplingOngoing ()
+                if ongoing:
+                    writing_checkpoint = self.thisptr.requiresWritingCheckpoint ()
+                    dt = min(self.thisptr.getMaxTimeStepSize (), max_time_step_size)
+                    if exchange is not None:
+                        reads_start = monotonic_time()
+                        for i in range(exchange._read_ids.size()):
+                            self.thisptr.readData (exchange._read_mesh_names[i], exchange._read_data_names[i], exchange._read_ids[i], dt, exchange._read_values[i])
+                            nbytes += exchange._read_ids[i].size() * sizeof(int) + exchange._read_values[i].size() * sizeof(double)
+                        reads_time = monotonic_time() - reads_start
+            if advance:
+                self._window += 1
+
+        # there are no arguments to convert, hence all time is spent in preCICE. The calls are counted with the
+        # times taken within the lock, as the reads follow the advance.
+        if advance:
+            self._count("advance", precice_start, precice_time, 0, precice_start + precice_time)
+            self._mark_time_window(precice_start + precice_time)
+            if self._recorder is not None:
+                self._recorder.record({"call": "advance", "dt": computed_timestep_length, "state": self._coupling_state()})
+        if exchange is not None and ongoing:
+            self._count("ExchangePlan.execute_reads", reads_start, reads_time, nbytes, reads_start + reads_time)
+            if self._recorder is not None:
+                self._record_plan_reads(exchange, dt)
+        return reading_checkpoint, ongoing, writing_checkpoint, dt
+
+    # internal mesh and data access shared by the public methods and the handles
+
+    cdef _set_mesh_elements(self, mesh_name, vertices, int element_type, int vertices_per_element, chunk_size, function_name):
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        vertices = as_element_array(vertices, vertices_per_element, "vertices", function_name)
+
+        size = len(vertices)
+        chunk_size = check_chunk_size(chunk_size, size)
+
+        cdef string cpp_mesh_name = convert(mesh_name)
+        cdef const int[::1] cpp_vertices
+        cdef CppParticipant.span[CppParticipant.const_int] vertices_span
+        cdef Py_ssize_t nbytes = 0
+
+        for first in range(0, max(size, 1), chunk_size):
+            cpp_vertices = as_contiguous_array(vertices[first:first + chunk_size], np.int32).ravel()
+            vertices_span = as_int_span(cpp_vertices)
+            nbytes += cpp_vertices.nbytes
+
+            with self._lock:
+                with nogil:
+                    precice_start = monotonic_time()
+                    if element_type == EDGE:
+                        self.thisptr.setMeshEdges (cpp_mesh_name, vertices_span)
+                    elif element_type == TRIANGLE:
+                        self.thisptr.setMeshTriangles (cpp_mesh_name, vertices_span)
+                    elif element_type == QUAD:
+                        self.thisptr.setMeshQuads (cpp_mesh_name, vertices_span)
+                    else:
+                        self.thisptr.setMeshTetrahedra (cpp_mesh_name, vertices_span)
+                    precice_time += monotonic_time() - precice_start
+
+        self._count(function_name, start, precice_time, nbytes)
+
+    # the following methods expect names to be encoded already
+
+    cdef _write_data(self, const string& mesh_name, const string& data_name, int data_dimensions, vertex_ids, values):
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        values = as_contiguous_array(values, precision_dtype(values))
+        vertex_ids = as_contiguous_array(vertex_ids, np.int32)
+
+        if len(values) == 0:
+            size = 0
+        elif data_dimensions == 1:
+            size = values.size
+        else:
+            assert len(values.shape) == 2, "Vector valued data has to be provided as a numpy array of shape [N x D] where N = number of vertices and D = number of dimensions."
+            size, dimensions = values.shape
+
+            assert dimensions == data_dimensions, "Dimensions of vector data in write_data do not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(dimensions, data_dimensions)
+
+        assert vertex_ids.size == size, "Vertex IDs are of incorrect length in write_data. Check length of vertex ids input. Provided size: {}, expected size: {}".format(vertex_ids.size, size)
+
+        cdef const int[::1] cpp_ids = vertex_ids.ravel()
+        cdef const double[::1] cpp_values
+        cdef const float[::1] cpp_single_values
+        cdef CppParticipant.span[CppParticipant.const_int] ids_span = as_int_span(cpp_ids)
+        cdef CppParticipant.span[CppParticipant.const_double] values_span
+
+        if values.dtype == np.single:
+            cpp_single_values = values.ravel()
+            with self._lock:
+                with nogil:
+                    values_span = widen(cpp_single_values, self._buffer)
+                    precice_start = monotonic_time()
+                    self.thisptr.writeData (mesh_name, data_name, ids_span, values_span)
+                    precice_time = monotonic_time() - precice_start
+        else:
+            cpp_values = values.ravel()
+            values_span = as_double_span(cpp_values)
+            with self._lock:
+                with nogil:
+                    precice_start = monotonic_time()
+                    self.thisptr.writeData (mesh_name, data_name, ids_span, values_span)
+                    precice_time = monotonic_time() - precice_start
+
+        self._count("write_data", start, precice_time, cpp_ids.nbytes + values.nbytes)
+        if self._recorder is not None:
+            self._recorder.record({"call": "write_data", "mesh": mesh_name.decode(), "data": data_name.decode(), "dimensions": data_dimensions}, {"ids": vertex_ids, "values": values})
+
+    cdef _read_data(self, const string& mesh_name, const string& data_name, int data_dimensions, vertex_ids, double relative_read_time, out):
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        vertex_ids = as_contiguous_array(vertex_ids, np.int32)
+
+        size = vertex_ids.size
+
+        if out is None:
+            if size == 0 or data_dimensions == 1:
+                out = np.empty(size, dtype=np.double)
+            else:
+                out = np.empty((size, data_dimensions), dtype=np.double)
+        else:
+            check_output_array(out, precision_dtype(out), size * data_dimensions, "out", "read_data")
+
+        cdef const int[::1] cpp_ids = vertex_ids.ravel()
+        cdef double[::1] cpp_values
+        cdef float[::1] cpp_single_values
+        cdef CppParticipant.span[CppParticipant.const_int] ids_span = as_int_span(cpp_ids)
+        cdef CppParticipant.span[double] values_span
+
+        if out.dtype == np.single:
+            cpp_single_values = out.reshape(-1)
+            with self._lock:
+                with nogil:
+                    self._buffer.resize(cpp_single_values.shape[0])
+                    values_span = CppParticipant.span[double](self._buffer.data(), self._buffer.size())
+                    precice_start = monotonic_time()
+                    self.thisptr.readData (mesh_name, data_name, ids_span, relative_read_time, values_span)
+                    precice_time = monotonic_time() - precice_start
+                    narrow(self._buffer, cpp_single_values)
+        else:
+            cpp_values = out.reshape(-1)
+            values_span = as_mutable_double_span(cpp_values)
+            with self._lock:
+                with nogil:
+                    precice_start = monotonic_time()
+                    self.thisptr.readData (mesh_name, data_name, ids_span, relative_read_time, values_span)
+                    precice_time = monotonic_time() - precice_start
+
+        self._count("read_data", start, precice_time, cpp_ids.nbytes + out.nbytes)
+        if self._recorder is not None:
+            self._recorder.record({"call": "read_data", "mesh": mesh_name.decode(), "data": data_name.decode(), "dimensions": data_dimensions, "dt": relative_read_time}, {"ids": vertex_ids, "values": out})
+        return out
+
+    cdef _read_data_at_times(self, const string& mesh_name, const string& data_name, int data_dimensions, vertex_ids, relative_read_times, out):
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        vertex_ids = as_contiguous_array(vertex_ids, np.int32)
+
+        cdef const double[::1] cpp_times = as_contiguous_array(relative_read_times, np.double).ravel()
+        cdef Py_ssize_t n_times = cpp_times.shape[0]
+        cdef Py_ssize_t size = vertex_ids.size * data_dimensions
+
+        if data_dimensions == 1:
+            shape = (n_times, vertex_ids.size)
+        else:
+            shape = (n_times, vertex_ids.size, data_dimensions)
+
+        if out is None:
+            out = np.empty(shape, dtype=np.double)
+        else:
+            check_output_array(out, precision_dtype(out), n_times * size, "out", "read_data_at_times")
+
+        cdef const int[::1] cpp_ids = vertex_ids.ravel()
+        cdef double[::1] cpp_values
+        cdef float[::1] cpp_single_values
+        cdef CppParticipant.span[CppParticipant.const_int] ids_span = as_int_span(cpp_ids)
+        cdef Py_ssize_t t
+
+        if out.dtype == np.single:
+            cpp_single_values = out.reshape(-1)
+            with self._lock:
+                with nogil:
+                    self._buffer.resize(cpp_single_values.shape[0])
+                    precice_start = monotonic_time()
+                    for t in range(n_times):
+                        self.thisptr.readData (mesh_name, data_name, ids_span, cpp_times[t], CppParticipant.span[double](self._buffer.data() + t * size, size))
+                    precice_time = monotonic_time() - precice_start
+                    narrow(self._buffer, cpp_single_values)
+        else:
+            cpp_values = out.reshape(-1)
+            with self._lock:
+                with nogil:
+                    precice_start = monotonic_time()
+                    for t in range(n_times):
+                        self.thisptr.readData (mesh_name, data_name, ids_span, cpp_times[t], as_mutable_double_span(cpp_values[t * size:(t + 1) * size]))
+                    precice_time = monotonic_time() - precice_start
+
+        self._count("read_data_at_times", start, precice_time, cpp_ids.nbytes + out.nbytes)
+        if self._recorder is not None:
+            self._recorder.record({"call": "read_data_at_times", "mesh": mesh_name.decode(), "data": data_name.decode(), "dimensions": data_dimensions, "dt": np.ravel(relative_read_times).tolist()}, {"ids": vertex_ids, "values": out})
+        return out
+
+    cdef _write_gradient_data(self, const string& mesh_name, const string& data_name, int mesh_dimensions, int data_dimensions, vertex_ids, gradients, axis_order):
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        assert axis_order in (None, "component-first", "derivative-first"), "axis_order has to be \"component-first\" or \"derivative-first\", but is {}".format(repr(axis_order))
+        gradients = as_contiguous_array(gradients, np.double)
+        vertex_ids = as_contiguous_array(vertex_ids, np.int32)
+        cdef bint transpose = False
+
+        if gradients.ndim == 3 and len(gradients) > 0:
+            assert axis_order is not None, "Gradients given as [N x D x D] array require an axis_order in write_gradient_data"
+            size, rows, columns = gradients.shape
+            if axis_order == "component-first":
+                assert rows == data_dimensions and columns == mesh_dimensions, "Dimensions of gradient data in write_gradient_data do not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(
+                    (rows, columns), (data_dimensions, mesh_dimensions))
+                transpose = data_dimensions > 1
+            else:
+                assert rows == mesh_dimensions and columns == data_dimensions, "Dimensions of gradient data in write_gradient_data do not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(
+                    (rows, columns), (mesh_dimensions, data_dimensions))
+            gradients = gradients.reshape(size, rows * columns)
+
+        if len(gradients) > 0:
+            size, dimensions = gradients.shape
+            assert dimensions == mesh_dimensions * data_dimensions, "Dimensions of vector data in write_gradient_data does not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(dimensions, mesh_dimensions * data_dimensions)
+        if len(gradients) == 0:
+            size = 0
+
+        cdef const int[::1] cpp_vertex_ids = vertex_ids.ravel()
+        cdef const double[::1] cpp_gradients = gradients.ravel()
+
+        assert cpp_gradients.shape[0] == size * mesh_dimensions * data_dimensions, "Dimension of gradient data provided in write_gradient_data does not match problem definition. Check length of input data provided. Provided size: {}, expected size: {}".format(cpp_gradients.shape[0], size * mesh_dimensions * data_dimensions)
+        assert cpp_vertex_ids.shape[0] == size, "Vertex IDs are of incorrect length in write_gradient_data. Check length of vertex ids input. Provided size: {}, expected size: {}".format(cpp_vertex_ids.shape[0], size)
+
+        cdef CppParticipant.span[CppParticipant.const_int] ids_span = as_int_span(cpp_vertex_ids)
+        cdef CppParticipant.span[CppParticipant.const_double] gradients_span = as_double_span(cpp_gradients)
+
+        with self._lock:
+            with nogil:
+                if transpose:
+                    gradients_span = transpose_blocks(cpp_gradients, data_dimensions, mesh_dimensions, self._buffer)
+                precice_start = monotonic_time()
+                self.thisptr.writeGradientData (mesh_name, data_name, ids_span, gradients_span)
+                precice_time = monotonic_time() - precice_start
+
+        self._count("write_gradient_data", start, precice_time, cpp_vertex_ids.nbytes + cpp_gradients.nbytes)
+
+
+cdef class ProfilingSection:
+    """
+    Context manager for a profiling section, obtained via Participant.profile(). It can also be used as a decorator.
+    """
+
+    def __cinit__ (self, participant not None, event_name, bytes cpp_name=None):
+        if isinstance(participant, Participant):
+            self._participant = participant
+        elif not isinstance(participant, ReplayParticipant):
+            raise TypeError("ProfilingSection requires a Participant or ReplayParticipant, but was provided the following input type: {}".format(type(participant)))
+        self.participant = participant
+        self.name = event_name
+        self.cpp_name = convert(event_name) if cpp_name is None else cpp_name
+
+    def __repr__ (self):
+        return "ProfilingSection({!r})".format(self.name)
+
+    def __enter__ (self):
+        if self._participant is not None:
+            with self._participant._lock:
+                self._participant.thisptr.startProfilingSection(self.cpp_name)
+        return self
+
+    def __exit__ (self, exc_type, exc_value, traceback):
+        if self._participant is not None:
+            with self._participant._lock:
+                self._participant.thisptr.stopLastProfilingSection()
+        return False
+
+    def __call__ (self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+cdef class Mesh:
+    """
+    Handle to a mesh of a Participant, obtained via Participant.mesh(). The encoded name and the dimensions of the
+    mesh are resolved once on creation.
+    """
+
+    def __cinit__ (self, participant not None, mesh_name):
+        if isinstance(participant, Participant):
+            self._participant = participant
+        elif not isinstance(participant, ReplayParticipant):
+            raise TypeError("Mesh requires a Participant or ReplayParticipant, but was provided the following input type: {}".format(type(participant)))
+        self.participant = participant
+        self.name = mesh_name
+        self.cpp_name = convert(mesh_name)
+        self.dimensions = participant.get_mesh_dimensions(mesh_name)
+
+    def __repr__ (self):
+        return "Mesh({!r}, dimensions={})".format(self.name, self.dimensions)
+
+    def data (self, data_name, cache=False):
+        """
+        Returns a handle to the given data on this mesh.
+
+        Parameters
+        ----------
+        data_name : str
+            Name of the data.
+        cache : bool, optional
+            If True, values returned by Data.read() are kept until the participant advances, see Data.
+
+        Returns
+        -------
+        data : Data
+            Handle to the data.
+        """
+        return Data(self, data_name, cache)
+
+
+cdef class Data:
+    """
+    Handle to data on a mesh, obtained via Mesh.data(). The encoded names, the dimensions and whether gradient data
+    is required are resolved once on creation, such that read() and write() skip all repeated lookups.
+
+    If created with cache=True, read() keeps the values read for each combination of vertex IDs and relative read
+    time. Repeated reads within the same time window are then answered from this cache without calling preCICE.
+    The cache is cleared as soon as the participant is initialized or advanced or a mesh is reset.
+    """
+
+    def __cinit__ (self, Mesh mesh not None, data_name, cache=False):
+        self.mesh = mesh
+        self.name = data_name
+        self.cpp_name = convert(data_name)
+        self._cache = {} if cache else None
+        self.dimensions = mesh.participant.get_data_dimensions(mesh.name, data_name)
+        self.requires_gradient = mesh.participant.requires_gradient_data_for(mesh.name, data_name)
+
+    def __repr__ (self):
+        return "Data({!r}, mesh={!r}, dimensions={})".format(self.name, self.mesh.name, self.dimensions)
+
+    def write (self, vertex_ids, values):
+        """
+        Writes values of the given vertices, see Participant.write_data().
+
+        Parameters
+        ----------
+        vertex_ids : array_like
+            Indices of the vertices.
+        values : array_like
+            Values of data
+        """
+        check_array_like(vertex_ids, "vertex_ids", "Data.write")
+        check_array_like(values, "values", "Data.write")
+
+        if self.mesh._participant is None:
+            self.mesh.participant.write_data(self.mesh.cpp_name.decode(), self.cpp_name.decode(), vertex_ids, values)
+            return
+        self.mesh._participant._write_data(self.mesh.cpp_name, self.cpp_name, self.dimensions, vertex_ids, values)
+
+    def read (self, vertex_ids, double relative_read_time, out=None):
+        """
+        Reads values of the given vertices, see Participant.read_data().
+
+        Parameters
+        ----------
+        vertex_ids : array_like
+            Indices of the vertices.
+        relative_read_time : double
+            Point in time where data is read relative to the beginning of the current time step
+        out : numpy.ndarray, optional
+            Preallocated output array, see Participant.read_data().
+
+        Returns
+        -------
+        values : numpy.ndarray
+            Contains the read data. If out is given, out itself is returned.
+        """
+        check_array_like(vertex_ids, "vertex_ids", "Data.read")
+
+        cdef Participant participant = self.mesh._participant
+
+        if participant is None:
+            # reads are served from the trace, which recorded only the reads missing the cache
+            return self.mesh.participant.read_data(self.mesh.cpp_name.decode(), self.cpp_name.decode(), vertex_ids, relative_read_time, out)
+        if self._cache is None:
+            return participant._read_data(self.mesh.cpp_name, self.cpp_name, self.dimensions, vertex_ids, relative_read_time, out)
+
+        if self._cache_window != participant._window:
+            self._cache.clear()
+            self._cache_window = participant._window
+
+        vertex_ids = as_contiguous_array(vertex_ids, np.int32)
+        key = (relative_read_time, vertex_ids.tobytes())
+        values = self._cache.get(key)
+        if values is None:
+            values = participant._read_data(self.mesh.cpp_name, self.cpp_name, self.dimensions, vertex_ids, relative_read_time, None)
+            self._cache[key] = values
+
+        if out is None:
+            return values.copy()
+        check_output_array(out, precision_dtype(out), values.size, "out", "Data.read")
+        np.copyto(out.reshape(-1), values.reshape(-1))
+        return out
+
+    def read_at_times (self, vertex_ids, relative_read_times, out=None):
+        """
+        Reads values of the given vertices at several points in time, see Participant.read_data_at_times().
+
+        Parameters
+        ----------
+        vertex_ids : array_like
+            Indices of the vertices.
+        relative_read_times : array_like
+            Points in time where data is read relative to the beginning of the current time step.
+        out : numpy.ndarray, optional
+            Preallocated output array, see Participant.read_data_at_times().
+
+        Returns
+        -------
+        values : numpy.ndarray
+            Contains the read data, values[i] holds the data at relative_read_times[i].
+        """
+        check_array_like(vertex_ids, "vertex_ids", "Data.read_at_times")
+        check_array_like(relative_read_times, "relative_read_times", "Data.read_at_times")
+
+        if self.mesh._participant is None:
+            return self.mesh.participant.read_data_at_times(self.mesh.cpp_name.decode(), self.cpp_name.decode(), vertex_ids, relative_read_times, out)
+        return self.mesh._participant._read_data_at_times(self.mesh.cpp_name, self.cpp_name, self.dimensions, vertex_ids, relative_read_times, out)
+
+    def write_gradient (self, vertex_ids, gradients, axis_order=None):
+        """
+        Writes gradient values of the given vertices, see Participant.write_gradient_data().
+
+        Parameters
+        ----------
+        vertex_ids : array_like
+            Indices of the vertices.
+        gradients : array_like
+            Gradient values differentiated in the spatial direction
+        axis_order : str, optional
+            Order of the axes of gradients given as [N x D x D] array, see Participant.write_gradient_data().
+        """
+        check_array_like(vertex_ids, "vertex_ids", "Data.write_gradient")
+        check_array_like(gradients, "gradients", "Data.write_gradient")
+
+        if self.mesh._participant is None:
+            self.mesh.participant.write_gradient_data(self.mesh.cpp_name.decode(), self.cpp_name.decode(), vertex_ids, gradients, axis_order)
+            return
+        self.mesh._participant._write_gradient_data(self.mesh.cpp_name, self.cpp_name, self.mesh.dimensions, self.dimensions, vertex_ids, gradients, axis_order)
+
+cdef class Checkpoint:
+    """
+    Iteration checkpoint of solver state held in numpy arrays, for implicit coupling. Arrays are registered once and
+    get a preallocated shadow buffer, such that saving and restoring only copies in place and does not allocate.
+
+    Parameters
+    ----------
+    participant : Participant or ReplayParticipant
+        Participant which is asked whether a checkpoint has to be written or read, see sync().
+    skip_unchanged : bool, optional
+        If True, arrays whose content equals the shadow buffer are not copied on save() and restore().
+
+    Examples
+    --------
+    >>> u = np.zeros((n, 3))
+    >>> checkpoint = precice.Checkpoint(participant)
+    >>> checkpoint.register(u)
+    >>> while participant.is_coupling_ongoing():
+    ...     checkpoint.sync()
+    ...     solve(u, dt)
+    ...     participant.advance(dt)
+    """
+
+    def __cinit__ (self, participant not None, skip_unchanged=False):
+        if not isinstance(participant, (Participant, ReplayParticipant)):
+            raise TypeError("Checkpoint requires a Participant or ReplayParticipant, but was provided the following input type: {}".format(type(participant)))
+        self.participant = participant
+        self.skip_unchanged = skip_unchanged
+        self.bytes_copied = 0
+        self._arrays = []
+        self._buffers = []
+        self._saved = False
+
+    def __len__ (self):
+        return len(self._arrays)
+
+    def register (self, array):
+        """
+        Registers an array whose content is part of the checkpoint. The array is saved and restored in place, hence
+        it has to stay the same object for the whole simulation.
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+            Writeable, C-contiguous array holding solver state.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            The registered array.
+
+        Examples
+        --------
+        >>> u = checkpoint.register(np.zeros((n, 3)))
+        """
+        dtype = array.dtype if isinstance(array, np.ndarray) else np.double
+        check_output_array(array, dtype, np.size(array), "array", "Checkpoint.register")
+
+        self._arrays.append(array)
+        self._buffers.append(np.empty_like(array))
+        self._saved = False
+        return array
+
+    def save (self):
+        """
+        Copies the registered arrays into their shadow buffers.
+
+        Returns
+        -------
+        bytes_copied : int
+            Number of bytes copied by this call.
+        """
+        copied = self._copy(self._arrays, self._buffers, not self._saved)
+        self._saved = True
+        return copied
+
+    def restore (self):
+        """
+        Copies the shadow buffers back into the registered arrays.
+
+        Returns
+        -------
+        bytes_copied : int
+            Number of bytes copied by this call.
+        """
+        assert self._saved, "Checkpoint.restore requires a checkpoint to be saved first."
+        return self._copy(self._buffers, self._arrays, False)
+
+    def sync (self):
+        """
+        Saves or restores the checkpoint if preCICE requires it, see Participant.requires_writing_checkpoint() and
+        Participant.requires_reading_checkpoint(). Call it once per iteration, before solving the time step.
+
+        Returns
+        -------
+        restored : bool
+            True if the checkpoint was restored, i.e. the time step is repeated.
+        """
+        if self.participant.requires_reading_checkpoint():
+            self.restore()
+            return True
+        if self.participant.requires_writing_checkpoint():
+            self.save()
+        return False
+
+    cdef Py_ssize_t _copy(self, list sources, list destinations, bint force) except -1:
+        cdef Py_ssize_t copied = 0
+        cdef numpy.ndarray source, destination
+
+        for source, destination in zip(sources, destinations):
+            if self.skip_unchanged and not force and memcmp(numpy.PyArray_DATA(source), numpy.PyArray_DATA(destination), source.nbytes) == 0:
+                continue
+            np.copyto(destination, source)
+            copied += source.nbytes
+
+        self.bytes_copied += copied
+        return copied
+
+
+cdef class ExchangePlan:
+    """
+    Declares once which data is read and written on which vertices and into which buffers. execute_reads() and
+    execute_writes() then exchange all declared data in one call each, without per-field validation, name
+    conversion or dimension lookups.
+
+    Buffers are used in place: execute_reads() fills the read buffers and execute_writes() passes the current content
+    of the write buffers to preCICE. The plan keeps references to all buffers, which must not be replaced by other
+    arrays afterwards. Add a new plan if meshes are reset.
+
+    Parameters
+    ----------
+    participant : Participant or ReplayParticipant
+        Participant through which the data is exchanged. A ReplayParticipant fills the read buffers from its trace
+        and discards writes.
+
+    Examples
+    --------
+    >>> plan = precice.ExchangePlan(participant)
+    >>> for mesh_name, vertex_ids in interface_meshes.items():
+    ...     plan.add_read(mesh_name, "Displacement", vertex_ids, displacements[mesh_name])
+    ...     plan.add_write(mesh_name, "Force", vertex_ids, forces[mesh_name])
+    >>> while participant.is_coupling_ongoing():
+    ...     plan.execute_reads(dt)
+    ...     solve(dt)
+    ...     plan.execute_writes()
+    ...     participant.advance(dt)
+    """
+
+    def __cinit__ (self, participant not None):
+        if isinstance(participant, Participant):
+            self._participant = participant
+        elif not isinstance(participant, ReplayParticipant):
+            raise TypeError("ExchangePlan requires a Participant or ReplayParticipant, but was provided the following input type: {}".format(type(participant)))
+        self.participant = participant
+        self._arrays = []
+        self._reads = []
+
+    def __len__ (self):
+        return self._read_ids.size() + self._write_ids.size()
+
+    def add_read (self, mesh_name, data_name, vertex_ids, out):
+        """
+        Declares that data of the given vertices is read into out by execute_reads().
+
+        Parameters
+        ----------
+        mesh_name : str
+            Name of the mesh to read from.
+        data_name : str
+            Name of the data to read from.
+        vertex_ids : array_like
+            Indices of the vertices. A copy is kept by the plan.
+        out : numpy.ndarray
+            Writeable, C-contiguous array of dtype numpy.float64 with N * D entries, e.g. of shape [N x D].
+        """
+        check_array_like(vertex_ids, "vertex_ids", "ExchangePlan.add_read")
+        vertex_ids = np.array(vertex_ids, dtype=np.int32).ravel()
+        dimensions = self.participant.get_data_dimensions(mesh_name, data_name)
+        check_output_array(out, np.double, vertex_ids.size * dimensions, "out", "ExchangePlan.add_read")
+
+        cdef const int[::1] cpp_ids = vertex_ids
+        cdef double[::1] cpp_values = out.reshape(-1)
+
+        self._arrays += [vertex_ids, out]
+        self._reads.append((convert(mesh_name).decode(), convert(data_name).decode(), dimensions, vertex_ids, out))
+        self._read_mesh_names.push_back(convert(mesh_name))
+        self._read_data_names.push_back(convert(data_name))
+        self._read_ids.push_back(as_int_span(cpp_ids))
+        self._read_values.push_back(as_mutable_double_span(cpp_values))
+
+    def add_write (self, mesh_name, data_name, vertex_ids, values):
+        """
+        Declares that data of the given vertices is written from values by execute_writes().
+
+        Parameters
+        ----------
+        mesh_name : str
+            Name of the mesh to write to.
+        data_name : str
+            Name of the data to write to.
+        vertex_ids : array_like
+            Indices of the vertices. A copy is kept by the plan.
+        values : numpy.ndarray
+            C-contiguous array of dtype numpy.float64 with N * D entries, e.g. of shape [N x D]. The solver updates
+            it in place.
+        """
+        check_array_like(vertex_ids, "vertex_ids", "ExchangePlan.add_write")
+        vertex_ids = np.array(vertex_ids, dtype=np.int32).ravel()
+        check_output_array(values, np.double, vertex_ids.size * self.participant.get_data_dimensions(mesh_name, data_name), "values", "ExchangePlan.add_write")
+
+        cdef const int[::1] cpp_ids = vertex_ids
+        cdef const double[::1] cpp_values = values.reshape(-1)
+
+        self._arrays += [vertex_ids, values]
+        self._write_mesh_names.push_back(convert(mesh_name))
+        self._write_data_names.push_back(convert(data_name))
+        self._write_ids.push_back(as_int_span(cpp_ids))
+        self._write_values.push_back(as_double_span(cpp_values))
+
+    def execute_reads (self, double relative_read_time):
+        """
+        Reads all declared data into the read buffers.
+
+        Parameters
+        ----------
+        relative_read_time : double
+            Point in time where data is read relative to the beginning of the current time step
+        """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        cdef size_t i
+        cdef Py_ssize_t nbytes = 0
+        cdef Participant participant = self._participant
+
+        if participant is None:
+            (<ReplayParticipant> self.participant)._read_plan(self)
+            return
+
+        with participant._lock:
+            with nogil:
+                precice_start = monotonic_time()
+                for i in range(self._read_ids.size()):
+                    participant.thisptr.readData (self._read_mesh_names[i], self._read_data_names[i], self._read_ids[i], relative_read_time, self._read_values[i])
+                    nbytes += self._read_ids[i].size() * sizeof(int) + self._read_values[i].size() * sizeof(double)
+                precice_time = monotonic_time() - precice_start
+
+        participant._count("ExchangePlan.execute_reads", start, precice_time, nbytes)
+        if participant._recorder is not None:
+            participant._record_plan_reads(self, relative_read_time)
+
+    def execute_writes (self):
+        """
+        Writes the current content of all write buffers.
+        """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        cdef size_t i
+        cdef Py_ssize_t nbytes = 0
+        cdef Participant participant = self._participant
+
+        # a ReplayParticipant discards writes, whose sizes are checked by add_write()
+        if participant is None:
+            return
+
+        with participant._lock:
+            with nogil:
+                precice_start = monotonic_time()
+                for i in range(self._write_ids.size()):
+                    participant.thisptr.writeData (self._write_mesh_names[i], self._write_data_names[i], self._write_ids[i], self._write_values[i])
+                    nbytes += self._write_ids[i].size() * sizeof(int) + self._write_values[i].size() * sizeof(double)
+                precice_time = monotonic_time() - precice_start
+
+        participant._count("ExchangePlan.execute_writes", start, precice_time, nbytes)
+
+
+cdef class UncheckedParticipant:
+    """
+    Low-level API of a participant for hot loops of many small calls, obtained via Participant.unchecked.
+    Arguments are typed memoryviews, which are handed to preCICE without any conversion, copies or checks in Python:
+    names are bytes and arrays are flat, C-contiguous buffers of dtype numpy.float64 (double[::1]) or numpy.int32
+    (int[::1]), e.g. numpy.ndarray.reshape(-1) of the arrays used for the validated API. preCICE still checks the
+    sizes of the buffers and raises a RuntimeError on mismatches. Calls are not recorded by
+    Participant.enable_counters().
+
+    Parameters
+    ----------
+    participant : Participant
+        Participant to call.
+
+    Examples
+    --------
+    >>> raw = participant.unchecked
+    >>> ids = np.empty(n, dtype=np.int32)
+    >>> raw.set_mesh_vertices(b"Fluid-Mesh", positions.reshape(-1), ids)
+    >>> raw.write_data(b"Fluid-Mesh", b"Forces", ids, forces.reshape(-1))
+    >>> raw.read_data(b"Fluid-Mesh", b"Displacements", ids, dt, displacements.reshape(-1))
+    """
+
+    def __cinit__ (self, Participant participant not None):
+        self.participant = participant
+
+    cpdef set_mesh_vertices (self, string mesh_name, const double[::1] positions, int[::1] ids):
+        """
+        Creates vertices at the N given positions [N * D] and stores their IDs in ids [N].
+        See Participant.set_mesh_vertices().
+        """
+        with self.participant._lock:
+            with nogil:
+                self.participant.thisptr.setMeshVertices (mesh_name, as_double_span(positions), as_mutable_int_span(ids))
+
+    cpdef write_data (self, string mesh_name, string data_name, const int[::1] vertex_ids, const double[::1] values):
+        """
+        Writes values [N * D] of the N given vertices. See Participant.write_data().
+        """
+        with self.participant._lock:
+            with nogil:
+                self.participant.thisptr.writeData (mesh_name, data_name, as_int_span(vertex_ids), as_double_span(values))
+
+    cpdef read_data (self, string mesh_name, string data_name, const int[::1] vertex_ids, double relative_read_time, double[::1] values):
+        """
+        Reads values [N * D] of the N given vertices into values. See Participant.read_data().
+        """
+        with self.participant._lock:
+            with nogil:
+                self.participant.thisptr.readData (mesh_name, data_name, as_int_span(vertex_ids), relative_read_time, as_mutable_double_span(values))
+
+    cpdef write_and_map_data (self, string mesh_name, string data_name, const double[::1] coordinates, const double[::1] values):
+        """
+        Writes values [N * D] at the N given coordinates [N * D]. See Participant.write_and_map_data().
+        """
+        with self.participant._lock:
+            with nogil:
+                self.participant.thisptr.writeAndMapData (mesh_name, data_name, as_double_span(coordinates), as_double_span(values))
+
+    cpdef map_and_read_data (self, string mesh_name, string data_name, const double[::1] coordinates, double relative_read_time, double[::1] values):
+        """
+        Reads values [N * D] at the N given coordinates [N * D] into values. See Participant.map_and_read_data().
+        """
+        with self.participant._lock:
+            with nogil:
+                self.participant.thisptr.mapAndReadData (mesh_name, data_name, as_double_span(coordinates), relative_read_time, as_mutable_double_span(values))
+
+    cpdef write_gradient_data (self, string mesh_name, string data_name, const int[::1] vertex_ids, const double[::1] gradients):
+        """
+        Writes gradients [N * D * D_mesh] of the N given vertices. See Participant.write_gradient_data().
+        """
+        with self.participant._lock:
+            with nogil:
+                self.participant.thisptr.writeGradientData (mesh_name, data_name, as_int_span(vertex_ids), as_double_span(gradients))
+
+
+cdef class ParticipantCApi:
+    """
+    C function-pointer table of a participant, obtained via Participant.c_api, through which compiled code, e.g.
+    Cython kernels or Numba functions in nopython mode, calls the core data access and steering methods without
+    going through Python. The table is exported as PyCapsule named "precice.ParticipantCApiTable" and, for ctypes,
+    cffi and Numba, as addresses of the functions.
+
+    Every function takes the address "participant" as first argument. Names are null-terminated UTF-8 strings and
+    arrays are passed as pointer and number of entries, e.g.
+
+        int write_data(void* participant, const char* mesh_name, const char* data_name, const int* ids,
+                       Py_ssize_t size, const double* values, Py_ssize_t values_size)
+        int read_data(void* participant, const char* mesh_name, const char* data_name, const int* ids,
+                      Py_ssize_t size, double relative_read_time, double* values, Py_ssize_t values_size)
+
+    see ParticipantCApiTable in cyprecice.pxd for all signatures. The queries return 0 or 1 and the other functions
+    returning int return 0. If preCICE raised an error, all functions returning int return -1 and
+    get_max_time_step_size() returns NaN, while last_error() returns the message of the error. The functions do not take the
+    lock of the participant, hence they must not be called concurrently with other methods of the participant,
+    and they are not counted by Participant.enable_counters(). The table is valid as long as this object is alive.
+
+    Parameters
+    ----------
+    participant : Participant
+        Participant to call.
+
+    Examples
+    --------
+    Call write_data() from Numba in nopython mode:
+
+    >>> c_api = participant.c_api  # keeps the table alive
+    >>> functions = c_api.ctypes_functions()
+    >>> write_data, handle = functions["write_data"], functions["participant"]
+    >>> @numba.njit
+    ... def write(ids, values):
+    ...     return write_data(handle, mesh_name, data_name, ids.ctypes, ids.size, values.ctypes, values.size)
+    """
+
+    def __cinit__ (self, Participant participant not None):
+        self.participant = participant
+        self._handle.participant = participant.thisptr
+        self._handle.window = &participant._window
+        fill_c_api_table(&self._table, &self._handle)
+
+    @property
+    def capsule(self):
+        """
+        PyCapsule named "precice.ParticipantCApiTable" of a pointer to the table.
+        """
+        return PyCapsule_New(&self._table, "precice.ParticipantCApiTable", NULL)
+
+    @property
+    def addresses(self):
+        """
+        Addresses of the participant handle ("participant"), the table ("table") and of all functions by name.
+        """
+        return {
+            "table": <size_t> &self._table,
+            "participant": <size_t> self._table.participant,
+            "initialize": <size_t> self._table.initialize,
+            "advance": <size_t> self._table.advance,
+            "finalize": <size_t> self._table.finalize,
+            "is_coupling_ongoing": <size_t> self._table.is_coupling_ongoing,
+            "is_time_window_complete": <size_t> self._table.is_time_window_complete,
+            "requires_writing_checkpoint": <size_t> self._table.requires_writing_checkpoint,
+            "requires_reading_checkpoint": <size_t> self._table.requires_reading_checkpoint,
+            "get_max_time_step_size": <size_t> self._table.get_max_time_step_size,
+            "write_data": <size_t> self._table.write_data,
+            "read_data": <size_t> self._table.read_data,
+            "write_and_map_data": <size_t> self._table.write_and_map_data,
+            "map_and_read_data": <size_t> self._table.map_and_read_data,
+            "last_error": <size_t> self._table.last_error,
+        }
+
+    def ctypes_functions(self):
+        """
+        Returns the functions of the table as ctypes function pointers by name, which can be called from Python and
+        from Numba in nopython mode, together with the address of the participant handle ("participant").
+        """
+        import ctypes
+
+        handle, name, count = ctypes.c_void_p, ctypes.c_char_p, ctypes.c_ssize_t
+        ids, values = ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_double)
+        prototypes = {
+            "initialize": ctypes.CFUNCTYPE(ctypes.c_int, handle),
+            "advance": ctypes.CFUNCTYPE(ctypes.c_int, handle, ctypes.c_double),
+            "finalize": ctypes.CFUNCTYPE(ctypes.c_int, handle),
+            "is_coupling_ongoing": ctypes.CFUNCTYPE(ctypes.c_int, handle),
+            "is_time_window_complete": ctypes.CFUNCTYPE(ctypes.c_int, handle),
+            "requires_writing_checkpoint": ctypes.CFUNCTYPE(ctypes.c_int, handle),
+            "requires_reading_checkpoint": ctypes.CFUNCTYPE(ctypes.c_int, handle),
+            "get_max_time_step_size": ctypes.CFUNCTYPE(ctypes.c_double, handle),
+            "write_data": ctypes.CFUNCTYPE(ctypes.c_int, handle, name, name, ids, count, values, count),
+            "read_data": ctypes.CFUNCTYPE(ctypes.c_int, handle, name, name, ids, count, ctypes.c_double, values, count),
+            "write_and_map_data": ctypes.CFUNCTYPE(ctypes.c_int, handle, name, name, values, count, values, count),
+            "map_and_read_data": ctypes.CFUNCTYPE(ctypes.c_int, handle, name, name, values, count, ctypes.c_double, values, count),
+            "last_error": ctypes.CFUNCTYPE(ctypes.c_char_p),
+        }
+        addresses = self.addresses
+        functions = {function_name: prototype(addresses[function_name]) for function_name, prototype in prototypes.items()}
+        functions["participant"] = addresses["participant"]
+        return functions
+
+
+cdef class VertexSet:
+    """
+    Set of vertices of a mesh, e.g. the coupling boundary, which are a subset of the nodes of the solver.
+    write_from() and read_into() gather the values of the vertices from and scatter them to a field over all nodes
+    of the solver, without intermediate arrays and without converting the vertex IDs on every call.
+
+    Parameters
+    ----------
+    participant : Participant
+        Participant through which the data is exchanged.
+    mesh_name : str
+        Name of the mesh the vertices belong to.
+    vertex_ids : array_like
+        preCICE IDs of the N vertices, as returned by Participant.set_mesh_vertices(). A copy is kept.
+    indices : array_like, optional
+        Indices of the N vertices in the fields of the solver. Without indices, the fields contain only the vertices
+        in the order of vertex_ids.
+
+    Examples
+    --------
+    >>> boundary = precice.VertexSet(participant, "Fluid-Mesh", vertex_ids, boundary_nodes)
+    >>> while participant.is_coupling_ongoing():
+    ...     boundary.read_into("Displacement", dt, displacement)
+    ...     solve(dt)
+    ...     boundary.write_from("Force", force)
+    ...     participant.advance(dt)
+    """
+
+    def __cinit__ (self, Participant participant not None, mesh_name, vertex_ids, indices=None):
+        check_array_like(vertex_ids, "vertex_ids", "VertexSet")
+
+        self.participant = participant
+        self.mesh_name = mesh_name
+        self._cpp_mesh_name = convert(mesh_name)
+        self._data_dimensions = {}
+        self.vertex_ids = np.array(vertex_ids, dtype=np.int32).ravel()
+        self.vertex_ids.flags.writeable = False
+        self._ids = self.vertex_ids
+        self._rows = self.vertex_ids.size
+
+        if indices is None:
+            self.indices = None
+            self._indices = None
+        else:
+            check_array_like(indices, "indices", "VertexSet")
+            self.indices = np.array(indices, dtype=np.intp).ravel()
+            self.indices.flags.writeable = False
+            assert self.indices.size == self.vertex_ids.size, "Indices are of incorrect length in VertexSet. Provided size: {}, expected size: {}".format(self.indices.size, self.vertex_ids.size)
+            if self.indices.size > 0:
+                assert self.indices.min() >= 0, "VertexSet requires non-negative indices"
+                self._rows = self.indices.max() + 1
+            else:
+                self._rows = 0
+            self._indices = self.indices
+
+    def __len__ (self):
+        return self._ids.shape[0]
+
+    def write_from (self, data_name, field):
+        """
+        Writes the values of the vertices in field to data of the mesh.
+
+        Parameters
+        ----------
+        data_name : str
+            Name of the data to write to.
+        field : numpy.ndarray
+            C-contiguous array of dtype numpy.float64 with the values of all nodes of the solver, of shape [M] for
+            scalar and [M x D] for vector data.
+        """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        cdef int dimensions = self._dimensions(data_name)
+        cdef const double[::1] cpp_field = self._check_field(field, dimensions, "VertexSet.write_from")
+        cdef CppParticipant.span[CppParticipant.const_double] values_span
+        cdef string cpp_data_name = convert(data_name)
+
+        with self.participant._lock:
+            with nogil:
+                values_span = self._gather(cpp_field, dimensions)
+                precice_start = monotonic_time()
+                self.participant.thisptr.writeData (self._cpp_mesh_name, cpp_data_name, as_int_span(self._ids), values_span)
+                precice_time = monotonic_time() - precice_start
+
+        self.participant._count("VertexSet.write_from", start, precice_time, self._ids.nbytes + values_span.size() * sizeof(double))
+
+    def read_into (self, data_name, double relative_read_time, field):
+        """
+        Reads data of the mesh into the values of the vertices in field. Values of other nodes are not changed.
+
+        Parameters
+        ----------
+        data_name : str
+            Name of the data to read from.
+        relative_read_time : double
+            Point in time where data is read relative to the beginning of the current time step
+        field : numpy.ndarray
+            Writeable, C-contiguous array of dtype numpy.float64 with the values of all nodes of the solver, of shape
+            [M] for scalar and [M x D] for vector data.
+
+        Returns
+        -------
+        field : numpy.ndarray
+            field itself.
+        """
+        cdef double start = monotonic_time(), precice_start, precice_time = 0
+        cdef int dimensions = self._dimensions(data_name)
+        cdef double[::1] cpp_field = self._check_field(field, dimensions, "VertexSet.read_into")
+        cdef CppParticipant.span[double] values_span
+        cdef string cpp_data_name = convert(data_name)
+        cdef vector[double]* buffer = &self.participant._buffer
+
+        with self.participant._lock:
+            with nogil:
+                if self._indices is None:
+                    values_span = as_mutable_double_span(cpp_field[:self._ids.shape[0] * dimensions])
+                else:
+                    buffer.resize(self._ids.shape[0] * dimensions)
+                    values_span = CppParticipant.span[double](buffer.data(), buffer.size())
+                precice_start = monotonic_time()
+                self.participant.thisptr.readData (self._cpp_mesh_name, cpp_data_name, as_int_span(self._ids), relative_read_time, values_span)
+                precice_time = monotonic_time() - precice_start
+                if self._indices is not None:
+                    self._scatter(cpp_field, dimensions)
+
+        self.participant._count("VertexSet.read_into", start, precice_time, self._ids.nbytes + values_span.size() * sizeof(double))
+        return field
+
+    cdef int _dimensions(self, data_name) except -1:
+        dimensions = self._data_dimensions.get(data_name)
+        if dimensions is None:
+            dimensions = self._data_dimensions[data_name] = self.participant.get_data_dimensions(self.mesh_name, data_name)
+        return dimensions
+
+    cdef _check_field(self, field, int dimensions, function_name):
+        """
+        Checks that field is a C-contiguous array of doubles with values of all vertices and returns it flattened.
+        """
+        if not isinstance(field, np.ndarray) or field.dtype != np.double or not field.flags["C_CONTIGUOUS"]:
+            raise TypeError("{} requires a C-contiguous numpy.ndarray of dtype float64 for field, but was provided the following input: {}".format(
+                function_name, repr(field)))
+        assert field.size % dimensions == 0 and field.size // dimensions >= self._rows, "Provided field in {} is of incorrect size. Provided size: {}, expected at least {} rows of {} values".format(
+            function_name, field.size, self._rows, dimensions)
+        return field.reshape(-1)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef CppParticipant.span[CppParticipant.const_double] _gather(self, const double[::1] field, int dimensions) noexcept nogil:
+        """
+        Returns the values of the vertices in field, copied to the buffer of the participant if indices are given.
+        """
+        cdef vector[double]* buffer = &self.participant._buffer
+        cdef Py_ssize_t i, row
+        cdef int d
+        if self._indices is None:
+            return as_double_span(field[:self._ids.shape[0] * dimensions])
+        buffer.resize(self._ids.shape[0] * dimensions)
+        for i in range(self._ids.shape[0]):
+            row = self._indices[i] * dimensions
+            for d in range(dimensions):
+                buffer[0][i * dimensions + d] = field[row + d]
+        return CppParticipant.span[CppParticipant.const_double](buffer.data(), buffer.size())
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _scatter(self, double[::1] field, int dimensions) noexcept nogil:
+        """
+        Copies the values of the vertices from the buffer of the participant to field.
+        """
+        cdef vector[double]* buffer = &self.participant._buffer
+        cdef Py_ssize_t i, row
+        cdef int d
+        for i in range(self._ids.shape[0]):
+            row = self._indices[i] * dimensions
+            for d in range(dimensions):
+                field[row + d] = buffer[0][i * dimensions + d]
+
+
+cdef class JustInTimeWriter:
+    """
+    Collects coordinates and values of many small writes for just-in-time mapping, e.g. per particle, in growable
+    buffers and writes all of them with one call of Participant.write_and_map_data() in flush(). Call flush() before
+    Participant.advance().
+
+    Parameters
+    ----------
+    participant : Participant
+        Participant to write to.
+    mesh_name : str
+        Name of the mesh to write to.
+    data_name : str
+        Name of the data to write to.
+    sort : bool, optional
+        If True, points are passed to preCICE in Morton order, which keeps points close in space close in memory
+        for the mapping.
+
+    Examples
+    --------
+    >>> writer = precice.JustInTimeWriter(participant, "Particle-Mesh", "Forces")
+    >>> for particle in particles:
+    ...     writer.add(particle.position, particle.force)
+    >>> writer.flush()
+    >>> participant.advance(dt)
+    """
+
+    def __cinit__ (self, Participant participant not None, mesh_name, data_name, sort=False):
+        self.participant = participant
+        self.mesh_name = mesh_name
+        self.data_name = data_name
+        self.sort = sort
+        self._coordinates = np.empty((0, participant.get_mesh_dimensions(mesh_name)), dtype=np.double)
+        self._values = np.empty((0, participant.get_data_dimensions(mesh_name, data_name)), dtype=np.double)
+        self._size = 0
+
+    def __len__ (self):
+        return self._size
+
+    def add (self, coordinates, values):
+        """
+        Adds points and their values to the buffers.
+
+        Parameters
+        ----------
+        coordinates : array_like
+            Coordinates of one point or of N points [N x D] where D = dimensions of geometry.
+        values : array_like or float
+            Values of the points, in the same format as for Participant.write_and_map_data(). The value of a
+            single point of scalar data may also be given as float.
+        """
+        check_array_like(coordinates, "coordinates", "JustInTimeWriter.add")
+
+        coordinates = np.asarray(coordinates, dtype=np.double).reshape(-1, self._coordinates.shape[1])
+        values = np.asarray(values, dtype=np.double).reshape(-1, self._values.shape[1])
+        assert len(coordinates) == len(values), "Number of coordinates and values in JustInTimeWriter.add does not match. Provided coordinates: {}, provided values: {}".format(len(coordinates), len(values))
+
+        cdef Py_ssize_t size = self._size + len(coordinates)
+        self._coordinates = grow_rows(self._coordinates, self._size, size)
+        self._values = grow_rows(self._values, self._size, size)
+        self._coordinates[self._size:size] = coordinates
+        self._values[self._size:size] = values
+        self._size = size
+
+    def flush (self):
+        """
+        Writes all points added since the last flush and empties the buffers. The capacity of the buffers is kept.
+        If writing raises an exception, the points stay buffered.
+        """
+        if self._size == 0:
+            return
+
+        coordinates = self._coordinates[:self._size]
+        values = self._values[:self._size]
+        if self.sort:
+            order = morton_order(coordinates)
+            coordinates = coordinates[order]
+            values = values[order]
+
+        # the points are kept if writing fails
+        self.participant.write_and_map_data(self.mesh_name, self.data_name, coordinates, values)
+        self._size = 0
+
+
+cdef class JustInTimeReader:
+    """
+    Collects the coordinates of many small reads for just-in-time mapping, e.g. per particle, and reads the values
+    of all of them with one call of Participant.map_and_read_data() in read().
+
+    Parameters
+    ----------
+    participant : Participant
+        Participant to read from.
+    mesh_name : str
+        Name of the mesh to read from.
+    data_name : str
+        Name of the data to read from.
+    sort : bool, optional
+        If True, points are passed to preCICE in Morton order, which keeps points close in space close in memory
+        for the mapping. The values returned by read() are in the order the points were added nevertheless.
+
+    Examples
+    --------
+    >>> reader = precice.JustInTimeReader(participant, "Particle-Mesh", "Velocity")
+    >>> rows = [reader.add(particle.position) for particle in particles]
+    >>> velocities = reader.read(dt)
+    >>> for particle, row in zip(particles, rows):
+    ...     particle.velocity = velocities[row]
+    """
+
+    def __cinit__ (self, Participant participant not None, mesh_name, data_name, sort=False):
+        self.participant = participant
+        self.mesh_name = mesh_name
+        self.data_name = data_name
+        self.sort = sort
+        self._coordinates = np.empty((0, participant.get_mesh_dimensions(mesh_name)), dtype=np.double)
+        self._size = 0
+
+    def __len__ (self):
+        return self._size
+
+    def add (self, coordinates):
+        """
+        Adds points to be read.
+
+        Parameters
+        ----------
+        coordinates : array_like
+            Coordinates of one point or of N points [N x D] where D = dimensions of geometry.
+
+        Returns
+        -------
+        rows : slice
+            Rows of the values returned by read() which belong to the added points.
+        """
+        check_array_like(coordinates, "coordinates", "JustInTimeReader.add")
+
+        coordinates = np.asarray(coordinates, dtype=np.double).reshape(-1, self._coordinates.shape[1])
+
+        cdef Py_ssize_t size = self._size + len(coordinates)
+        self._coordinates = grow_rows(self._coordinates, self._size, size)
+        self._coordinates[self._size:size] = coordinates
+        rows = slice(self._size, size)
+        self._size = size
+        self._order = None
+        return rows
+
+    def clear (self):
+        """
+        Removes all points. The capacity of the buffer is kept.
+        """
+        self._size = 0
+        self._order = None
+
+    def read (self, double relative_read_time, out=None):
+        """
+        Reads the values of all points added since the last call of clear().
+
+        Parameters
+        ----------
+        relative_read_time : double
+            Point in time where data is read relative to the beginning of the current time step
+        out : numpy.ndarray, optional
+            Preallocated output array, see Participant.map_and_read_data().
+
+        Returns
+        -------
+        values : numpy.ndarray
+            Values of the points in the order they were added. If out is given, out itself is returned.
+        """
+        coordinates = self._coordinates[:self._size]
+        if not self.sort or self._size == 0:
+            return self.participant.map_and_read_data(self.mesh_name, self.data_name, coordinates, relative_read_time, out)
+
+        # the order is kept until points are added or removed, such that repeated reads do not sort again
+        if self._order is None:
+            self._order = morton_order(coordinates)
+            self._sorted_coordinates = coordinates[self._order]
+        values = self.participant.map_and_read_data(self.mesh_name, self.data_name, self._sorted_coordinates, relative_read_time)
+
+        if out is None:
+            out = np.empty_like(values)
+        else:
+            check_output_array(out, np.double, values.size, "out", "JustInTimeReader.read")
+        out.reshape(self._size, -1)[self._order] = values.reshape(self._size, -1)
+        return out
+
+
+cdef class TraceRecorder:
+    """
+    Appends the events of a participant to a trace directory, see Participant.enable_recording().
+    """
+
+    def __cinit__ (self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._events = open(os.path.join(directory, "events.jsonl"), "w")
+        self._arrays = open(os.path.join(directory, "arrays.bin"), "wb")
+        self._offset = 0
+
+    cdef list _append(self, array):
+        """
+        Appends array to arrays.bin, padded to a multiple of 8 bytes, and returns its offset, dtype and shape.
+        """
+        array = np.ascontiguousarray(array)
+        offset = self._offset
+        self._arrays.write(array)
+        padding = -array.nbytes % 8
+        self._arrays.write(bytes(padding))
+        self._offset += array.nbytes + padding
+        return [offset, array.dtype.str, list(array.shape)]
+
+    cdef record(self, dict event, dict arrays=None):
+        with self._lock:
+            if arrays is not None:
+                for key, array in arrays.items():
+                    event[key] = self._append(array)
+            self._events.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def close (self):
+        with self._lock:
+            self._events.close()
+            self._arrays.close()
+
+
+cdef class ReplayParticipant:
+    """
+    Replays a trace recorded via Participant.enable_recording() in place of a Participant, without coupling
+    partners: the vertex IDs of set_mesh_vertex() and set_mesh_vertices(), the vertices of
+    get_mesh_vertex_ids_and_coordinates(), the values of read_data(), read_data_at_times() and map_and_read_data()
+    and the coupling state after initialize() and advance() are served from the trace. Written data and mesh
+    connectivity are checked and discarded, as are the other calls to preCICE. Reads are served in the order they
+    were recorded per call, mesh, data and time step; further reads repeat the last one. Mesh and Data handles via
+    mesh(), ExchangePlan, Checkpoint, profiling sections and the coupling loop of steps() are replayed as well.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the trace.
+
+    Examples
+    --------
+    >>> participant = precice.ReplayParticipant("solid-trace")
+    >>> vertex_ids = participant.set_mesh_vertices("Solid-Mesh", positions)
+    >>> participant.initialize()
+    >>> while participant.is_coupling_ongoing():
+    ...     forces = participant.read_data("Solid-Mesh", "Forces", vertex_ids, dt)
+    ...     participant.advance(dt)
+    """
+
+    def __cinit__ (self, directory):
+        self.directory = directory
+        path = os.path.join(directory, "arrays.bin")
+        self._arrays = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) > 0 else np.empty(0, np.uint8)
+        self._steps = [{}]  # reads by call, mesh and data name per time step, the first one before initialize()
+        self._states = [{"ongoing": False, "time_window_complete": False, "writing_checkpoint": False, "reading_checkpoint": False, "max_time_step_size": 0.0}]
+        self._vertices = {}
+        self._vertex_sizes = {}
+        self._direct_vertices = {}
+        self._dimensions = {}
+
+        with open(os.path.join(directory, "events.jsonl")) as file:
+            for line in file:
+                event = json.loads(line)
+                call = event["call"]
+                if call == "set_mesh_vertices":
+                    self._vertices.setdefault(event["mesh"], []).append(event["ids"])
+                    self._dimensions[event["mesh"]] = event["dimensions"]
+                elif call == "get_mesh_vertex_ids_and_coordinates":
+                    self._direct_vertices.setdefault(event["mesh"], []).append((event["ids"], event["coordinates"]))
+                    self._dimensions[event["mesh"]] = event["dimensions"]
+                elif call in ("initialize", "advance"):
+                    self._steps.append({})
+                    self._states.append(event["state"])
+                else:
+                    self._dimensions[event["mesh"], event["data"]] = event["dimensions"]
+                    if call in ("read_data", "read_data_at_times", "map_and_read_data"):
+                        self._steps[-1].setdefault((call, event["mesh"], event["data"]), []).append(event["values"])
+
+        self._step = 0
+        self._reads = {}
+
+    def __len__ (self):
+        """
+        Returns the number of recorded time steps.
+        """
+        return len(self._steps) - 1
+
+    cdef _array(self, list reference):
+        offset, dtype, shape = reference
+        return np.frombuffer(self._arrays, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+
+    cdef _next_step(self):
+        assert self._step + 1 < len(self._steps), "The trace in {} contains no further time steps".format(self.directory)
+        self._step += 1
+        self._reads = {}
+
+    cdef _next_read(self, call, mesh_name, data_name):
+        """
+        Returns the values recorded for the next call reading this data in the current time step.
+        """
+        key = (call, convert(mesh_name).decode(), convert(data_name).decode())
+        reads = self._steps[self._step].get(key)
+        assert reads, "The trace in {} contains no {} of {} on mesh {} in time step {}".format(self.directory, call, data_name, mesh_name, self._step)
+        i = self._reads.get(key, 0)
+        self._reads[key] = i + 1
+        return self._array(reads[min(i, len(reads) - 1)])
+
+    cdef _next_vertices(self, mesh_name):
+        """
+        Returns the vertex IDs recorded for the next call of set_mesh_vertex() or set_mesh_vertices() with this mesh.
+        """
+        vertices = self._vertices.get(convert(mesh_name).decode())
+        assert vertices, "The trace in {} contains no further vertices of mesh {}".format(self.directory, mesh_name)
+        return self._array(vertices.pop(0))
+
+    def initialize (self):
+        self._next_step()
+
+    def advance (self, double computed_timestep_length):
+        self._next_step()
+
+    def finalize (self):
+        pass
+
+    def is_coupling_ongoing (self):
+        return self._states[self._step]["ongoing"]
+
+    def is_time_window_complete (self):
+        return self._states[self._step]["time_window_complete"]
+
+    def requires_writing_checkpoint (self):
+        return self._states[self._step]["writing_checkpoint"]
+
+    def requires_reading_checkpoint (self):
+        return self._states[self._step]["reading_checkpoint"]
+
+    def get_max_time_step_size (self):
+        return self._states[self._step]["max_time_step_size"]
+
+    def requires_initial_data (self):
+        return False
+
+    def requires_gradient_data_for (self, mesh_name, data_name):
+        return False
+
+    def requires_mesh_connectivity_for (self, mesh_name):
+        return False
+
+    def get_mesh_dimensions (self, mesh_name):
+        dimensions = self._dimensions.get(convert(mesh_name).decode())
+        assert dimensions is not None, "The trace in {} contains no vertices of mesh {}".format(self.directory, mesh_name)
+        return dimensions
+
+    def get_data_dimensions (self, mesh_name, data_name):
+        dimensions = self._dimensions.get((convert(mesh_name).decode(), convert(data_name).decode()))
+        assert dimensions is not None, "The trace in {} contains no data {} on mesh {}".format(self.directory, data_name, mesh_name)
+        return dimensions
+
+    def get_mesh_vertex_size (self, mesh_name):
+        """
+        Returns the number of vertices of the next get_mesh_vertex_ids_and_coordinates() for meshes accessed
+        directly, otherwise the number of vertices set so far.
+        """
+        direct = self._direct_vertices.get(convert(mesh_name).decode())
+        if direct:
+            return int(np.prod(direct[0][0][2]))
+        return self._vertex_sizes.get(convert(mesh_name).decode(), 0)
+
+    def mesh (self, mesh_name):
+        """
+        Returns a handle to the given mesh, see Participant.mesh().
+        """
+        return Mesh(self, mesh_name)
+
+    def steps (self, plan=None, checkpoint=None, max_time_step_size=None):
+        """
+        Replays the coupling loop, see Participant.steps(). The read buffers of plan are filled from the trace.
+        """
+        if plan is not None and not isinstance(plan, ExchangePlan):
+            raise TypeError("steps requires an ExchangePlan for plan, but was provided the following input type: {}".format(type(plan)))
+        if checkpoint is not None and not isinstance(checkpoint, Checkpoint):
+            raise TypeError("steps requires a Checkpoint for checkpoint, but was provided the following input type: {}".format(type(checkpoint)))
+
+        cdef double max_dt = INFINITY if max_time_step_size is None else max_time_step_size
+        reading_checkpoint, ongoing, writing_checkpoint, dt = self._replay_step(plan, False, max_dt)
+        while ongoing:
+            if writing_checkpoint and checkpoint is not None:
+                checkpoint.save()
+            yield dt
+            reading_checkpoint, ongoing, writing_checkpoint, dt = self._replay_step(plan, True, max_dt)
+            if reading_checkpoint and checkpoint is not None:
+                checkpoint.restore()
+
+    cdef tuple _replay_step(self, plan, bint advance, double max_time_step_size):
+        """
+        Replays Participant._step(): advances to the next time step if requested and reads the data of plan.
+        """
+        if advance:
+            self._next_step()
+        state = self._states[self._step]
+        reading_checkpoint = advance and state["reading_checkpoint"]
+        ongoing = state["ongoing"]
+        writing_checkpoint, dt = False, 0.0
+        if ongoing:
+            writing_checkpoint = state["writing_checkpoint"]
+            dt = min(state["max_time_step_size"], max_time_step_size)
+            if plan is not None:
+                self._read_plan(plan)
+        return reading_checkpoint, ongoing, writing_checkpoint, dt
+
+    cdef _read_plan(self, plan):
+        """
+        Fills the read buffers of an ExchangePlan from the trace.
+        """
+        cdef ExchangePlan exchange = plan
+        for mesh_name, data_name, dimensions, vertex_ids, out in exchange._reads:
+            self.read_data(mesh_name, data_name, vertex_ids, 0, out)
+
+    # mesh access
+
+    def set_mesh_vertex (self, mesh_name, position):
+        """
+        Returns the vertex ID recorded for the next call with this mesh.
+        """
+        check_array_like(position, "position", "set_mesh_vertex")
+        if len(position) > 0:
+            assert len(position) == self.get_mesh_dimensions(mesh_name), "Dimensions of vertex coordinate in set_mesh_vertex does not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(len(position), self.get_mesh_dimensions(mesh_name))
+        ids = self._next_vertices(mesh_name)
+        assert ids.size == 1, "set_mesh_vertex does not match the trace, which recorded {} vertices".format(ids.size)
+        key = convert(mesh_name).decode()
+        self._vertex_sizes[key] = self._vertex_sizes.get(key, 0) + 1
+        return int(ids[0])
+
+    def set_mesh_vertices (self, mesh_name, positions, out=None, chunk_size=None):
+        """
+        Returns the vertex IDs recorded for the next call with this mesh, see Participant.set_mesh_vertices().
+        """
+        positions = open_npy(positions)
+        check_array_like(positions, "positions", "set_mesh_vertices")
+        if not isinstance(positions, np.ndarray):
+            positions = np.asarray(positions)
+
+        size = len(positions)
+        if size > 0:
+            dimensions = positions.shape[1] if positions.ndim == 2 else None
+            assert dimensions == self.get_mesh_dimensions(mesh_name), "Dimensions of vertex coordinates in set_mesh_vertices does not match with dimensions in problem definition. Provided dimensions: {}, expected dimensions: {}".format(dimensions, self.get_mesh_dimensions(mesh_name))
+        check_chunk_size(chunk_size, size)
+
+        ids = self._next_vertices(mesh_name)
+        assert size == ids.size, "Number of vertices in set_mesh_vertices does not match the trace. Provided size: {}, recorded size: {}".format(size, ids.size)
+        vertex_ids = create_output_array(out, np.int32, (size,), "out", "set_mesh_vertices")
+        vertex_ids[:] = ids
+        if isinstance(vertex_ids, np.memmap):
+            vertex_ids.flush()
+
+        key = convert(mesh_name).decode()
+        self._vertex_sizes[key] = self._vertex_sizes.get(key, 0) + size
+        return vertex_ids
+
+    def set_mesh_edge (self, mesh_name, first_vertex_id, second_vertex_id):
+        pass
+
+    def set_mesh_edges (self, mesh_name, vertices, chunk_size=None):
+        check_chunk_size(chunk_size, len(as_element_array(vertices, 2, "vertices", "set_mesh_edges")))
+
+    def set_mesh_triangle (self, mesh_name, first_vertex_id, second_vertex_id, third_vertex_id):
+        pass
+
+    def set_mesh_triangles (self, mesh_name, vertices, chunk_size=None):
+        check_chunk_size(chunk_size, len(as_element_array(vertices, 3, "vertices", "set_mesh_triangles")))
+
+    def set_mesh_quad (self, mesh_name, first_vertex_id, second_vertex_id, third_vertex_id, fourth_vertex_id):
+        pass
+
+    def set_mesh_quads (self, mesh_name, vertices, chunk_size=None):
+        check_chunk_size(chunk_size, len(as_element_array(vertices, 4, "vertices", "set_mesh_quads")))
+
+    def set_mesh_tetrahedron (self, mesh_name, first_vertex_id, second_vertex_id, third_vertex_id, fourth_vertex_id):
+        pass
+
+    def set_mesh_tetrahedra (self, mesh_name, vertices, chunk_size=None):
+        check_chunk_size(chunk_size, len(as_element_array(vertices, 4, "vertices", "set_mesh_tetrahedra")))
+
+    def set_mesh_connectivity (self, mesh_name, edges=None, triangles=None, quads=None, tetrahedra=None):
+        for elements, vertices_per_element, argument_name in ((edges, 2, "edges"), (triangles, 3, "triangles"), (quads, 4, "quads"), (tetrahedra, 4, "tetrahedra")):
+            if elements is not None:
+                as_element_array(elements, vertices_per_element, argument_name, "set_mesh_connectivity")
+
+    def reset_mesh (self, mesh_name):
+        pass
+
+    def set_mesh_access_region (self, mesh_name, bounding_box):
+        check_array_like(bounding_box, "bounding_box", "set_mesh_access_region")
+        assert len(bounding_box) > 0, "Bounding box cannot be empty."
+        assert len(bounding_box) == (self.get_mesh_dimensions(mesh_name) * 2), "Dimensions of bounding box in set_mesh_access_region does not match with dimensions in problem definition."
+
+    def get_mesh_vertex_ids_and_coordinates (self, mesh_name, out=None):
+        """
+        Returns the vertex IDs and coordinates recorded for the next call with this mesh. Further calls repeat the
+        last one.
+        """
+        direct = self._direct_vertices.get(convert(mesh_name).decode())
+        assert direct, "The trace in {} contains no vertices of mesh {} accessed directly".format(self.directory, mesh_name)
+        recorded_ids, recorded_coordinates = direct.pop(0) if len(direct) > 1 else direct[0]
+        recorded_ids, recorded_coordinates = self._array(recorded_ids), self._array(recorded_coordinates)
+
+        if out is None:
+            return recorded_ids.copy(), recorded_coordinates.copy()
+        ids, coordinates = out
+        check_output_array(ids, np.int32, recorded_ids.size, "ids", "get_mesh_vertex_ids_and_coordinates")
+        check_output_array(coordinates, np.double, recorded_coordinates.size, "coordinates", "get_mesh_vertex_ids_and_coordinates")
+        np.copyto(ids.reshape(-1), recorded_ids.reshape(-1))
+        np.copyto(coordinates.reshape(-1), recorded_coordinates.reshape(-1))
+        return ids, coordinates
+
+    def get_mesh_vertex_index (self, mesh_name):
+        """
+        Returns a VertexIndex over the vertices of get_mesh_vertex_ids_and_coordinates().
+        """
+        return VertexIndex(*self.get_mesh_vertex_ids_and_coordinates(mesh_name))
+
+    # data access
+
+    def write_data (self, mesh_name, data_name, vertex_ids, values):
+        check_array_like(vertex_ids, "vertex_ids", "write_data")
+        check_array_like(values, "values", "write_data")
+        expected = np.size(vertex_ids) * self.get_data_dimensions(mesh_name, data_name)
+        assert np.size(values) == expected, "Values are of incorrect size in write_data. Provided size: {}, expected size: {}".format(np.size(values), expected)
+
+    def write_and_map_data (self, mesh_name, data_name, coordinates, values):
+        check_array_like(coordinates, "coordinates", "write_and_map_data")
+        check_array_like(values, "values", "write_and_map_data")
+        expected = np.size(coordinates) // self.get_mesh_dimensions(mesh_name) * self.get_data_dimensions(mesh_name, data_name)
+        assert np.size(values) == expected, "Values are of incorrect size in write_and_map_data. Provided size: {}, expected size: {}".format(np.size(values), expected)
+
+    def write_gradient_data (self, mesh_name, data_name, vertex_ids, gradients, axis_order=None):
+        check_array_like(vertex_ids, "vertex_ids", "write_gradient_data")
+        check_array_like(gradients, "gradients", "write_gradient_data")
+        assert axis_order in (None, "component-first", "derivative-first"), "axis_order has to be \"component-first\" or \"derivative-first\", but is {}".format(repr(axis_order))
+        expected = np.size(vertex_ids) * self.get_data_dimensions(mesh_name, data_name) * self.get_mesh_dimensions(mesh_name)
+        assert np.size(gradients) == expected, "Gradient values are of incorrect size in write_gradient_data. Provided size: {}, expected size: {}".format(np.size(gradients), expected)
+
+    def read_data (self, mesh_name, data_name, vertex_ids, double relative_read_time, out=None):
+        """
+        Returns the values recorded for the next read of this data in the current time step.
+        """
+        check_array_like(vertex_ids, "vertex_ids", "read_data")
+        values = self._next_read("read_data", mesh_name, data_name)
+        assert values.shape[0] == np.size(vertex_ids), "Vertex IDs are of incorrect length in read_data. Provided size: {}, recorded size: {}".format(np.size(vertex_ids), values.shape[0])
+        return copy_recorded(values, out, "read_data")
+
+    def read_data_at_times (self, mesh_name, data_name, vertex_ids, relative_read_times, out=None):
+        """
+        Returns the values recorded for the next read of this data at several points in time in the current time
+        step.
+        """
+        check_array_like(vertex_ids, "vertex_ids", "read_data_at_times")
+        check_array_like(relative_read_times, "relative_read_times", "read_data_at_times")
+        values = self._next_read("read_data_at_times", mesh_name, data_name)
+        assert values.shape[:2] == (np.size(relative_read_times), np.size(vertex_ids)), "Vertex IDs or relative read times are of incorrect length in read_data_at_times. Provided sizes: {}, recorded sizes: {}".format(
+            (np.size(relative_read_times), np.size(vertex_ids)), values.shape[:2])
+        return copy_recorded(values, out, "read_data_at_times")
+
+    def map_and_read_data (self, mesh_name, data_name, coordinates, double relative_read_time, out=None):
+        """
+        Returns the values recorded for the next mapped read of this data in the current time step.
+        """
+        check_array_like(coordinates, "coordinates", "map_and_read_data")
+        values = self._next_read("map_and_read_data", mesh_name, data_name)
+        size = np.size(coordinates) // self.get_mesh_dimensions(mesh_name)
+        assert values.shape[0] == size, "Coordinates are of incorrect length in map_and_read_data. Provided size: {}, recorded size: {}".format(size, values.shape[0])
+        return copy_recorded(values, out, "map_and_read_data")
+
+    # profiling
+
+    def start_profiling_section (self, event_name):
+        pass
+
+    def stop_last_profiling_section (self):
+        pass
+
+    def profile (self, event_name):
+        """
+        Returns a context manager standing in for a profiling section, see Participant.profile().
+        """
+        return ProfilingSection(self, event_name)
+
+    def profiled (self, func=None, event_name=None):
+        """
+        Decorator standing in for profiling sections, see Participant.profiled().
+        """
+        if isinstance(func, str):
+            func, event_name = None, func
+        if func is None:
+            return functools.partial(self.profiled, event_name=event_name)
+
+        return self.profile(event_name or func.__qualname__)(func)
+
+
+cdef copy_recorded(values, out, function_name):
+    """
+    Returns a copy of recorded values if out is None, otherwise copies them into out.
+    """
+    if out is None:
+        return values.copy()
+    check_output_array(out, precision_dtype(out), values.size, "out", function_name)
+    np.copyto(out.reshape(-1), values.reshape(-1))
+    return out
+
+
+cdef class VertexIndex:
+    """
+    Spatial index over vertices for batched nearest-neighbor and radius queries, usually obtained via
+    Participant.get_mesh_vertex_index(). The vertices are sorted into a uniform grid with about two vertices per
+    cell of their bounding box.
+
+    Parameters
+    ----------
+    ids : array_like
+        preCICE vertex IDs of the N vertices.
+    coordinates : array_like
+        Coordinates of the vertices [N x D] with D = 1, 2 or 3.
+    """
+
+    def __cinit__ (self, ids, coordinates):
+        check_array_like(ids, "ids", "VertexIndex")
+        check_array_like(coordinates, "coordinates", "VertexIndex")
+
+        self.ids = as_contiguous_array(ids, np.int32).ravel()
+        size = self.ids.size
+        coordinates = as_contiguous_array(coordinates, np.double)
+        self.coordinates = coordinates.reshape(size, 1) if coordinates.ndim == 1 else coordinates
+        assert self.coordinates.ndim == 2 and self.coordinates.shape[0] == size, "VertexIndex requires coordinates of shape ({}, D), but {} were provided".format(size, coordinates.shape)
+        dimensions = self.coordinates.shape[1]
+        assert 1 <= dimensions <= 3, "VertexIndex requires coordinates of 1, 2 or 3 dimensions, but {} were provided".format(dimensions)
+        self.dimensions = dimensions
+
+        lower = self.coordinates.min(axis=0) if size > 0 else np.zeros(dimensions)
+        extent = self.coordinates.max(axis=0) - lower if size > 0 else np.zeros(dimensions)
+        # about two vertices per cell of the bounding box, ignoring directions in which the vertices are flat, i.e.
+        # thinner than a cell. Flattening a direction enlarges the cells, hence repeat until no further direction is
+        # flat. This bounds the number of cells by 2^D * N / 2, also for surfaces with round-off thickness.
+        spread = extent > 0
+        cell_size = max(extent.max(), 1.0) if size > 0 else 1.0
+        while spread.any():
+            cell_size = (2.0 * np.prod(extent[spread]) / size) ** (1.0 / np.count_nonzero(spread))
+            if (extent[spread] >= cell_size).all():
+                break
+            spread &= extent >= cell_size
+        if not spread.any():
+            cell_size = max(extent.max(), 1.0)
+        cells = (extent / cell_size).astype(np.intp) + 1
+
+        self._cell_size = cell_size
+        for d in range(3):
+            self._lower[d] = lower[d] if d < dimensions else 0.0
+            self._cells[d] = cells[d] if d < dimensions else 1
+
+        cell = np.minimum(((self.coordinates - lower) / cell_size).astype(np.intp), cells - 1)
+        linear = np.ravel_multi_index(tuple(cell.T), tuple(cells)) if size > 0 else np.empty(0, dtype=np.intp)
+        order = np.argsort(linear, kind="stable")
+        self._cell_start = np.searchsorted(linear[order], np.arange(np.prod(cells) + 1))
+        self._points = np.ascontiguousarray(self.coordinates[order])
+        self._ids = np.ascontiguousarray(self.ids[order])
+
+    def __len__ (self):
+        return self.ids.size
+
+    def __repr__ (self):
+        return "VertexIndex({} vertices, dimensions={})".format(self.ids.size, self.dimensions)
+
+    def nearest (self, points):
+        """
+        Finds the nearest vertex of each point.
+
+        Parameters
+        ----------
+        points : array_like
+            Coordinates of M points [M x D].
+
+        Returns
+        -------
+        ids : numpy.ndarray
+            preCICE vertex IDs of the nearest vertices (M), -1 if the index is empty.
+        distances : numpy.ndarray
+            Distances to the nearest vertices (M).
+        """
+        check_array_like(points, "points", "VertexIndex.nearest")
+
+        cdef const double[:, ::1] cpp_points = as_contiguous_array(points, np.double).reshape(-1, self.dimensions)
+        cdef Py_ssize_t size = cpp_points.shape[0], i, nearest
+        ids = np.full(size, -1, dtype=np.int32)
+        distances = np.full(size, np.inf)
+        cdef int[::1] cpp_ids = ids
+        cdef double[::1] cpp_distances = distances
+
+        if self._ids.shape[0] > 0:
+            with nogil:
+                for i in range(size):
+                    nearest = self._nearest(&cpp_points[i, 0], &cpp_distances[i])
+                    cpp_ids[i] = self._ids[nearest]
+
+        return ids, np.sqrt(distances, out=distances)
+
+    def within (self, points, double radius):
+        """
+        Finds all vertices within the given distance of each point.
+
+        Parameters
+        ----------
+        points : array_like
+            Coordinates of M points [M x D].
+        radius : double
+            Maximum distance of the vertices to the points.
+
+        Returns
+        -------
+        ids : list of numpy.ndarray
+            preCICE vertex IDs of the vertices within the radius, one array per point.
+        """
+        check_array_like(points, "points", "VertexIndex.within")
+
+        cdef const double[:, ::1] cpp_points = as_contiguous_array(points, np.double).reshape(-1, self.dimensions)
+        cdef Py_ssize_t size = cpp_points.shape[0], i
+        cdef vector[int] found
+        cdef vector[Py_ssize_t] ends
+
+        with nogil:
+            for i in range(size):
+                self._within(&cpp_points[i, 0], radius, found)
+                ends.push_back(found.size())
+
+        ids = np.empty(found.size(), dtype=np.int32)
+        if found.size() > 0:
+            ids[:] = <int[:found.size()]> found.data()
+        return np.split(ids, ends)[:size]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline Py_ssize_t _cell(self, double coordinate, int d) noexcept nogil:
+        cdef Py_ssize_t cell = <Py_ssize_t>((coordinate - self._lower[d]) / self._cell_size) if coordinate > self._lower[d] else 0
+        return min(cell, self._cells[d] - 1)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline double _distance(self, const double* point, Py_ssize_t vertex) noexcept nogil:
+        cdef double distance = 0, difference
+        cdef int d
+        for d in range(self.dimensions):
+            difference = point[d] - self._points[vertex, d]
+            distance += difference * difference
+        return distance
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline Py_ssize_t _search_cell(self, const double* point, Py_ssize_t cell, double* distance, Py_ssize_t nearest) noexcept nogil:
+        cdef Py_ssize_t vertex
+        cdef double vertex_distance
+        for vertex in range(self._cell_start[cell], self._cell_start[cell + 1]):
+            vertex_distance = self._distance(point, vertex)
+            if vertex_distance < distance[0]:
+                distance[0] = vertex_distance
+                nearest = vertex
+        return nearest
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef Py_ssize_t _nearest(self, const double* point, double* distance) noexcept nogil:
+        """
+        Returns the position of the nearest vertex in the sorted vertices and stores its squared distance.
+        Cells are searched in shells of growing Chebyshev distance around the cell of the point, until no vertex in
+        the next shell can be closer than the nearest vertex found. For points outside of the grid, the distance to
+        the grid is taken into account, as the vertices in the next shell are at least as far away.
+        """
+        cdef Py_ssize_t center[3]
+        cdef Py_ssize_t low[3]
+        cdef Py_ssize_t high[3]
+        cdef Py_ssize_t shell = 0, last_shell = 0, x, y, z, nearest = -1
+        cdef double shell_distance, outside = 0, upper
+        cdef int d
+        distance[0] = INFINITY
+
+        for d in range(3):
+            center[d] = self._cell(point[d], d) if d < self.dimensions else 0
+            last_shell = max(last_shell, max(center[d], self._cells[d] - 1 - center[d]))
+            if d < self.dimensions:
+                upper = self._lower[d] + self._cells[d] * self._cell_size
+                if point[d] < self._lower[d]:
+                    outside += (self._lower[d] - point[d]) * (self._lower[d] - point[d])
+                elif point[d] > upper:
+                    outside += (point[d] - upper) * (point[d] - upper)
+
+        while shell <= last_shell:
+            for d in range(3):
+                low[d] = max(center[d] - shell, 0)
+                high[d] = min(center[d] + shell, self._cells[d] - 1)
+            for x in range(low[0], high[0] + 1):
+                for y in range(low[1], high[1] + 1):
+                    if x == center[0] - shell or x == center[0] + shell or y == center[1] - shell or y == center[1] + shell:
+                        for z in range(low[2], high[2] + 1):
+                            nearest = self._search_cell(point, (x * self._cells[1] + y) * self._cells[2] + z, distance, nearest)
+                    else:
+                        # only the two outermost cells in z belong to the shell, the cells in between were searched before
+                        if center[2] - shell >= 0:
+                            nearest = self._search_cell(point, (x * self._cells[1] + y) * self._cells[2] + center[2] - shell, distance, nearest)
+                        if shell > 0 and center[2] + shell < self._cells[2]:
+                            nearest = self._search_cell(point, (x * self._cells[1] + y) * self._cells[2] + center[2] + shell, distance, nearest)
+
+            shell_distance = shell * self._cell_size
+            if nearest >= 0 and distance[0] <= shell_distance * shell_distance + outside:
+                break
+            shell += 1
+
+        return nearest
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _within(self, const double* point, double radius, vector[int]& found) noexcept nogil:
+        cdef Py_ssize_t low[3]
+        cdef Py_ssize_t high[3]
+        cdef Py_ssize_t x, y, z, vertex, cell
+        cdef int d
+
+        for d in range(3):
+            if d < self.dimensions:
+                low[d] = self._cell(point[d] - radius, d)
+                high[d] = self._cell(point[d] + radius, d)
+            else:
+                low[d] = high[d] = 0
+
+        for x in range(low[0], high[0] + 1):
+            for y in range(low[1], high[1] + 1):
+                for z in range(low[2], high[2] + 1):
+                    cell = (x * self._cells[1] + y) * self._cells[2] + z
+                    for vertex in range(self._cell_start[cell], self._cell_start[cell + 1]):
+                        if self._distance(point, vertex) <= radius * radius:
+                            found.push_back(self._ids[vertex])
+
 
 def get_version_information ():
     """
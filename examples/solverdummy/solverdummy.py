@@ -1,6 +1,8 @@
 from __future__ import division
 
 import argparse
+import threading
+import time
 import numpy as np
 import precice
 
@@ -8,77 +10,127 @@ parser = argparse.ArgumentParser()
 parser.add_argument(
     "configurationFileName", help="Name of the xml config file.", type=str
 )
-parser.add_argument("participantName", help="Name of the solver.", type=str)
+parser.add_argument(
+    "participantName",
+    help="Name of the solver. Several names couple all of them in this process, which requires pyprecice built with PYPRECICE_MOCKED=loopback.",
+    type=str,
+    nargs="+",
+)
+parser.add_argument("--num-vertices", help="Number of vertices.", type=int, default=3)
+parser.add_argument(
+    "--num-time-windows",
+    help="Number of time windows after which the solver stops, even if the coupling is still ongoing.",
+    type=int,
+    default=None,
+)
+parser.add_argument(
+    "--report",
+    help="Print the throughput at the end instead of messages for every step.",
+    action="store_true",
+)
 
 try:
     args = parser.parse_args()
 except SystemExit:
     print("")
-    print("Usage: python ./solverdummy precice-config participant-name")
+    print(
+        "Usage: python ./solverdummy precice-config participant-name [participant-name ...] [--num-vertices N] [--num-time-windows M] [--report]"
+    )
     quit()
 
 configuration_file_name = args.configurationFileName
-participant_name = args.participantName
+num_vertices = args.num_vertices  # Number of vertices
 
-if participant_name == "SolverOne":
-    write_data_name = "Data-One"
-    read_data_name = "Data-Two"
-    mesh_name = "SolverOne-Mesh"
 
-if participant_name == "SolverTwo":
-    read_data_name = "Data-One"
-    write_data_name = "Data-Two"
-    mesh_name = "SolverTwo-Mesh"
+def log(message):
+    if not args.report:
+        print(message)
 
-num_vertices = 3  # Number of vertices
 
-solver_process_index = 0
-solver_process_size = 1
+def solve(participant_name, solver_process_index, solver_process_size):
+    if participant_name == "SolverOne":
+        write_data_name = "Data-One"
+        read_data_name = "Data-Two"
+        mesh_name = "SolverOne-Mesh"
 
-participant = precice.Participant(
-    participant_name, configuration_file_name, solver_process_index, solver_process_size
-)
+    if participant_name == "SolverTwo":
+        read_data_name = "Data-One"
+        write_data_name = "Data-Two"
+        mesh_name = "SolverTwo-Mesh"
 
-assert participant.requires_mesh_connectivity_for(mesh_name) is False
+    participant = precice.Participant(
+        participant_name,
+        configuration_file_name,
+        solver_process_index,
+        solver_process_size,
+    )
 
-vertices = np.zeros((num_vertices, participant.get_mesh_dimensions(mesh_name)))
-read_data = np.zeros(
-    (num_vertices, participant.get_data_dimensions(mesh_name, read_data_name))
-)
-write_data = np.zeros(
-    (num_vertices, participant.get_data_dimensions(mesh_name, write_data_name))
-)
+    assert participant.requires_mesh_connectivity_for(mesh_name) is False
+
+    mesh_dimensions = participant.get_mesh_dimensions(mesh_name)
+    read_data_dimensions = participant.get_data_dimensions(mesh_name, read_data_name)
+    write_data_dimensions = participant.get_data_dimensions(mesh_name, write_data_name)
+
+    vertices = np.zeros((num_vertices, mesh_dimensions))
+    read_data = np.zeros((num_vertices, read_data_dimensions))
+    write_data = np.zeros((num_vertices, write_data_dimensions))
+
+    vertices[:] = np.arange(num_vertices)[:, np.newaxis]
+    read_data[:] = np.arange(num_vertices)[:, np.newaxis]
+    write_data[:] = np.arange(num_vertices)[:, np.newaxis]
+
+    vertex_ids = participant.set_mesh_vertices(mesh_name, vertices)
+
+    participant.initialize()
+
+    start = time.perf_counter()
+    time_windows = 0
+    iterations = 0
 
-for x in range(num_vertices):
-    for y in range(participant.get_mesh_dimensions(mesh_name)):
-        vertices[x, y] = x
+    while participant.is_coupling_ongoing():
+        if args.num_time_windows is not None and time_windows == args.num_time_windows:
+            break
 
-    for y in range(participant.get_data_dimensions(mesh_name, read_data_name)):
-        read_data[x, y] = x
+        if participant.requires_writing_checkpoint():
+            log("DUMMY: Writing iteration checkpoint")
 
-    for y in range(participant.get_data_dimensions(mesh_name, write_data_name)):
-        write_data[x, y] = x
+        dt = participant.get_max_time_step_size()
+        participant.read_data(mesh_name, read_data_name, vertex_ids, dt, out=read_data)
 
-vertex_ids = participant.set_mesh_vertices(mesh_name, vertices)
+        np.add(read_data, 1, out=write_data)
 
-participant.initialize()
+        participant.write_data(mesh_name, write_data_name, vertex_ids, write_data)
 
-while participant.is_coupling_ongoing():
-    if participant.requires_writing_checkpoint():
-        print("DUMMY: Writing iteration checkpoint")
+        log("DUMMY: Advancing in time")
+        participant.advance(dt)
+        iterations += 1
 
-    dt = participant.get_max_time_step_size()
-    read_data = participant.read_data(mesh_name, read_data_name, vertex_ids, dt)
+        if participant.requires_reading_checkpoint():
+            log("DUMMY: Reading iteration checkpoint")
 
-    write_data = read_data + 1
+        if participant.is_time_window_complete():
+            time_windows += 1
 
-    participant.write_data(mesh_name, write_data_name, vertex_ids, write_data)
+    elapsed = time.perf_counter() - start
+    participant.finalize()
 
-    print("DUMMY: Advancing in time")
-    participant.advance(dt)
+    if args.report:
+        exchanged = iterations * (read_data.nbytes + write_data.nbytes)
+        print(
+            f"DUMMY: {participant_name}: {num_vertices} vertices, {time_windows} time windows, {iterations} iterations "
+            f"in {elapsed:.3f} s, {iterations / elapsed:.1f} iterations/s, {exchanged / elapsed / 1e6:.1f} MB/s read and written"
+        )
+    print("DUMMY: Closing python solver dummy...")
 
-    if participant.requires_reading_checkpoint():
-        print("DUMMY: Reading iteration checkpoint")
 
-participant.finalize()
-print("DUMMY: Closing python solver dummy...")
+if len(args.participantName) == 1:
+    solve(args.participantName[0], 0, 1)
+else:
+    threads = [
+        threading.Thread(target=solve, args=(participant_name, 0, 1))
+        for participant_name in args.participantName
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
@@ -1,8 +1,30 @@
-from cyprecice import Participant, get_version_information
-from importlib.metadata import version, PackageNotFoundError
+from cyprecice import (
+    Participant,
+    Mesh,
+    Data,
+    Checkpoint,
+    ExchangePlan,
+    ProfilingSection,
+    JustInTimeWriter,
+    JustInTimeReader,
+    VertexIndex,
+    VertexSet,
+    UncheckedParticipant,
+    ParticipantCApi,
+    ReplayParticipant,
+    get_version_information,
+)
 
-try:
-    __version__ = version("pyprecice")
-except PackageNotFoundError:
-    # package is not installed
-    pass
+
+def __getattr__(name):
+    # __version__ is resolved on first access, since importlib.metadata is slow to import
+    if name == "__version__":
+        from importlib.metadata import version, PackageNotFoundError
+
+        try:
+            globals()["__version__"] = version("pyprecice")
+            return globals()["__version__"]
+        except PackageNotFoundError:
+            # package is not installed
+            pass
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
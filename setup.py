@@ -1,4 +1,5 @@
 from setuptools import setup
+from Cython import __version__ as cython_version
 from Cython.Distutils.extension import Extension
 from Cython.Build import cythonize
 import numpy
@@ -23,6 +24,15 @@ def find_precice():
     return pkgconfig.cflags("libprecice").split(), pkgconfig.libs("libprecice").split()
 
 
+def get_cython_directives():
+    directives = {"embedsignature": True}
+    if tuple(int(v) for v in cython_version.split(".")[:2]) >= (3, 1):
+        # calls into the C++ participant are serialized by a per-object lock, so the
+        # module does not need the GIL to be re-enabled on free-threaded CPython
+        directives["freethreading_compatible"] = True
+    return directives
+
+
 def get_extensions():
     cflags, ldflags = find_precice()
 
@@ -32,7 +42,12 @@ def get_extensions():
     bindings_sources = ["cyprecice/cyprecice.pyx"]
     compile_args += cflags
 
-    if os.environ.get(MOCKED_ENV) is not None:
+    if os.environ.get(MOCKED_ENV) == "loopback":
+        print(
+            f"Building pyprecice with in-process loopback coupling as {MOCKED_ENV}=loopback"
+        )
+        bindings_sources.append("test/LoopbackParticipant.cpp")
+    elif os.environ.get(MOCKED_ENV) is not None:
         print(f"Building mocked pyprecice as {MOCKED_ENV} is set")
         bindings_sources.append("test/Participant.cpp")
     else:
@@ -48,7 +63,7 @@ def get_extensions():
             extra_compile_args=compile_args,
             extra_link_args=link_args,
             define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
-            cython_directives={"embedsignature": True},
+            cython_directives=get_cython_directives(),
         )
     ]
 
@@ -0,0 +1,470 @@
+// In-process loopback implementation of the preCICE API. Participants created
+// in the same process, e.g. in separate threads, exchange the data they write
+// with each other in initialize() and at the end of each time window, without
+// any communication or mapping. Vertex i of one participant corresponds to
+// vertex i of all other participants.
+//
+// Build with PYPRECICE_MOCKED=loopback. The coupling is configured by the
+// following tags of the preCICE configuration file, if it exists:
+//
+//   <mesh name dimensions>, <data:scalar name>, <data:vector name>,
+//   <participant name>, <coupling-scheme:*-implicit>, <max-time-windows value>,
+//   <max-time value>, <time-window-size value> and <max-iterations value>
+//
+// and can be overridden by the environment variables
+//
+//   PYPRECICE_LOOPBACK_PARTICIPANTS  number of coupled participants
+//   PYPRECICE_LOOPBACK_TIME_WINDOWS  number of time windows
+//   PYPRECICE_LOOPBACK_ITERATIONS    number of iterations per time window
+//   PYPRECICE_LOOPBACK_LATENCY       seconds each advance() sleeps
+//
+// If a time window is iterated more than once, each iteration but the last
+// requires reading the checkpoint, as an implicit coupling scheme which
+// converges after the given number of iterations does.
+
+#include "precice/Participant.hpp"
+#include "precice/Tooling.hpp"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <condition_variable>
+#include <cstdlib>
+#include <fstream>
+#include <iterator>
+#include <map>
+#include <mutex>
+#include <regex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace {
+
+std::string str(precice::string_view view) {
+  return std::string(view.data(), view.size());
+}
+
+struct Config {
+  std::map<std::string, int> meshDimensions;
+  std::map<std::string, bool> vectorData;
+  int participants = 2;
+  int timeWindows = 10;
+  double timeWindowSize = 1.0;
+  int iterations = 1;
+  double latency = 0.0;
+};
+
+std::vector<std::string> findTags(const std::string &xml,
+                                  const std::string &tag) {
+  const std::regex regex("<" + tag + "[\\s/>][^>]*>");
+  std::vector<std::string> tags;
+  for (auto it = std::sregex_iterator(xml.begin(), xml.end(), regex);
+       it != std::sregex_iterator(); ++it) {
+    tags.push_back(it->str());
+  }
+  return tags;
+}
+
+std::string attribute(const std::string &tag, const std::string &name) {
+  std::smatch match;
+  if (std::regex_search(tag, match,
+                        std::regex("\\s" + name + "=\"([^\"]*)\""))) {
+    return match[1];
+  }
+  return "";
+}
+
+void fromEnvironment(const char *variable, int &value) {
+  if (const char *env = std::getenv(variable)) {
+    value = std::stoi(env);
+  }
+}
+
+void fromEnvironment(const char *variable, double &value) {
+  if (const char *env = std::getenv(variable)) {
+    value = std::stod(env);
+  }
+}
+
+Config readConfig(const std::string &fileName) {
+  Config config;
+  std::ifstream file(fileName);
+  const std::string xml((std::istreambuf_iterator<char>(file)),
+                        std::istreambuf_iterator<char>());
+
+  for (const auto &tag : findTags(xml, "mesh")) {
+    config.meshDimensions[attribute(tag, "name")] =
+        std::stoi(attribute(tag, "dimensions"));
+  }
+  for (const auto &tag : findTags(xml, "data:scalar")) {
+    config.vectorData[attribute(tag, "name")] = false;
+  }
+  for (const auto &tag : findTags(xml, "data:vector")) {
+    config.vectorData[attribute(tag, "name")] = true;
+  }
+  if (!findTags(xml, "participant").empty()) {
+    config.participants = findTags(xml, "participant").size();
+  }
+  for (const auto &tag : findTags(xml, "time-window-size")) {
+    config.timeWindowSize = std::stod(attribute(tag, "value"));
+  }
+  for (const auto &tag : findTags(xml, "max-time")) {
+    config.timeWindows = std::ceil(std::stod(attribute(tag, "value")) /
+                                       config.timeWindowSize -
+                                   1e-9);
+  }
+  for (const auto &tag : findTags(xml, "max-time-windows")) {
+    config.timeWindows = std::stoi(attribute(tag, "value"));
+  }
+  if (!findTags(xml, "coupling-scheme:[a-z-]+-implicit").empty()) {
+    for (const auto &tag : findTags(xml, "max-iterations")) {
+      config.iterations = std::stoi(attribute(tag, "value"));
+    }
+  }
+
+  fromEnvironment("PYPRECICE_LOOPBACK_PARTICIPANTS", config.participants);
+  fromEnvironment("PYPRECICE_LOOPBACK_TIME_WINDOWS", config.timeWindows);
+  fromEnvironment("PYPRECICE_LOOPBACK_ITERATIONS", config.iterations);
+  fromEnvironment("PYPRECICE_LOOPBACK_LATENCY", config.latency);
+  return config;
+}
+
+// Data shared by all participants of the process
+struct Exchange {
+  std::mutex mutex;
+  std::condition_variable condition;
+  int arrived = 0;
+  long generation = 0;
+  // values last written by any participant, by data name
+  std::map<std::string, std::vector<double>> values;
+};
+
+Exchange exchange;
+
+// Blocks until the given number of participants have called this function.
+// The last participant arriving clears the published values if requested.
+void barrier(int participants, bool clear) {
+  std::unique_lock<std::mutex> lock(exchange.mutex);
+  const long generation = exchange.generation;
+  if (++exchange.arrived == participants) {
+    if (clear) {
+      exchange.values.clear();
+    }
+    exchange.arrived = 0;
+    ++exchange.generation;
+    exchange.condition.notify_all();
+  } else {
+    exchange.condition.wait(
+        lock, [generation] { return exchange.generation != generation; });
+  }
+}
+
+} // namespace
+
+namespace precice {
+
+namespace impl {
+class ParticipantImpl {
+public:
+  explicit ParticipantImpl(const std::string &configurationFileName)
+      : config(readConfig(configurationFileName)) {}
+
+  int meshDimensions(const std::string &meshName) const {
+    const auto it = config.meshDimensions.find(meshName);
+    return it == config.meshDimensions.end() ? 3 : it->second;
+  }
+
+  int dataDimensions(const std::string &meshName,
+                     const std::string &dataName) const {
+    const auto it = config.vectorData.find(dataName);
+    return it != config.vectorData.end() && it->second
+               ? meshDimensions(meshName)
+               : 1;
+  }
+
+  // Publishes the written data and receives the data written by all other
+  // participants.
+  void exchangeData() {
+    {
+      std::lock_guard<std::mutex> lock(exchange.mutex);
+      for (const auto &entry : written) {
+        exchange.values[entry.first] = entry.second;
+      }
+    }
+    barrier(config.participants, false);
+    {
+      std::lock_guard<std::mutex> lock(exchange.mutex);
+      for (const auto &entry : exchange.values) {
+        if (written.count(entry.first) == 0) {
+          received[entry.first] = entry.second;
+        }
+      }
+    }
+    // nobody publishes again before everybody has received, and values of this
+    // exchange are not received by participants coupled later in the process
+    barrier(config.participants, true);
+  }
+
+  void read(const std::string &meshName, const std::string &dataName,
+            span<const VertexID> vertices, span<double> values) const {
+    const int dimensions = dataDimensions(meshName, dataName);
+    const auto it = received.find(dataName);
+    for (std::size_t i = 0; i < vertices.size(); i++) {
+      for (int d = 0; d < dimensions; d++) {
+        const std::size_t index = vertices[i] * dimensions + d;
+        values[i * dimensions + d] =
+            it != received.end() && index < it->second.size() ? it->second[index]
+                                                              : 0.0;
+      }
+    }
+  }
+
+  void write(const std::string &meshName, const std::string &dataName,
+             span<const VertexID> vertices, span<const double> values) {
+    const int dimensions = dataDimensions(meshName, dataName);
+    auto &buffer = written[dataName];
+    for (std::size_t i = 0; i < vertices.size(); i++) {
+      const std::size_t size = (vertices[i] + 1) * dimensions;
+      if (buffer.size() < size) {
+        buffer.resize(size, 0.0);
+      }
+      for (int d = 0; d < dimensions; d++) {
+        buffer[vertices[i] * dimensions + d] = values[i * dimensions + d];
+      }
+    }
+  }
+
+  std::vector<VertexID> indices(std::size_t size) const {
+    std::vector<VertexID> vertices(size);
+    for (std::size_t i = 0; i < size; i++) {
+      vertices[i] = i;
+    }
+    return vertices;
+  }
+
+  Config config;
+  std::map<std::string, std::vector<double>> coordinates;
+  std::map<std::string, std::vector<double>> written;
+  std::map<std::string, std::vector<double>> received;
+  int window = 0;
+  int iteration = 0;
+  double timeInWindow = 0.0;
+  bool windowStart = false;
+  bool windowComplete = false;
+  bool windowRepeated = false;
+};
+} // namespace impl
+
+Participant::Participant(precice::string_view participantName,
+                         precice::string_view configurationFileName,
+                         int solverProcessIndex, int solverProcessSize)
+    : _impl(new impl::ParticipantImpl(str(configurationFileName))) {}
+
+Participant::Participant(precice::string_view participantName,
+                         precice::string_view configurationFileName,
+                         int solverProcessIndex, int solverProcessSize,
+                         void *communicator)
+    : _impl(new impl::ParticipantImpl(str(configurationFileName))) {}
+
+Participant::~Participant() = default;
+
+void Participant::initialize() {
+  _impl->exchangeData();
+  _impl->windowStart = true;
+}
+
+void Participant::advance(double computedTimestepLength) {
+  if (_impl->config.latency > 0) {
+    std::this_thread::sleep_for(
+        std::chrono::duration<double>(_impl->config.latency));
+  }
+  _impl->timeInWindow += computedTimestepLength;
+  _impl->windowStart = false;
+  _impl->windowComplete = false;
+  _impl->windowRepeated = false;
+  if (_impl->timeInWindow < _impl->config.timeWindowSize * (1 - 1e-9)) {
+    return; // subcycling, data is exchanged at the end of the window
+  }
+
+  _impl->exchangeData();
+  _impl->timeInWindow = 0.0;
+  if (++_impl->iteration < _impl->config.iterations) {
+    _impl->windowRepeated = true;
+  } else {
+    _impl->iteration = 0;
+    _impl->window++;
+    _impl->windowStart = true;
+    _impl->windowComplete = true;
+  }
+}
+
+void Participant::finalize() {}
+
+int Participant::getMeshDimensions(precice::string_view meshName) const {
+  return _impl->meshDimensions(str(meshName));
+}
+
+int Participant::getDataDimensions(precice::string_view meshName,
+                                   precice::string_view dataName) const {
+  return _impl->dataDimensions(str(meshName), str(dataName));
+}
+
+bool Participant::isCouplingOngoing() const {
+  return _impl->window < _impl->config.timeWindows;
+}
+
+bool Participant::isTimeWindowComplete() const {
+  return _impl->windowComplete;
+}
+
+double Participant::getMaxTimeStepSize() const {
+  return _impl->config.timeWindowSize - _impl->timeInWindow;
+}
+
+bool Participant::requiresInitialData() { return false; }
+
+bool Participant::requiresReadingCheckpoint() {
+  return _impl->windowRepeated;
+}
+
+bool Participant::requiresWritingCheckpoint() {
+  return _impl->config.iterations > 1 && _impl->windowStart &&
+         isCouplingOngoing();
+}
+
+bool Participant::requiresMeshConnectivityFor(
+    precice::string_view meshName) const {
+  return false;
+}
+
+bool Participant::requiresGradientDataFor(precice::string_view meshName,
+                                          precice::string_view dataName) const {
+  return false;
+}
+
+int Participant::setMeshVertex(precice::string_view meshName,
+                               precice::span<const double> position) {
+  auto &coordinates = _impl->coordinates[str(meshName)];
+  coordinates.insert(coordinates.end(), position.begin(), position.end());
+  return getMeshVertexSize(meshName) - 1;
+}
+
+int Participant::getMeshVertexSize(precice::string_view meshName) const {
+  const auto it = _impl->coordinates.find(str(meshName));
+  return it == _impl->coordinates.end()
+             ? 0
+             : it->second.size() / getMeshDimensions(meshName);
+}
+
+void Participant::setMeshVertices(precice::string_view meshName,
+                                  precice::span<const double> positions,
+                                  precice::span<precice::VertexID> ids) {
+  const int first = getMeshVertexSize(meshName);
+  auto &coordinates = _impl->coordinates[str(meshName)];
+  coordinates.insert(coordinates.end(), positions.begin(), positions.end());
+  for (std::size_t i = 0; i < ids.size(); i++) {
+    ids[i] = first + i;
+  }
+}
+
+void Participant::setMeshEdge(precice::string_view meshName, int firstVertexID,
+                              int secondVertexID) {}
+
+void Participant::setMeshEdges(
+    precice::string_view meshName,
+    precice::span<const precice::VertexID> vertices) {}
+
+void Participant::setMeshTriangle(precice::string_view meshName,
+                                  int firstVertexID, int secondVertexID,
+                                  int thirdVertexID) {}
+
+void Participant::setMeshTriangles(
+    precice::string_view meshName,
+    precice::span<const precice::VertexID> vertices) {}
+
+void Participant::setMeshQuad(precice::string_view meshName, int firstVertexID,
+                              int secondVertexID, int thirdVertexID,
+                              int fourthVertexID) {}
+
+void Participant::setMeshQuads(
+    precice::string_view meshName,
+    precice::span<const precice::VertexID> vertices) {}
+
+void Participant::setMeshTetrahedron(precice::string_view meshName,
+                                     int firstVertexID, int secondVertexID,
+                                     int thirdVertexID, int fourthVertexID) {}
+
+void Participant::setMeshTetrahedra(
+    precice::string_view meshName,
+    precice::span<const precice::VertexID> vertices) {}
+
+void Participant::resetMesh(precice::string_view meshName) {
+  _impl->coordinates.erase(str(meshName));
+}
+
+void Participant::writeData(precice::string_view meshName,
+                            precice::string_view dataName,
+                            precice::span<const precice::VertexID> vertices,
+                            precice::span<const double> values) {
+  _impl->write(str(meshName), str(dataName), vertices, values);
+}
+
+void Participant::readData(precice::string_view meshName,
+                           precice::string_view dataName,
+                           precice::span<const precice::VertexID> vertices,
+                           double relativeReadTime,
+                           precice::span<double> values) const {
+  _impl->read(str(meshName), str(dataName), vertices, values);
+}
+
+void Participant::writeAndMapData(precice::string_view meshName,
+                                  precice::string_view dataName,
+                                  precice::span<const double> coordinates,
+                                  precice::span<const double> values) {
+  const auto vertices = _impl->indices(coordinates.size() /
+                                       getMeshDimensions(meshName));
+  _impl->write(str(meshName), str(dataName), vertices, values);
+}
+
+void Participant::mapAndReadData(precice::string_view meshName,
+                                 precice::string_view dataName,
+                                 precice::span<const double> coordinates,
+                                 double relativeReadTime,
+                                 precice::span<double> values) const {
+  const auto vertices = _impl->indices(coordinates.size() /
+                                       getMeshDimensions(meshName));
+  _impl->read(str(meshName), str(dataName), vertices, values);
+}
+
+void Participant::setMeshAccessRegion(
+    precice::string_view meshName,
+    precice::span<const double> boundingBox) const {}
+
+void Participant::getMeshVertexIDsAndCoordinates(
+    precice::string_view meshName, precice::span<int> valueIndices,
+    precice::span<double> coordinates) const {
+  const auto it = _impl->coordinates.find(str(meshName));
+  if (it == _impl->coordinates.end()) {
+    return;
+  }
+  for (std::size_t i = 0; i < valueIndices.size(); i++) {
+    valueIndices[i] = i;
+  }
+  std::copy(it->second.begin(),
+            it->second.begin() + std::min(coordinates.size(), it->second.size()),
+            coordinates.begin());
+}
+
+void Participant::writeGradientData(
+    precice::string_view meshName, precice::string_view dataName,
+    precice::span<const precice::VertexID> vertices,
+    precice::span<const double> gradients) {}
+
+void Participant::startProfilingSection(precice::string_view sectionName) {}
+
+void Participant::stopLastProfilingSection() {}
+
+std::string getVersionInformation() { return "loopback"; }
+
+} // namespace precice
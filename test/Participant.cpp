@@ -127,10 +127,9 @@ int Participant::getMeshVertexSize(precice::string_view meshName) const {
 void Participant::setMeshVertices(precice::string_view meshName,
                                   precice::span<const double> positions,
                                   precice::span<precice::VertexID> ids) {
-  if (ids.size() > 0) {
-    assert(ids.size() == fake_ids.size());
-    std::copy(fake_ids.begin(), fake_ids.end(), ids.data());
-  }
+  // vertices of each call are numbered from zero, such that meshes of any size
+  // can be set, e.g. for benchmarks
+  std::iota(ids.begin(), ids.end(), 0);
 }
 
 void Participant::setMeshEdge(precice::string_view meshName, int firstVertexID,
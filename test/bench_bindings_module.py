@@ -0,0 +1,259 @@
+"""
+Benchmarks of the per-call overhead of the bindings, run against the mocked
+preCICE in test/Participant.cpp. The mock only copies data, hence the measured
+time is dominated by argument conversion and checks in the bindings.
+
+Run with
+
+    $ tox -e benchmark
+
+or, with a mocked build installed, with
+
+    $ pytest test/bench_bindings_module.py -o python_files="bench_*.py"
+
+Use "-k" to select a subset, e.g. -k "read_data and ndarray".
+Results can be stored and compared between versions via pytest-benchmark's
+--benchmark-autosave and --benchmark-compare options. The memory needed by
+one call is reported in the extra_info of each benchmark: "peak_rss" is the
+increase of the peak resident set size of a forked process during the call,
+which includes the copies made in C++ by the bindings and the mock, and
+"peak_memory" is the peak of the memory allocated in Python, as traced by
+tracemalloc, which misses allocations in C++. peak_rss requires Linux and is
+omitted elsewhere.
+"""
+
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import precice
+
+MESH = "FakeMesh"  # compare to test/Participant.cpp, fake_mesh_name
+MESH_DIMENSIONS = 3  # compare to test/Participant.cpp, fake_mesh_dimensions
+DATA = {
+    "scalar": ("FakeScalarData", 1),  # compare to test/Participant.cpp
+    "vector": ("FakeVectorData", 3),
+}
+SIZES = [10, 10**3, 10**5, 10**7]
+INPUTS = ["ndarray", "list", "non-contiguous"]
+
+
+def make_input(array, kind):
+    """
+    Returns array as the given kind of input: the C-contiguous array itself,
+    nested lists or a non-contiguous view with the same values.
+    """
+    if kind == "ndarray":
+        return array
+    if kind == "list":
+        return array.tolist()
+    strided = np.empty(array.shape + (2,), dtype=array.dtype)
+    strided[..., 0] = array
+    return strided[..., 0]
+
+
+def measure_peak_rss(func, *args, **kwargs):
+    """
+    Returns the increase of the peak resident set size in bytes during one call
+    of func, measured in a forked process whose peak is reset before the call,
+    or None if this is not supported.
+    """
+    if not os.path.exists("/proc/self/clear_refs"):
+        return None
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        peak = -1
+        try:
+            with open("/proc/self/clear_refs", "w") as file:
+                file.write("5")  # resets the peak resident set size
+            before = read_status("VmRSS")
+            func(*args, **kwargs)
+            peak = read_status("VmHWM") - before
+        finally:
+            os.write(write_end, str(peak).encode())
+            os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end) as pipe:
+        peak = int(pipe.read())
+    os.waitpid(pid, 0)
+    return peak if peak >= 0 else None
+
+
+def read_status(field):
+    """
+    Returns the given memory field of /proc/self/status in bytes.
+    """
+    with open("/proc/self/status") as file:
+        for line in file:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+
+
+def run(benchmark, func, *args, **kwargs):
+    """
+    Benchmarks func and records the peak memory needed by one call.
+    """
+    peak_rss = measure_peak_rss(func, *args, **kwargs)
+    if peak_rss is not None:
+        benchmark.extra_info["peak_rss"] = peak_rss
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    benchmark.extra_info["peak_memory"] = peak
+    return benchmark(func, *args, **kwargs)
+
+
+@pytest.fixture
+def participant():
+    return precice.Participant("test", "dummy.xml", 0, 1)
+
+
+def skip_large_lists(size, kind):
+    if kind == "list" and size > 10**5:
+        pytest.skip("converting lists of more than 10^5 vertices takes minutes")
+
+
+@pytest.mark.parametrize("kind", INPUTS)
+@pytest.mark.parametrize("size", SIZES)
+def test_set_mesh_vertices(benchmark, participant, size, kind):
+    skip_large_lists(size, kind)
+    positions = make_input(np.random.rand(size, MESH_DIMENSIONS), kind)
+    run(benchmark, participant.set_mesh_vertices, MESH, positions)
+
+
+@pytest.mark.parametrize("kind", INPUTS)
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_write_data(benchmark, participant, data, size, kind):
+    skip_large_lists(size, kind)
+    data_name, dimensions = DATA[data]
+    shape = (size,) if dimensions == 1 else (size, dimensions)
+    vertex_ids = make_input(np.arange(size, dtype=np.int32), kind)
+    values = make_input(np.random.rand(*shape), kind)
+    run(benchmark, participant.write_data, MESH, data_name, vertex_ids, values)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_write_data_single_precision(benchmark, participant, data, size):
+    data_name, dimensions = DATA[data]
+    shape = (size,) if dimensions == 1 else (size, dimensions)
+    vertex_ids = np.arange(size, dtype=np.int32)
+    values = np.random.rand(*shape).astype(np.single)
+    run(benchmark, participant.write_data, MESH, data_name, vertex_ids, values)
+
+
+@pytest.mark.parametrize("kind", INPUTS)
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_read_data(benchmark, participant, data, size, kind):
+    skip_large_lists(size, kind)
+    data_name, dimensions = DATA[data]
+    # the mock reads back the data written last
+    participant.write_data(
+        MESH, data_name, np.arange(size), np.random.rand(size, dimensions).squeeze()
+    )
+    vertex_ids = make_input(np.arange(size, dtype=np.int32), kind)
+    run(benchmark, participant.read_data, MESH, data_name, vertex_ids, 1.0)
+
+
+@pytest.mark.parametrize("dtype", [np.double, np.single])
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_read_data_out(benchmark, participant, data, size, dtype):
+    data_name, dimensions = DATA[data]
+    participant.write_data(
+        MESH, data_name, np.arange(size), np.random.rand(size, dimensions).squeeze()
+    )
+    vertex_ids = np.arange(size, dtype=np.int32)
+    out = np.empty(size * dimensions, dtype=dtype)
+    run(benchmark, participant.read_data, MESH, data_name, vertex_ids, 1.0, out=out)
+
+
+@pytest.mark.parametrize("kind", INPUTS)
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_map_and_read_data(benchmark, participant, data, size, kind):
+    skip_large_lists(size, kind)
+    data_name, dimensions = DATA[data]
+    # the mock copies the data written last, which has to match the size read
+    participant.write_data(
+        MESH, data_name, np.arange(size), np.random.rand(size, dimensions).squeeze()
+    )
+    coordinates = make_input(np.random.rand(size, MESH_DIMENSIONS), kind)
+    run(benchmark, participant.map_and_read_data, MESH, data_name, coordinates, 1.0)
+
+
+@pytest.mark.parametrize("kind", INPUTS)
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_write_gradient_data(benchmark, participant, data, size, kind):
+    skip_large_lists(size, kind)
+    data_name, dimensions = DATA[data]
+    vertex_ids = make_input(np.arange(size, dtype=np.int32), kind)
+    gradients = make_input(np.random.rand(size, MESH_DIMENSIONS * dimensions), kind)
+    run(
+        benchmark,
+        participant.write_gradient_data,
+        MESH,
+        data_name,
+        vertex_ids,
+        gradients,
+    )
+
+
+def test_get_mesh_vertex_ids_and_coordinates(benchmark, participant):
+    # the mock always returns its 3 fake vertices, hence only the fixed cost is measured
+    run(benchmark, participant.get_mesh_vertex_ids_and_coordinates, MESH)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_vertex_set_write_from(benchmark, participant, data, size):
+    data_name, dimensions = DATA[data]
+    # every second node of the solver is a vertex
+    field = np.random.rand(2 * size, dimensions).squeeze()
+    vertex_set = precice.VertexSet(
+        participant, MESH, np.arange(size), np.arange(0, 2 * size, 2)
+    )
+    run(benchmark, vertex_set.write_from, data_name, field)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_unchecked_write_data(benchmark, participant, data, size):
+    data_name, dimensions = DATA[data]
+    vertex_ids = np.arange(size, dtype=np.int32)
+    values = np.random.rand(size * dimensions)
+    run(
+        benchmark,
+        participant.unchecked.write_data,
+        MESH.encode(),
+        data_name.encode(),
+        vertex_ids,
+        values,
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("data", DATA)
+def test_unchecked_read_data(benchmark, participant, data, size):
+    data_name, dimensions = DATA[data]
+    participant.write_data(
+        MESH, data_name, np.arange(size), np.random.rand(size, dimensions).squeeze()
+    )
+    vertex_ids = np.arange(size, dtype=np.int32)
+    out = np.empty(size * dimensions)
+    run(
+        benchmark,
+        participant.unchecked.read_data,
+        MESH.encode(),
+        data_name.encode(),
+        vertex_ids,
+        1.0,
+        out,
+    )
@@ -1,5 +1,15 @@
 import precice
 from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import ctypes
+import gc
+import json
+import os
+import subprocess
+import sys
+import sysconfig
+import tempfile
 import numpy as np
 from mpi4py import MPI
 
@@ -17,9 +27,31 @@ class TestBindings(TestCase):
         participant = precice.Participant("test", "dummy.xml", 0, 1, MPI.COMM_WORLD)
         self.assertTrue(True)
 
+    def test_constructor_custom_mpi_comm_address(self):
+        participant = precice.Participant(
+            "test", "dummy.xml", 0, 1, MPI._addressof(MPI.COMM_WORLD)
+        )
+        self.assertTrue(True)
+
     def test_version(self):
         precice.__version__
 
+    def test_import_time(self):
+        import_time_budget = 2.0  # seconds, generous to avoid flaky CI runners
+        script = (
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            "import precice\n"
+            "print(time.perf_counter() - start)\n"
+            "print('mpi4py.MPI' in sys.modules)\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout.split()
+        self.assertLess(float(output[0]), import_time_budget)
+        # importing mpi4py.MPI initializes MPI and must only happen if a communicator is given
+        self.assertEqual(output[1], "False")
+
     def test_get_mesh_dimensions(self):
         participant = precice.Participant("test", "dummy.xml", 0, 1)
         # TODO: it would be nice to be able to mock the output of the interface
@@ -153,6 +185,39 @@ class TestBindings(TestCase):
         actual_output = participant.set_mesh_vertices(fake_mesh_name, positions)
         self.assertTrue(np.array_equal(expected_output, actual_output))
 
+    def test_set_mesh_vertices_memmap(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        fake_mesh_name = (
+            "FakeMesh"  # compare to test/SolverInterface.cpp, fake_mesh_name
+        )
+        fake_dimension = 3  # compare to test/SolverInterface.cpp, fake_dimensions
+        n_fake_vertices = 3  # compare to test/SolverInterface.cpp, n_fake_vertices
+        with tempfile.TemporaryDirectory() as tmp:
+            positions_file = os.path.join(tmp, "positions.npy")
+            ids_file = os.path.join(tmp, "ids.npy")
+            np.save(positions_file, np.random.rand(n_fake_vertices, fake_dimension))
+            actual_output = participant.set_mesh_vertices(
+                fake_mesh_name, positions_file, out=ids_file, chunk_size=n_fake_vertices
+            )
+            expected_output = np.array(range(n_fake_vertices))
+            self.assertIsInstance(actual_output, np.memmap)
+            self.assertTrue(np.array_equal(expected_output, actual_output))
+            self.assertTrue(np.array_equal(expected_output, np.load(ids_file)))
+            del actual_output
+
+    def test_set_mesh_vertices_out(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        positions = np.random.rand(3, 3)
+        out = np.zeros(3, np.int32)
+        self.assertIs(
+            participant.set_mesh_vertices("FakeMesh", positions, out=out), out
+        )
+        self.assertTrue(np.array_equal(out, range(3)))
+        with self.assertRaises(AssertionError):
+            participant.set_mesh_vertices(
+                "FakeMesh", positions, out=np.zeros((3, 1), np.int32)
+            )
+
     def test_set_mesh_vertex(self):
         participant = precice.Participant("test", "dummy.xml", 0, 1)
         fake_mesh_name = (
@@ -388,6 +453,478 @@ class TestBindings(TestCase):
         read_data = participant.read_data("FakeMesh", "FakeVectorData", [0], dt)
         self.assertTrue(np.array_equal(write_data, read_data))
 
+    def test_read_write_block_vector_data_read_only(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([[3, 7, 8], [7, 6, 5]], dtype=np.double)
+        write_data.setflags(write=False)
+        vertex_ids = np.array([0, 1], dtype=np.int32)
+        vertex_ids.setflags(write=False)
+        participant.write_data("FakeMesh", "FakeVectorData", vertex_ids, write_data)
+        dt = 1
+        read_data = participant.read_data("FakeMesh", "FakeVectorData", vertex_ids, dt)
+        self.assertTrue(np.array_equal(write_data, read_data))
+
+    def test_read_write_block_scalar_data_buffer_protocol(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([3, 7, 8], dtype=np.double)
+        vertex_ids = np.array([0, 1, 2], dtype=np.int32)
+        participant.write_data(
+            "FakeMesh", "FakeScalarData", memoryview(vertex_ids), memoryview(write_data)
+        )
+        dt = 1
+        read_data = participant.read_data("FakeMesh", "FakeScalarData", vertex_ids, dt)
+        self.assertTrue(np.array_equal(write_data, read_data))
+
+    def test_read_write_block_vector_data_out(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([[3, 7, 8], [7, 6, 5]], dtype=np.double)
+        participant.write_data(
+            "FakeMesh", "FakeVectorData", np.array([0, 1]), write_data
+        )
+        dt = 1
+        out = np.zeros((2, 3))
+        read_data = participant.read_data(
+            "FakeMesh", "FakeVectorData", np.array([0, 1]), dt, out=out
+        )
+        self.assertIs(read_data, out)
+        self.assertTrue(np.array_equal(write_data, out))
+
+    def test_read_write_single_precision_data(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([[3.5, 7, 8], [7, 6, 5.25]], dtype=np.float32)
+        participant.write_data(
+            "FakeMesh", "FakeVectorData", np.array([0, 1]), write_data
+        )
+        dt = 1
+        read_data = participant.read_data(
+            "FakeMesh", "FakeVectorData", np.array([0, 1]), dt
+        )
+        self.assertEqual(read_data.dtype, np.double)
+        self.assertTrue(np.array_equal(write_data, read_data))
+        out = np.zeros((2, 3), dtype=np.float32)
+        read_data = participant.read_data(
+            "FakeMesh", "FakeVectorData", np.array([0, 1]), dt, out=out
+        )
+        self.assertIs(read_data, out)
+        self.assertTrue(np.array_equal(write_data, out))
+
+    def test_read_single_precision_data_handle(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        data = participant.mesh("FakeMesh").data("FakeScalarData", cache=True)
+        data.write([0, 1, 2], np.array([1, 2, 3], dtype=np.float32))
+        out = np.zeros(3, dtype=np.float32)
+        self.assertIs(data.read([0, 1, 2], 1, out=out), out)
+        self.assertTrue(np.array_equal(out, [1, 2, 3]))
+
+    def test_jit_mapping_single_precision(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([1.5, 2, 3.25], dtype=np.float32)
+        participant.write_and_map_data(
+            "FakeMesh", "FakeScalarData", [0, 1, 2], write_data
+        )
+        out = np.zeros(3, dtype=np.float32)
+        read_data = participant.map_and_read_data(
+            "FakeMesh", "FakeScalarData", [0, 1, 2], 1, out=out
+        )
+        self.assertIs(read_data, out)
+        self.assertTrue(np.array_equal(write_data, out))
+
+    def test_read_data_at_times_single_precision(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([[3.5, 7, 8], [7, 6, 5.25]], dtype=np.float32)
+        participant.write_data("FakeMesh", "FakeVectorData", [0, 1], write_data)
+        out = np.zeros((2, 2, 3), dtype=np.float32)
+        read_data = participant.read_data_at_times(
+            "FakeMesh", "FakeVectorData", [0, 1], [0.5, 1.0], out=out
+        )
+        self.assertIs(read_data, out)
+        self.assertTrue(np.array_equal(out, [write_data, write_data]))
+
+    def test_read_data_out_invalid(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        dt = 1
+        with self.assertRaises(TypeError):
+            participant.read_data(
+                "FakeMesh", "FakeScalarData", [0, 1, 2], dt, out=np.zeros(3, np.int32)
+            )
+        with self.assertRaises(TypeError):
+            participant.read_data(
+                "FakeMesh", "FakeScalarData", [0, 1, 2], dt, out=np.zeros(6)[::2]
+            )
+        with self.assertRaises(AssertionError):
+            participant.read_data(
+                "FakeMesh", "FakeScalarData", [0, 1, 2], dt, out=np.zeros(2)
+            )
+
+    def test_read_write_data_handle(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        mesh = participant.mesh("FakeMesh")
+        self.assertEqual(mesh.dimensions, 3)  # compare to test/Participant.cpp
+        data = mesh.data("FakeVectorData")
+        self.assertEqual(data.dimensions, 3)  # compare to test/Participant.cpp
+        self.assertFalse(data.requires_gradient)
+        write_data = np.array([[3, 7, 8], [7, 6, 5]], dtype=np.double)
+        data.write(np.array([0, 1]), write_data)
+        dt = 1
+        read_data = data.read(np.array([0, 1]), dt)
+        self.assertTrue(np.array_equal(write_data, read_data))
+
+    def test_read_data_at_times(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([[3, 7, 8], [7, 6, 5]], dtype=np.double)
+        participant.write_data("FakeMesh", "FakeVectorData", [0, 1], write_data)
+        times = [0.25, 0.5, 1.0]
+        read_data = participant.read_data_at_times(
+            "FakeMesh", "FakeVectorData", [0, 1], times
+        )
+        self.assertEqual(read_data.shape, (3, 2, 3))
+        for values in read_data:
+            self.assertTrue(np.array_equal(write_data, values))
+
+    def test_read_data_at_times_scalar_out(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([1, 2, 3], dtype=np.double)
+        participant.write_data("FakeMesh", "FakeScalarData", [0, 1, 2], write_data)
+        out = np.empty((2, 3))
+        data = participant.mesh("FakeMesh").data("FakeScalarData")
+        read_data = data.read_at_times([0, 1, 2], [0.5, 1.0], out=out)
+        self.assertIs(read_data, out)
+        self.assertTrue(np.array_equal(out, [write_data, write_data]))
+        with self.assertRaises(AssertionError):
+            data.read_at_times([0, 1, 2], [0.5, 1.0], out=np.empty(3))
+
+    def test_read_data_handle_cache(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        data = participant.mesh("FakeMesh").data("FakeScalarData", cache=True)
+        data.write([0, 1, 2], np.array([1, 2, 3], dtype=np.double))
+        dt = 1
+        read_data = data.read([0, 1, 2], dt)
+        self.assertTrue(np.array_equal(read_data, [1, 2, 3]))
+        # the mock returns written data directly, cached values are kept until advance
+        data.write([0, 1, 2], np.array([4, 5, 6], dtype=np.double))
+        read_data[:] = 0
+        self.assertTrue(np.array_equal(data.read([0, 1, 2], dt), [1, 2, 3]))
+        participant.advance(dt)
+        out = np.empty(3)
+        self.assertIs(data.read([0, 1, 2], dt, out=out), out)
+        self.assertTrue(np.array_equal(out, [4, 5, 6]))
+
+    def test_write_gradient_data_handle(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        data = participant.mesh("FakeMesh").data("FakeScalarData")
+        write_data = np.array([[0, 1, 2], [6, 7, 8], [9, 10, 11]], dtype=np.double)
+        data.write_gradient(np.array([0, 1, 2]), write_data)
+        dt = 1
+        read_data = data.read(np.array(range(9)), dt)
+        self.assertTrue(np.array_equal(write_data.flatten(), read_data))
+
+    def test_exchange_plan(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        plan = precice.ExchangePlan(participant)
+        forces = np.array([[3, 7, 8], [7, 6, 5]], dtype=np.double)
+        displacements = np.zeros((2, 3))
+        plan.add_write("FakeMesh", "FakeVectorData", [0, 1], forces)
+        plan.add_read("FakeMesh", "FakeVectorData", [0, 1], displacements)
+        self.assertEqual(len(plan), 2)
+        plan.execute_writes()
+        dt = 1
+        plan.execute_reads(dt)
+        self.assertTrue(np.array_equal(forces, displacements))
+        # buffers are used in place
+        forces *= 2
+        plan.execute_writes()
+        plan.execute_reads(dt)
+        self.assertTrue(np.array_equal(forces, displacements))
+
+    def test_exchange_plan_invalid(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        plan = precice.ExchangePlan(participant)
+        with self.assertRaises(TypeError):
+            plan.add_read("FakeMesh", "FakeVectorData", [0, 1], [[0, 0, 0], [0, 0, 0]])
+        with self.assertRaises(TypeError):
+            plan.add_write(
+                "FakeMesh", "FakeVectorData", [0, 1], np.zeros((2, 3), np.float32)
+            )
+        with self.assertRaises(AssertionError):
+            plan.add_read("FakeMesh", "FakeScalarData", [0, 1], np.zeros((2, 3)))
+        self.assertEqual(len(plan), 0)
+        with self.assertRaises(TypeError):
+            precice.ExchangePlan(object())
+
+    def test_unchecked(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        raw = participant.unchecked
+        ids = np.empty(3, dtype=np.int32)
+        raw.set_mesh_vertices(b"FakeMesh", np.random.rand(9), ids)
+        self.assertTrue(np.array_equal(ids, [0, 1, 2]))
+        values = np.random.rand(9)
+        raw.write_data(b"FakeMesh", b"FakeVectorData", ids, values)
+        out = np.zeros(9)
+        raw.read_data(b"FakeMesh", b"FakeVectorData", ids, 1, out)
+        self.assertTrue(np.array_equal(out, values))
+        raw.write_and_map_data(
+            b"FakeMesh", b"FakeVectorData", np.random.rand(9), values
+        )
+        out = np.zeros(9)
+        raw.map_and_read_data(b"FakeMesh", b"FakeVectorData", np.random.rand(9), 1, out)
+        self.assertTrue(np.array_equal(out, values))
+
+    def test_unchecked_invalid(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        raw = participant.unchecked
+        ids = np.arange(3, dtype=np.int32)
+        with self.assertRaises(ValueError):
+            raw.write_data(b"FakeMesh", b"FakeVectorData", ids, np.zeros((3, 3)))
+        with self.assertRaises(ValueError):
+            raw.write_data(b"FakeMesh", b"FakeVectorData", ids, np.zeros(18)[::2])
+        with self.assertRaises(ValueError):
+            raw.write_data(
+                b"FakeMesh", b"FakeVectorData", ids.astype(np.int64), np.zeros(9)
+            )
+        with self.assertRaises(TypeError):
+            raw.write_data("FakeMesh", "FakeVectorData", ids, np.zeros(9))
+
+    def test_steps(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        plan = precice.ExchangePlan(participant)
+        # the mock is never coupling
+        self.assertEqual(list(participant.steps(plan)), [])
+        with self.assertRaises(TypeError):
+            next(participant.steps("plan"))
+        with self.assertRaises(TypeError):
+            next(participant.steps(plan, checkpoint=[]))
+
+    def test_record_replay(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        participant.enable_recording(directory.name)
+        vertex_ids = participant.set_mesh_vertices("FakeMesh", np.random.rand(3, 3))
+        participant.initialize()
+        forces = np.random.rand(3, 3)
+        participant.write_data("FakeMesh", "FakeVectorData", vertex_ids, forces)
+        recorded = participant.read_data("FakeMesh", "FakeVectorData", vertex_ids, 1)
+        participant.advance(1)
+        participant.finalize()
+
+        replay = precice.ReplayParticipant(directory.name)
+        self.assertEqual(len(replay), 2)
+        self.assertEqual(replay.get_mesh_dimensions("FakeMesh"), 3)
+        self.assertEqual(replay.get_data_dimensions("FakeMesh", "FakeVectorData"), 3)
+        replay_ids = replay.set_mesh_vertices("FakeMesh", np.random.rand(3, 3))
+        self.assertTrue(np.array_equal(replay_ids, vertex_ids))
+        replay.initialize()
+        # the mock is never coupling
+        self.assertFalse(replay.is_coupling_ongoing())
+        replay.write_data("FakeMesh", "FakeVectorData", replay_ids, forces)
+        with self.assertRaises(AssertionError):
+            replay.write_data("FakeMesh", "FakeVectorData", replay_ids, forces[:2])
+        read_data = replay.read_data("FakeMesh", "FakeVectorData", replay_ids, 1)
+        self.assertTrue(np.array_equal(read_data, recorded))
+        out = np.zeros((3, 3))
+        replay.read_data("FakeMesh", "FakeVectorData", replay_ids, 1, out=out)
+        self.assertTrue(np.array_equal(out, recorded))
+        replay.advance(1)
+        with self.assertRaises(AssertionError):
+            replay.read_data("FakeMesh", "FakeVectorData", replay_ids, 1)
+        with self.assertRaises(AssertionError):
+            replay.advance(1)
+
+    def test_record_replay_mesh_access(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        positions = os.path.join(directory.name, "positions.npy")
+        np.save(positions, np.random.rand(3, 3))
+        trace = os.path.join(directory.name, "trace")
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        participant.enable_recording(trace)
+        vertex_id = participant.set_mesh_vertex("FakeMesh", [1, 2, 3])
+        vertex_ids = participant.set_mesh_vertices(
+            "FakeMesh", positions, out=np.empty(3, np.int32), chunk_size=2
+        )
+        participant.initialize()
+        ids, coordinates = participant.get_mesh_vertex_ids_and_coordinates("FakeMesh")
+        values = np.random.rand(3)
+        participant.write_data("FakeMesh", "FakeScalarData", vertex_ids, values)
+        mapped = participant.map_and_read_data(
+            "FakeMesh", "FakeScalarData", coordinates, 1
+        )
+        at_times = participant.read_data_at_times(
+            "FakeMesh", "FakeScalarData", vertex_ids, [0.5, 1]
+        )
+        participant.finalize()
+
+        replay = precice.ReplayParticipant(trace)
+        self.assertEqual(replay.set_mesh_vertex("FakeMesh", [1, 2, 3]), vertex_id)
+        out = np.empty(3, np.int32)
+        self.assertIs(
+            replay.set_mesh_vertices("FakeMesh", positions, out=out, chunk_size=2), out
+        )
+        self.assertTrue(np.array_equal(out, vertex_ids))
+        self.assertEqual(replay.get_mesh_vertex_size("FakeMesh"), 3)
+        replay.set_mesh_connectivity("FakeMesh", triangles=[[0, 1, 2]])
+        with self.assertRaises(AssertionError):
+            replay.set_mesh_edges("FakeMesh", [[0, 1, 2]])
+        with replay.profile("solve"):
+            replay.initialize()
+        replay_ids, replay_coordinates = replay.get_mesh_vertex_ids_and_coordinates(
+            "FakeMesh"
+        )
+        self.assertTrue(np.array_equal(replay_ids, ids))
+        self.assertTrue(np.array_equal(replay_coordinates, coordinates))
+        self.assertTrue(
+            np.array_equal(
+                replay.map_and_read_data("FakeMesh", "FakeScalarData", coordinates, 1),
+                mapped,
+            )
+        )
+        data = replay.mesh("FakeMesh").data("FakeScalarData")
+        self.assertTrue(
+            np.array_equal(data.read_at_times(vertex_ids, [0.5, 1]), at_times)
+        )
+        replay.write_and_map_data("FakeMesh", "FakeScalarData", coordinates, values)
+        replay.write_gradient_data(
+            "FakeMesh", "FakeScalarData", vertex_ids, np.zeros((3, 3))
+        )
+        with self.assertRaises(AssertionError):
+            data.write_gradient(vertex_ids, np.zeros((3, 2)))
+        replay.finalize()
+
+    def test_vertex_set(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        boundary = precice.VertexSet(participant, "FakeMesh", [0, 1, 2], [4, 0, 2])
+        self.assertEqual(len(boundary), 3)
+        force = np.arange(15, dtype=np.double).reshape(5, 3)
+        boundary.write_from("FakeVectorData", force)
+        displacement = np.zeros((5, 3))
+        self.assertIs(
+            boundary.read_into("FakeVectorData", 1, displacement), displacement
+        )
+        self.assertTrue(np.array_equal(displacement[[4, 0, 2]], force[[4, 0, 2]]))
+        self.assertTrue(np.array_equal(displacement[[1, 3]], np.zeros((2, 3))))
+        read_data = participant.read_data("FakeMesh", "FakeVectorData", [0, 1, 2], 1)
+        self.assertTrue(np.array_equal(read_data, force[[4, 0, 2]]))
+        # without indices, the fields contain only the vertices
+        boundary = precice.VertexSet(participant, "FakeMesh", [0, 1, 2])
+        temperature = np.array([1, 2, 3], dtype=np.double)
+        boundary.write_from("FakeScalarData", temperature)
+        out = np.zeros(3)
+        boundary.read_into("FakeScalarData", 1, out)
+        self.assertTrue(np.array_equal(out, temperature))
+
+    def test_vertex_set_invalid(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        with self.assertRaises(AssertionError):
+            precice.VertexSet(participant, "FakeMesh", [0, 1, 2], [0, 1])
+        with self.assertRaises(AssertionError):
+            precice.VertexSet(participant, "FakeMesh", [0, 1, 2], [0, -1, 2])
+        boundary = precice.VertexSet(participant, "FakeMesh", [0, 1, 2], [4, 0, 2])
+        with self.assertRaises(TypeError):
+            boundary.write_from("FakeScalarData", [0, 1, 2, 3, 4])
+        with self.assertRaises(AssertionError):
+            boundary.write_from("FakeScalarData", np.zeros(4))
+        with self.assertRaises(AssertionError):
+            boundary.read_into("FakeVectorData", 1, np.zeros(5))
+
+    def test_jit_writer_reader(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        coordinates = np.random.rand(5, 3)
+        values = np.random.rand(5, 3)
+        writer = precice.JustInTimeWriter(participant, "FakeMesh", "FakeVectorData")
+        writer.add(coordinates[0], values[0])
+        writer.add(coordinates[1:], values[1:])
+        self.assertEqual(len(writer), 5)
+        writer.flush()
+        self.assertEqual(len(writer), 0)
+        reader = precice.JustInTimeReader(participant, "FakeMesh", "FakeVectorData")
+        self.assertEqual(reader.add(coordinates[:2]), slice(0, 2))
+        self.assertEqual(reader.add(coordinates[2:]), slice(2, 5))
+        dt = 1
+        self.assertTrue(np.array_equal(reader.read(dt), values))
+        out = np.empty((5, 3))
+        self.assertIs(reader.read(dt, out=out), out)
+        self.assertTrue(np.array_equal(out, values))
+
+    def test_jit_writer_failed_flush(self):
+        class FailingParticipant(precice.Participant):
+            failures = 1
+
+            def write_and_map_data(self, *args):
+                if self.failures > 0:
+                    self.failures -= 1
+                    raise RuntimeError("write failed")
+                return super().write_and_map_data(*args)
+
+        participant = FailingParticipant("test", "dummy.xml", 0, 1)
+        values = np.random.rand(5, 3)
+        writer = precice.JustInTimeWriter(participant, "FakeMesh", "FakeVectorData")
+        writer.add(np.random.rand(5, 3), values)
+        with self.assertRaises(RuntimeError):
+            writer.flush()
+        # the points are kept for the next flush
+        self.assertEqual(len(writer), 5)
+        writer.flush()
+        self.assertEqual(len(writer), 0)
+
+    def test_jit_writer_reader_sorted(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        coordinates = np.random.rand(100, 3)
+        values = np.random.rand(100)
+        writer = precice.JustInTimeWriter(
+            participant, "FakeMesh", "FakeScalarData", sort=True
+        )
+        for point, value in zip(coordinates, values):
+            writer.add(point, value)
+        writer.flush()
+        # the mock keeps the values in the order they were passed to preCICE
+        written = participant.map_and_read_data(
+            "FakeMesh", "FakeScalarData", coordinates, 1
+        )
+        self.assertFalse(np.array_equal(written, values))
+        self.assertTrue(np.array_equal(np.sort(written), np.sort(values)))
+        reader = precice.JustInTimeReader(
+            participant, "FakeMesh", "FakeScalarData", sort=True
+        )
+        reader.add(coordinates)
+        self.assertTrue(np.array_equal(reader.read(1), values))
+
+    def test_checkpoint(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        checkpoint = precice.Checkpoint(participant)
+        u = checkpoint.register(np.array([[1, 2, 3], [4, 5, 6]], dtype=np.double))
+        ids = checkpoint.register(np.array([0, 1], dtype=np.int32))
+        self.assertEqual(len(checkpoint), 2)
+        self.assertEqual(checkpoint.save(), u.nbytes + ids.nbytes)
+        u += 1
+        ids[:] = 7
+        checkpoint.restore()
+        self.assertTrue(np.array_equal(u, [[1, 2, 3], [4, 5, 6]]))
+        self.assertTrue(np.array_equal(ids, [0, 1]))
+        self.assertEqual(checkpoint.bytes_copied, 2 * (u.nbytes + ids.nbytes))
+        # mocked participant neither requires writing nor reading a checkpoint, compare to test/Participant.cpp
+        self.assertFalse(checkpoint.sync())
+
+    def test_checkpoint_skip_unchanged(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        checkpoint = precice.Checkpoint(participant, skip_unchanged=True)
+        u = checkpoint.register(np.zeros(4))
+        v = checkpoint.register(np.zeros(8))
+        self.assertEqual(checkpoint.save(), u.nbytes + v.nbytes)
+        v[0] = 1
+        self.assertEqual(checkpoint.restore(), v.nbytes)
+        self.assertEqual(v[0], 0)
+        self.assertEqual(checkpoint.save(), 0)
+
+    def test_checkpoint_invalid(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        checkpoint = precice.Checkpoint(participant)
+        with self.assertRaises(TypeError):
+            checkpoint.register([1.0, 2.0])
+        with self.assertRaises(TypeError):
+            checkpoint.register(np.zeros(6)[::2])
+        with self.assertRaises(AssertionError):
+            checkpoint.restore()
+
     def test_jit_mapping(self):
         participant = precice.Participant("test", "dummy.xml", 0, 1)
         write_data = [1, 2, 3]
@@ -400,6 +937,20 @@ class TestBindings(TestCase):
         )
         self.assertTrue(np.array_equal(write_data, read_data))
 
+    def test_jit_mapping_out(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = [1, 2, 3]
+        participant.write_and_map_data(
+            "FakeMesh", "FakeScalarData", [0, 1, 2], write_data
+        )
+        dt = 1
+        out = np.zeros(3)
+        read_data = participant.map_and_read_data(
+            "FakeMesh", "FakeScalarData", [0, 1, 2], dt, out=out
+        )
+        self.assertIs(read_data, out)
+        self.assertTrue(np.array_equal(write_data, out))
+
     def test_get_version_information(self):
         version_info = precice.get_version_information()
         fake_version_info = b"dummy"  # compare to test/SolverInterface.cpp
@@ -433,6 +984,27 @@ class TestBindings(TestCase):
         self.assertTrue(np.array_equal(fake_ids, vertex_ids))
         self.assertTrue(np.array_equal(fake_coordinates, coordinates))
 
+    def test_get_mesh_vertex_ids_and_coordinates_out(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        fake_mesh_name = (
+            "FakeMesh"  # compare to test/SolverInterface.cpp, fake_mesh_name
+        )
+        n_fake_vertices = 3  # compare to test/SolverInterface.cpp, n_fake_vertices
+        fake_dimension = 3  # compare to test/SolverInterface.cpp, fake_dimensions
+        ids_out = np.zeros(n_fake_vertices, dtype=np.int32)
+        coordinates_out = np.zeros((n_fake_vertices, fake_dimension))
+        fake_ids, fake_coordinates = participant.get_mesh_vertex_ids_and_coordinates(
+            fake_mesh_name, out=(ids_out, coordinates_out)
+        )
+        self.assertIs(fake_ids, ids_out)
+        self.assertIs(fake_coordinates, coordinates_out)
+        self.assertTrue(np.array_equal(fake_ids, np.arange(n_fake_vertices)))
+        self.assertTrue(
+            np.array_equal(
+                fake_coordinates.flatten(), np.arange(n_fake_vertices * fake_dimension)
+            )
+        )
+
     def test_requires_gradient_data_for(self):
         participant = precice.Participant("test", "dummy.xml", 0, 1)
         fake_bool = 0  # compare to output in test/SolverInterface.cpp
@@ -668,6 +1240,51 @@ class TestBindings(TestCase):
             np.array_equiv(np.array(write_data).flatten(), read_data.flatten())
         )
 
+    def test_write_vector_gradient_data_axis_order(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        # jacobians[n, i, j] = dv_i/dx_j
+        jacobians = np.random.rand(2, 3, 3)
+        participant.write_gradient_data(
+            "FakeMesh",
+            "FakeVectorData",
+            [0, 1],
+            jacobians,
+            axis_order="component-first",
+        )
+        dt = 1
+        read_data = participant.read_data("FakeMesh", "FakeVectorData", range(6), dt)
+        expected = jacobians.transpose(0, 2, 1).reshape(2, 9)
+        self.assertTrue(np.array_equal(read_data.flatten(), expected.flatten()))
+        participant.write_gradient_data(
+            "FakeMesh",
+            "FakeVectorData",
+            [0, 1],
+            jacobians,
+            axis_order="derivative-first",
+        )
+        read_data = participant.read_data("FakeMesh", "FakeVectorData", range(6), dt)
+        self.assertTrue(np.array_equal(read_data.flatten(), jacobians.flatten()))
+
+    def test_write_vector_gradient_data_axis_order_invalid(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        jacobians = np.random.rand(2, 3, 3)
+        with self.assertRaises(AssertionError):
+            participant.write_gradient_data(
+                "FakeMesh", "FakeVectorData", [0, 1], jacobians
+            )
+        with self.assertRaises(AssertionError):
+            participant.write_gradient_data(
+                "FakeMesh", "FakeVectorData", [0, 1], jacobians, axis_order="ij"
+            )
+        with self.assertRaises(AssertionError):
+            participant.write_gradient_data(
+                "FakeMesh",
+                "FakeVectorData",
+                [0, 1],
+                np.random.rand(2, 3, 2),
+                axis_order="component-first",
+            )
+
     def test_set_mesh_edge(self):
         participant = precice.Participant("test", "dummy.xml", 0, 1)
         fake_mesh_name = "FakeMesh"
@@ -685,6 +1302,14 @@ class TestBindings(TestCase):
         vertices = np.empty((0, 2), dtype=int)
         participant.set_mesh_edges(fake_mesh_name, vertices)
 
+    def test_set_mesh_edges_chunked(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        fake_mesh_name = "FakeMesh"
+        with tempfile.TemporaryDirectory() as tmp:
+            vertices_file = os.path.join(tmp, "edges.npy")
+            np.save(vertices_file, np.array([[0, 1], [1, 2], [2, 0]], dtype=np.int32))
+            participant.set_mesh_edges(fake_mesh_name, vertices_file, chunk_size=2)
+
     def test_set_mesh_triangle(self):
         participant = precice.Participant("test", "dummy.xml", 0, 1)
         fake_mesh_name = "FakeMesh"
@@ -718,3 +1343,287 @@ class TestBindings(TestCase):
         fake_mesh_name = "FakeMesh"
         vertices = np.empty((0, 4), dtype=int)
         participant.set_mesh_quads(fake_mesh_name, vertices)
+
+    def test_set_mesh_connectivity(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        fake_mesh_name = "FakeMesh"
+        participant.set_mesh_connectivity(
+            fake_mesh_name,
+            edges=np.array([[0, 1], [1, 2]]),
+            triangles=[[0, 1, 2]],
+            tetrahedra=np.array([[0, 1, 2, 3]], dtype=np.int32),
+        )
+
+    def test_set_mesh_connectivity_invalid(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        fake_mesh_name = "FakeMesh"
+        with self.assertRaises(AssertionError):
+            participant.set_mesh_connectivity(
+                fake_mesh_name, edges=[[0, 1]], quads=[[0, 1, 2]]
+            )
+        with self.assertRaises(AssertionError):
+            participant.set_mesh_connectivity(fake_mesh_name, triangles=[0, 1, 2])
+        with self.assertRaises(AssertionError):
+            participant.set_mesh_triangles(fake_mesh_name, [0, 1, 2])
+
+    def test_concurrent_read_data(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        write_data = np.array([[3, 7, 8], [7, 6, 5]], dtype=np.double)
+        vertex_ids = np.array([0, 1])
+        participant.write_data("FakeMesh", "FakeVectorData", vertex_ids, write_data)
+        dt = 1
+
+        def read(_):
+            return participant.read_data("FakeMesh", "FakeVectorData", vertex_ids, dt)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(read, range(64)))
+        for read_data in results:
+            self.assertTrue(np.array_equal(write_data, read_data))
+
+    def test_free_threading(self):
+        if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+            self.skipTest("requires a free-threaded build of CPython")
+        # importing a module which is not marked as free-threading compatible re-enables the GIL
+        self.assertFalse(sys._is_gil_enabled())
+
+    def test_initialize_advance_async(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        events = []
+
+        async def other_work():
+            events.append("other")
+
+        async def coupling():
+            await participant.initialize_async()
+            await asyncio.gather(participant.advance_async(1.0), other_work())
+            events.append("advanced")
+
+        asyncio.run(coupling())
+        self.assertEqual(sorted(events), ["advanced", "other"])
+        participant.finalize()
+
+    def test_handles_without_reference_cycles(self):
+        # the participant is destroyed, and preCICE finalized, as soon as the last reference is deleted
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        with participant.profile("assemble"):
+            pass
+        participant.start_profiling_section("solve")
+        participant.stop_last_profiling_section()
+        participant.unchecked
+        participant.c_api
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            del participant
+            self.assertFalse(
+                any(isinstance(o, precice.Participant) for o in gc.get_objects())
+            )
+        finally:
+            if enabled:
+                gc.enable()
+
+    def test_profile(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        with participant.profile("outer"):
+            with self.assertRaises(ValueError):
+                with participant.profile("inner"):
+                    raise ValueError()
+
+        @participant.profiled
+        def assemble(x):
+            return 2 * x
+
+        @participant.profiled("solve")
+        def solve(x):
+            return x + 1
+
+        self.assertEqual(assemble(1), 2)
+        self.assertEqual(solve(1), 2)
+        self.assertEqual(assemble.__name__, "assemble")
+
+    def test_counters(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        vertex_ids = np.array([0, 1, 2], dtype=np.int32)
+        values = np.array([1, 2, 3], dtype=np.double)
+        participant.write_data("FakeMesh", "FakeScalarData", vertex_ids, values)
+        self.assertEqual(participant.get_counters(), {})
+        participant.enable_counters()
+        participant.write_data("FakeMesh", "FakeScalarData", vertex_ids, values)
+        participant.read_data("FakeMesh", "FakeScalarData", vertex_ids, 1)
+        participant.read_data("FakeMesh", "FakeScalarData", vertex_ids, 1)
+        participant.advance(1)
+        counters = participant.get_counters()
+        self.assertEqual(sorted(counters), ["advance", "read_data", "write_data"])
+        self.assertEqual(counters["read_data"]["calls"], 2)
+        self.assertEqual(counters["read_data"]["bytes"], 2 * (12 + 24))
+        self.assertEqual(counters["write_data"]["bytes"], 12 + 24)
+        for counter in counters.values():
+            self.assertGreaterEqual(counter["time"], counter["precice"])
+        participant.enable_counters(False)
+        self.assertEqual(participant.get_counters(), {})
+
+    def test_vertex_index(self):
+        rng = np.random.default_rng(0)
+        for dimensions in [1, 2, 3]:
+            coordinates = rng.random((500, dimensions))
+            ids = np.arange(1000, 1500, dtype=np.int32)
+            index = precice.VertexIndex(ids, coordinates)
+            self.assertEqual(len(index), 500)
+            points = rng.random((50, dimensions)) * 1.2 - 0.1
+            distances = np.linalg.norm(points[:, None] - coordinates[None], axis=2)
+            nearest_ids, nearest_distances = index.nearest(points)
+            self.assertTrue(np.array_equal(nearest_ids, ids[distances.argmin(axis=1)]))
+            self.assertTrue(np.allclose(nearest_distances, distances.min(axis=1)))
+            within = index.within(points, 0.1)
+            self.assertEqual(len(within), 50)
+            for i in range(50):
+                self.assertEqual(
+                    sorted(within[i]), sorted(ids[distances[i] <= 0.1].tolist())
+                )
+
+    def test_vertex_index_degenerate(self):
+        index = precice.VertexIndex(np.empty(0, dtype=np.int32), np.empty((0, 2)))
+        ids, distances = index.nearest([[0.0, 0.0]])
+        self.assertTrue(np.array_equal(ids, [-1]))
+        self.assertTrue(np.array_equal(distances, [np.inf]))
+        self.assertEqual(len(index.within([[0.0, 0.0]], 1.0)[0]), 0)
+        # all vertices on a line in 2D
+        index = precice.VertexIndex([0, 1, 2], [[0, 0], [1, 0], [2, 0]])
+        ids, distances = index.nearest([[1.2, 1.0], [5, 0]])
+        self.assertTrue(np.array_equal(ids, [1, 2]))
+        self.assertTrue(np.allclose(distances, [np.hypot(0.2, 1.0), 3.0]))
+
+    def test_vertex_index_nearly_planar(self):
+        rng = np.random.default_rng(0)
+        # a coupling surface at z = 0.5 with round-off thickness
+        coordinates = rng.random((20000, 3))
+        coordinates[:, 2] = 0.5 + 1e-9 * rng.standard_normal(20000)
+        index = precice.VertexIndex(np.arange(20000), coordinates)
+        points = rng.random((50, 3))
+        distances = np.linalg.norm(points[:, None] - coordinates[None], axis=2)
+        ids, nearest_distances = index.nearest(points)
+        self.assertTrue(np.array_equal(ids, distances.argmin(axis=1)))
+        self.assertTrue(np.allclose(nearest_distances, distances.min(axis=1)))
+
+    def test_get_mesh_vertex_index(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        index = participant.get_mesh_vertex_index("FakeMesh")
+        ids, distances = index.nearest([[0, 1, 2.5], [6, 7, 7]])
+        self.assertTrue(np.array_equal(ids, [0, 2]))
+        self.assertTrue(np.allclose(distances, [0.5, 1.0]))
+        self.assertIs(participant.get_mesh_vertex_index("FakeMesh"), index)
+        # the mock returns the same vertices after advancing, hence the index is kept
+        participant.advance(1)
+        self.assertIs(participant.get_mesh_vertex_index("FakeMesh"), index)
+
+    def test_counter_report(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        report = os.path.join(directory.name, "counters.json")
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        participant.enable_counters(report=report)
+        participant.write_data("FakeMesh", "FakeScalarData", [0, 1, 2], [1, 2, 3])
+        participant.finalize()
+        with open(report) as file:
+            summary = json.load(file)
+        self.assertEqual(summary["ranks"], 1)
+        self.assertEqual(summary["methods"]["write_data"]["calls"]["max"], 1)
+        self.assertEqual(summary["methods"]["write_data"]["bytes"]["mean"], 36)
+        self.assertEqual(summary["methods"]["write_data"]["slowest"][0][0], 0)
+
+    def test_counter_report_ranks(self):
+        class Communicator:
+            """
+            Stands in for an mpi4py communicator of three ranks, of which this is rank 0.
+            """
+
+            def Get_rank(self):
+                return 0
+
+            def gather(self, counters, root):
+                slow = {"read_data": dict(counters["read_data"], time=10.0)}
+                return [counters, slow, {}]
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        report = os.path.join(directory.name, "counters.json")
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        participant.enable_counters()
+        participant.write_data("FakeMesh", "FakeScalarData", [0, 1, 2], [1, 2, 3])
+        participant.read_data("FakeMesh", "FakeScalarData", [0, 1, 2], 1)
+        participant.write_counter_report(report, Communicator())
+        with open(report) as file:
+            summary = json.load(file)
+        self.assertEqual(summary["ranks"], 3)
+        read_data = summary["methods"]["read_data"]
+        self.assertEqual(read_data["calls"], {"min": 0, "max": 1, "mean": 2 / 3})
+        self.assertEqual(read_data["time"]["max"], 10.0)
+        self.assertEqual([rank for rank, _ in read_data["slowest"]], [1, 0, 2])
+
+    def test_timeline(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        timeline = os.path.join(directory.name, "timeline.json")
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        with self.assertRaises(AssertionError):
+            participant.write_timeline(timeline)
+        participant.enable_timeline()
+        participant.initialize()
+        participant.write_data("FakeMesh", "FakeScalarData", [0, 1, 2], [1, 2, 3])
+        participant.advance(1)
+        # the mock never completes a time window
+        self.assertEqual(participant.write_timeline(timeline), [])
+        with open(timeline) as file:
+            trace = json.load(file)
+        names = [event["name"] for event in trace["traceEvents"]]
+        self.assertEqual(names.count("initialize"), 1)
+        self.assertEqual(names.count("write_data"), 1)
+        self.assertEqual(names.count("advance"), 1)
+        self.assertEqual(names.count("iteration"), 1)
+        self.assertEqual(trace["windows"], [])
+
+    def test_c_api(self):
+        participant = precice.Participant("test", "dummy.xml", 0, 1)
+        c_api = participant.c_api
+        self.assertEqual(
+            ctypes.pythonapi.PyCapsule_IsValid(
+                ctypes.py_object(c_api.capsule), b"precice.ParticipantCApiTable"
+            ),
+            1,
+        )
+        functions = c_api.ctypes_functions()
+        handle = functions["participant"]
+        ids = np.array([0, 1, 2], dtype=np.int32)
+        values = np.array([3.0, 4.0, 5.0])
+        self.assertEqual(functions["initialize"](handle), 0)
+        self.assertEqual(
+            functions["write_data"](
+                handle,
+                b"FakeMesh",
+                b"FakeScalarData",
+                ids.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
+                ids.size,
+                values.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
+                values.size,
+            ),
+            0,
+        )
+        out = np.zeros(3)
+        self.assertEqual(
+            functions["read_data"](
+                handle,
+                b"FakeMesh",
+                b"FakeScalarData",
+                ids.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
+                ids.size,
+                1.0,
+                out.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
+                out.size,
+            ),
+            0,
+        )
+        self.assertTrue(np.array_equal(out, values))
+        self.assertEqual(functions["advance"](handle, 1.0), 0)
+        self.assertEqual(functions["is_coupling_ongoing"](handle), 0)
+        self.assertEqual(functions["finalize"](handle), 0)
@@ -0,0 +1,379 @@
+import precice
+from unittest import TestCase, skipUnless
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import os
+import tempfile
+import time
+import numpy as np
+
+CONFIG = """<?xml version="1.0" encoding="UTF-8" ?>
+<precice-configuration>
+  <data:vector name="Forces" />
+  <data:scalar name="Temperature" />
+  <mesh name="Fluid-Mesh" dimensions="2" />
+  <mesh name="Solid-Mesh" dimensions="2" />
+  <participant name="Fluid" />
+  <participant name="Solid" />
+  <coupling-scheme:parallel-implicit>
+    <max-time-windows value="3" />
+    <time-window-size value="0.5" />
+    <max-iterations value="2" />
+  </coupling-scheme:parallel-implicit>
+</precice-configuration>
+"""
+
+
+@skipUnless(
+    precice.get_version_information() == b"loopback",
+    "requires pyprecice built with PYPRECICE_MOCKED=loopback",
+)
+class TestLoopback(TestCase):
+    """
+    Test suite to check the coupling of two participants by the loopback backend in test/LoopbackParticipant.cpp.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.config = os.path.join(directory.name, "precice-config.xml")
+        with open(self.config, "w") as file:
+            file.write(CONFIG)
+
+    def couple(self, *solvers):
+        with ThreadPoolExecutor(max_workers=len(solvers)) as executor:
+            futures = [executor.submit(solver) for solver in solvers]
+            return [future.result(timeout=60) for future in futures]
+
+    def test_configuration(self):
+        participant = precice.Participant("Fluid", self.config, 0, 1)
+        self.assertEqual(participant.get_mesh_dimensions("Fluid-Mesh"), 2)
+        self.assertEqual(participant.get_data_dimensions("Fluid-Mesh", "Forces"), 2)
+        self.assertEqual(
+            participant.get_data_dimensions("Fluid-Mesh", "Temperature"), 1
+        )
+        self.assertEqual(participant.get_max_time_step_size(), 0.5)
+
+    def test_exchange(self):
+        n = 4
+
+        def fluid():
+            participant = precice.Participant("Fluid", self.config, 0, 1)
+            vertex_ids = participant.set_mesh_vertices("Fluid-Mesh", np.zeros((n, 2)))
+            participant.initialize()
+            received = []
+            while participant.is_coupling_ongoing():
+                dt = participant.get_max_time_step_size()
+                received.append(
+                    participant.read_data("Fluid-Mesh", "Temperature", vertex_ids, dt)
+                )
+                forces = np.full((n, 2), len(received), dtype=np.double)
+                participant.write_data("Fluid-Mesh", "Forces", vertex_ids, forces)
+                participant.advance(dt)
+            participant.finalize()
+            return received
+
+        def solid():
+            participant = precice.Participant("Solid", self.config, 0, 1)
+            vertex_ids = participant.set_mesh_vertices("Solid-Mesh", np.zeros((n, 2)))
+            participant.initialize()
+            received = []
+            checkpoints = 0
+            while participant.is_coupling_ongoing():
+                if participant.requires_writing_checkpoint():
+                    checkpoints += 1
+                dt = participant.get_max_time_step_size()
+                forces = participant.read_data("Solid-Mesh", "Forces", vertex_ids, dt)
+                received.append(forces)
+                temperature = np.full(n, -len(received), dtype=np.double)
+                participant.write_data(
+                    "Solid-Mesh", "Temperature", vertex_ids, temperature
+                )
+                participant.advance(dt)
+            participant.finalize()
+            return received, checkpoints
+
+        fluid_received, (solid_received, checkpoints) = self.couple(fluid, solid)
+        # 3 time windows with 2 iterations each, a checkpoint is written per time window
+        self.assertEqual(len(fluid_received), 6)
+        self.assertEqual(checkpoints, 3)
+        # initialize() exchanges no data, as nothing was written
+        self.assertTrue(np.array_equal(fluid_received[0], np.zeros(n)))
+        self.assertTrue(np.array_equal(solid_received[0], np.zeros((n, 2))))
+        # every advance() exchanges the data written before
+        for i in range(1, 6):
+            self.assertTrue(np.array_equal(fluid_received[i], np.full(n, -i)))
+            self.assertTrue(np.array_equal(solid_received[i], np.full((n, 2), i)))
+
+    def test_subcycling(self):
+        def solver(name, substeps):
+            def solve():
+                participant = precice.Participant(name, self.config, 0, 1)
+                participant.set_mesh_vertices(name + "-Mesh", np.zeros((1, 2)))
+                participant.initialize()
+                steps = 0
+                while participant.is_coupling_ongoing():
+                    participant.advance(0.5 / substeps)
+                    steps += 1
+                participant.finalize()
+                return steps
+
+            return solve
+
+        self.assertEqual(self.couple(solver("Fluid", 1), solver("Solid", 4)), [6, 24])
+
+    def test_advance_async(self):
+        # the solid advances late, hence the first advance of the fluid waits for it
+        delay = 0.5
+
+        def fluid():
+            participant = precice.Participant("Fluid", self.config, 0, 1)
+            participant.set_mesh_vertices("Fluid-Mesh", np.zeros((1, 2)))
+            gaps = []
+
+            async def ticker():
+                last = time.perf_counter()
+                for _ in range(20):
+                    await asyncio.sleep(0.01)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            async def coupling():
+                await participant.initialize_async()
+                first = asyncio.ensure_future(participant.advance_async(0.5))
+                ticks = asyncio.ensure_future(ticker())
+                await asyncio.sleep(0.05)
+                # submitting while the first advance waits must not block the event loop
+                await asyncio.gather(first, participant.advance_async(0.5), ticks)
+
+            asyncio.run(coupling())
+            while participant.is_coupling_ongoing():
+                participant.advance(0.5)
+            participant.finalize()
+            return max(gaps)
+
+        def solid():
+            participant = precice.Participant("Solid", self.config, 0, 1)
+            participant.set_mesh_vertices("Solid-Mesh", np.zeros((1, 2)))
+            participant.initialize()
+            time.sleep(delay)
+            while participant.is_coupling_ongoing():
+                participant.advance(0.5)
+            participant.finalize()
+
+        gap, _ = self.couple(fluid, solid)
+        self.assertLess(gap, delay / 2)
+
+    def test_steps(self):
+        n = 4
+
+        def fluid():
+            participant = precice.Participant("Fluid", self.config, 0, 1)
+            vertex_ids = participant.set_mesh_vertices("Fluid-Mesh", np.zeros((n, 2)))
+            temperature = np.zeros(n)
+            forces = np.zeros((n, 2))
+            plan = precice.ExchangePlan(participant)
+            plan.add_read("Fluid-Mesh", "Temperature", vertex_ids, temperature)
+            plan.add_write("Fluid-Mesh", "Forces", vertex_ids, forces)
+            participant.initialize()
+            received = []
+            for dt in participant.steps(plan):
+                received.append(temperature.copy())
+                forces[:] = len(received)
+            participant.finalize()
+            return received
+
+        def solid():
+            participant = precice.Participant("Solid", self.config, 0, 1)
+            vertex_ids = participant.set_mesh_vertices("Solid-Mesh", np.zeros((n, 2)))
+            forces = np.zeros((n, 2))
+            temperature = np.zeros(n)
+            plan = precice.ExchangePlan(participant)
+            plan.add_read("Solid-Mesh", "Forces", vertex_ids, forces)
+            plan.add_write("Solid-Mesh", "Temperature", vertex_ids, temperature)
+            time = np.zeros(1)
+            checkpoint = precice.Checkpoint(participant)
+            checkpoint.register(time)
+            participant.initialize()
+            steps = []
+            for dt in participant.steps(plan, checkpoint, max_time_step_size=0.25):
+                time += dt
+                steps.append(dt)
+                temperature[:] = -len(steps)
+            participant.finalize()
+            return steps, time[0]
+
+        fluid_received, (steps, time) = self.couple(fluid, solid)
+        # 3 time windows with 2 iterations each
+        self.assertEqual(len(fluid_received), 6)
+        self.assertTrue(np.array_equal(fluid_received[0], np.zeros(n)))
+        # the solid subcycles with 2 steps per time window
+        self.assertEqual(steps, [0.25] * 12)
+        # the checkpoint is restored after every first iteration
+        self.assertEqual(time, 1.5)
+
+    def test_record_replay(self):
+        n = 4
+        trace = tempfile.TemporaryDirectory()
+        self.addCleanup(trace.cleanup)
+
+        def fluid():
+            participant = precice.Participant("Fluid", self.config, 0, 1)
+            vertex_ids = participant.set_mesh_vertices("Fluid-Mesh", np.zeros((n, 2)))
+            participant.initialize()
+            step = 0
+            while participant.is_coupling_ongoing():
+                step += 1
+                forces = np.full((n, 2), step, dtype=np.double)
+                participant.write_data("Fluid-Mesh", "Forces", vertex_ids, forces)
+                participant.advance(participant.get_max_time_step_size())
+            participant.finalize()
+
+        def solid(participant):
+            vertex_ids = participant.set_mesh_vertices("Solid-Mesh", np.zeros((n, 2)))
+            participant.initialize()
+            received = []
+            checkpoints = 0
+            while participant.is_coupling_ongoing():
+                if participant.requires_writing_checkpoint():
+                    checkpoints += 1
+                dt = participant.get_max_time_step_size()
+                received.append(
+                    participant.read_data("Solid-Mesh", "Forces", vertex_ids, dt)
+                )
+                participant.write_data(
+                    "Solid-Mesh", "Temperature", vertex_ids, np.zeros(n)
+                )
+                participant.advance(dt)
+            participant.finalize()
+            return received, checkpoints
+
+        def record():
+            participant = precice.Participant("Solid", self.config, 0, 1)
+            participant.enable_recording(trace.name)
+            return solid(participant)
+
+        _, (recorded, checkpoints) = self.couple(fluid, record)
+        # the replay runs without the fluid
+        replayed, replayed_checkpoints = solid(precice.ReplayParticipant(trace.name))
+        self.assertEqual(replayed_checkpoints, checkpoints)
+        self.assertEqual(len(replayed), len(recorded))
+        for replayed_forces, recorded_forces in zip(replayed, recorded):
+            self.assertTrue(np.array_equal(replayed_forces, recorded_forces))
+
+    def test_record_replay_steps(self):
+        n = 4
+        trace = tempfile.TemporaryDirectory()
+        self.addCleanup(trace.cleanup)
+
+        def fluid():
+            participant = precice.Participant("Fluid", self.config, 0, 1)
+            vertex_ids = participant.set_mesh_vertices("Fluid-Mesh", np.zeros((n, 2)))
+            forces = np.zeros((n, 2))
+            plan = precice.ExchangePlan(participant)
+            plan.add_write("Fluid-Mesh", "Forces", vertex_ids, forces)
+            participant.initialize()
+            for dt in participant.steps(plan):
+                forces += 1
+            participant.finalize()
+
+        def solid(participant):
+            vertex_ids = participant.set_mesh_vertices("Solid-Mesh", np.zeros((n, 2)))
+            forces = np.zeros((n, 2))
+            plan = precice.ExchangePlan(participant)
+            plan.add_read("Solid-Mesh", "Forces", vertex_ids, forces)
+            temperature = participant.mesh("Solid-Mesh").data("Temperature")
+            time = np.zeros(1)
+            checkpoint = precice.Checkpoint(participant)
+            checkpoint.register(time)
+            participant.initialize()
+            received = []
+            for dt in participant.steps(plan, checkpoint):
+                time += dt
+                received.append(forces.copy())
+                temperature.write(vertex_ids, np.zeros(n))
+            participant.finalize()
+            return received, time[0]
+
+        def record():
+            participant = precice.Participant("Solid", self.config, 0, 1)
+            participant.enable_recording(trace.name)
+            return solid(participant)
+
+        _, (recorded, time) = self.couple(fluid, record)
+        self.assertEqual(len(recorded), 6)
+        # the replay runs without the fluid
+        replayed, replayed_time = solid(precice.ReplayParticipant(trace.name))
+        self.assertEqual(replayed_time, time)
+        self.assertEqual(len(replayed), len(recorded))
+        for replayed_forces, recorded_forces in zip(replayed, recorded):
+            self.assertTrue(np.array_equal(replayed_forces, recorded_forces))
+
+    def test_timeline(self):
+        timeline = os.path.join(os.path.dirname(self.config), "timeline.json")
+
+        def solver(name):
+            def solve():
+                participant = precice.Participant(name, self.config, 0, 1)
+                participant.set_mesh_vertices(name + "-Mesh", np.zeros((1, 2)))
+                participant.enable_timeline()
+                participant.initialize()
+                while participant.is_coupling_ongoing():
+                    participant.advance(participant.get_max_time_step_size())
+                participant.finalize()
+                if name == "Solid":
+                    return participant.write_timeline(timeline)
+
+            return solve
+
+        _, windows = self.couple(solver("Fluid"), solver("Solid"))
+        # 3 time windows with 2 iterations each
+        self.assertEqual([window["iterations"] for window in windows], [2, 2, 2])
+        for window in windows:
+            self.assertGreaterEqual(window["duration"], window["advance"])
+
+    def test_steps_timeline(self):
+        timeline = os.path.join(os.path.dirname(self.config), "timeline.json")
+
+        # enough vertices, such that reading takes longer than the bookkeeping of the bindings
+        n = 10**5
+
+        def solver(name, read_data_name):
+            def solve():
+                participant = precice.Participant(name, self.config, 0, 1)
+                vertex_ids = participant.set_mesh_vertices(
+                    name + "-Mesh", np.zeros((n, 2))
+                )
+                plan = precice.ExchangePlan(participant)
+                dimensions = participant.get_data_dimensions(
+                    name + "-Mesh", read_data_name
+                )
+                values = np.zeros((n, dimensions)).squeeze()
+                plan.add_read(name + "-Mesh", read_data_name, vertex_ids, values)
+                participant.enable_timeline()
+                participant.initialize()
+                for _ in participant.steps(plan):
+                    pass
+                participant.finalize()
+                if name == "Solid":
+                    return participant.write_timeline(timeline)
+
+            return solve
+
+        _, windows = self.couple(
+            solver("Fluid", "Temperature"), solver("Solid", "Forces")
+        )
+        self.assertEqual([window["iterations"] for window in windows], [2, 2, 2])
+        with open(timeline) as file:
+            events = json.load(file)["traceEvents"]
+        calls = sorted(
+            (event["ts"], event["ts"] + event["dur"])
+            for event in events
+            if event["name"] in ("advance", "ExchangePlan.execute_reads")
+        )
+        # the reads follow the advance without overlapping
+        self.assertEqual(len(calls), 12)
+        for (_, end), (start, _) in zip(calls, calls[1:]):
+            self.assertLessEqual(end, start)